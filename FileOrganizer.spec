@@ -36,8 +36,27 @@ a = Analysis(
         'src.config.config_manager',
         'src.core',
         'src.core.file_organizer_core',
+        'src.core.async_organizer',
+        'src.core.checkpoint',
+        'src.core.content_search',
+        'src.core.content_sniffer',
+        'src.core.date_resolver',
+        'src.core.directory_state',
+        'src.core.file_catalog',
+        'src.core.filesystem',
+        'src.core.glob_matcher',
+        'src.core.library_analytics',
+        'src.core.organize_result',
+        'src.core.rule_engine',
+        'src.core.routing',
+        'src.core.search_filter',
+        'src.core.space_check',
+        'src.core.run_metrics',
+        'src.core.view_farm',
         'src.utils',
         'src.utils.logger',
+        'src.utils.profiler',
+        'cProfile',
         'src.gui',
         'src.gui.language_dialog',
         'src.gui.settings_window',
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライブラリ分析スクリプト
+仕分け前のフォルダを1回スキャンし、カテゴリ別のファイル数・合計サイズ、
+更新日時・サイズの分布、最も大きいファイルを表示します
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from config.config_manager import ConfigManager
+from core.file_organizer_core import FileOrganizerCore
+from core.library_analytics import DEFAULT_TOP_N, analyze_catalog, format_report
+
+
+def main():
+    """コマンドライン引数を解析して実行"""
+    parser = argparse.ArgumentParser(description="フォルダの内容を分析（カテゴリ・更新日時・サイズ・最大ファイル）")
+    parser.add_argument("directory", help="分析するフォルダ")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="表示する大きいファイルの数")
+    parser.add_argument("--config", default="file_organizer_config.json", help="カテゴリ定義を読み込む設定ファイル")
+    args = parser.parse_args()
+
+    # 設定ファイル読み込み時のログは表示しない
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        config_manager = ConfigManager(args.config)
+    core = FileOrganizerCore(config_manager)
+
+    scan_start = time.perf_counter()
+    catalog = core.build_catalog(Path(args.directory))
+    scan_time = time.perf_counter() - scan_start
+    report = analyze_catalog(catalog, top_n=args.top)
+    print(format_report(report, config_manager.get_text))
+    print(f"\n({scan_time:.2f}s scan, {report.elapsed:.2f}s analysis)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parity Check
+Organizes the same synthetic tree through the legacy entry point (file_organizer.py) and through
+FileOrganizerCore, then compares the two resulting trees; exits with status 1 when they differ
+
+The legacy application is driven without a window: its Tk variables and buttons are replaced
+by stand-ins, everything else (configuration, languages, organize loop) is its own code.
+
+Usage:
+    python benchmarks/parity_check.py --count 2000
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Add src directory and repository root to Python path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+sys.path.insert(0, REPO_ROOT)
+
+from config.config_manager import ConfigManager
+from core.file_organizer_core import FileOrganizerCore
+from create_test_files import generate_tree
+from file_organizer import FileOrganizer, LegacyConfigAdapter
+from utils.logger import Logger
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the diagnostic prints of the application"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class _Value:
+    """Stand-in for a Tk variable"""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value) -> None:
+        self.value = value
+
+
+class _Widget:
+    """Stand-in for a Tk button"""
+
+    def config(self, **options) -> None:
+        pass
+
+
+def organize_legacy(source: Path, target: Path, work_dir: Path, language: str) -> None:
+    """Organize source into target with the legacy application's own organize loop"""
+    config_file = work_dir / "legacy_config.json"
+    config_file.write_text(json.dumps({"language": language, "language_selected": True}), encoding="utf-8")
+
+    app = FileOrganizer.__new__(FileOrganizer)
+    app.config_file = str(config_file)
+    app.setup_language()
+    app.load_config()
+    app.file_organizer_core = FileOrganizerCore(LegacyConfigAdapter(app))
+    app.source_directory = _Value(str(source))
+    app.target_directory = _Value(str(target))
+    app.progress_var = _Value(0)
+    app.status_var = _Value("")
+    app.organize_btn = app.stop_btn = _Widget()
+    app.logger = Logger(get_text=app.get_text)
+    app.organizing = True
+    app.auto_organize_files()
+
+
+def organize_core(source: Path, target: Path, work_dir: Path, language: str) -> None:
+    """Organize source into target through FileOrganizerCore and the application's ConfigManager"""
+    config_manager = ConfigManager(str(work_dir / "core_config.json"))
+    config_manager.change_language(language)
+    core = FileOrganizerCore(config_manager)
+    target.mkdir(parents=True, exist_ok=True)
+    for _ in core.organize_iter(core.get_file_entries_for_organization(source), target):
+        pass
+
+
+def snapshot(root: Path) -> Dict[str, Tuple[int, int]]:
+    """Map every file below root to its (size, mtime in whole seconds)"""
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = Path(directory, name)
+            file_stat = path.stat()
+            files[path.relative_to(root).as_posix()] = (file_stat.st_size, int(file_stat.st_mtime))
+    return files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the trees organized by the legacy entry point and the core")
+    parser.add_argument("--count", type=int, default=2000, help="number of files in the fixture tree")
+    parser.add_argument("--language", default="en", choices=["ja", "en", "sv"], help="language of the category names")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the fixture tree")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="file_organizer_parity_"))
+    try:
+        fixture = work_dir / "fixture"
+        generate_tree(fixture, args.count, depth=0, seed=args.seed)
+        # Identical copies (including modification times) for the two runs
+        shutil.copytree(fixture, work_dir / "legacy_source")
+        shutil.copytree(fixture, work_dir / "core_source")
+
+        with quiet():
+            organize_legacy(work_dir / "legacy_source", work_dir / "legacy_target", work_dir, args.language)
+            organize_core(work_dir / "core_source", work_dir / "core_target", work_dir, args.language)
+
+        legacy = snapshot(work_dir / "legacy_target")
+        core = snapshot(work_dir / "core_target")
+        leftovers = snapshot(work_dir / "legacy_source"), snapshot(work_dir / "core_source")
+        differences = sorted(set(legacy.items()) ^ set(core.items()))
+        for path, (size, mtime) in differences[:20]:
+            side = "legacy" if legacy.get(path) == (size, mtime) else "core"
+            print(f"only in {side}: {path} ({size} bytes)")
+        if leftovers[0] != leftovers[1]:
+            print("the files left in the two sources differ")
+
+        if differences or leftovers[0] != leftovers[1] or not legacy:
+            print(f"FAIL: {len(differences)} differences ({len(legacy)} legacy files, {len(core)} core files)")
+            return 1
+        print(f"OK: {len(legacy)} files organized identically")
+        return 0
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark Suite
+Times the organizer hot paths (enumeration, categorization, organize, search, separate,
+file catalog, config load/save) on reproducible synthetic trees and writes machine-readable results
+
+Usage:
+    python benchmarks/run_benchmarks.py --count 20000 --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json
+    python benchmarks/run_benchmarks.py --only organize organize_async --latency-ms 2
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add src directory and repository root to Python path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+sys.path.insert(0, REPO_ROOT)
+
+from config.config_manager import ConfigManager
+from core.async_organizer import AsyncOrganizePipeline
+from core.file_organizer_core import FileOrganizerCore
+from core.filesystem import SimulatedFileSystem
+from create_test_files import generate_tree, parse_extension_weights
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the diagnostic prints of the application while timing"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class BenchmarkContext:
+    """Shared settings and scratch space for one benchmark run"""
+
+    def __init__(self, args, work_dir: Path):
+        self.args = args
+        self.work_dir = work_dir
+        self.config_file = str(work_dir / "bench_config.json")
+        with quiet():
+            self.config_manager = ConfigManager(self.config_file)
+            self.config_manager.change_language("en")
+        self.filesystem = None
+        if args.latency_ms or args.jitter_ms or args.error_rate:
+            self.filesystem = SimulatedFileSystem(args.latency_ms / 1000, args.jitter_ms / 1000,
+                                                  args.error_rate, args.seed)
+        self.core = FileOrganizerCore(self.config_manager, self.filesystem)
+
+    def make_tree(self, name: str, depth: Optional[int] = None) -> Path:
+        """Create a fresh synthetic tree with the configured parameters"""
+        root = self.work_dir / name
+        if root.exists():
+            shutil.rmtree(root)
+        generate_tree(
+            root, self.args.count, self.args.depth if depth is None else depth, self.args.fanout,
+            parse_extension_weights(self.args.extensions) if self.args.extensions else None,
+            self.args.collision_rate, self.args.sizes, days=365, seed=self.args.seed)
+        return root
+
+    def fresh_dir(self, name: str) -> Path:
+        """Create an empty scratch directory"""
+        path = self.work_dir / name
+        if path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True)
+        return path
+
+
+def organize_all(core: FileOrganizerCore, source: Path, target: Path) -> int:
+    """Organize every file of source into target the way the application does"""
+    entries = core.get_file_entries_for_organization(source)
+    return sum(result.ok for result in core.organize_iter(entries, target))
+
+
+# Each benchmark takes the context and returns (setup, run); setup is untimed and its
+# result is passed to run, which returns the number of items processed
+def bench_enumerate_flat(ctx: BenchmarkContext):
+    source = ctx.make_tree("enumerate_flat", depth=0)
+    return lambda: None, lambda _: len(ctx.core.get_file_entries_for_organization(source))
+
+
+def bench_enumerate_recursive(ctx: BenchmarkContext):
+    source = ctx.make_tree("enumerate_recursive")
+    return lambda: None, lambda _: sum(1 for _ in ctx.core._iter_file_entries(source))
+
+
+def bench_categorize(ctx: BenchmarkContext):
+    source = ctx.make_tree("categorize", depth=0)
+    paths = ctx.core.get_files_for_organization(source)
+
+    def run(_):
+        for path in paths:
+            ctx.core.categorize_file(path)
+        return len(paths)
+
+    return lambda: None, run
+
+
+def bench_organize(ctx: BenchmarkContext):
+    def setup():
+        return ctx.make_tree("organize_source", depth=0), ctx.fresh_dir("organize_target")
+
+    return setup, lambda dirs: organize_all(ctx.core, *dirs)
+
+
+def bench_organize_async(ctx: BenchmarkContext):
+    def setup():
+        return ctx.make_tree("organize_async_source", depth=0), ctx.fresh_dir("organize_async_target")
+
+    def run(dirs):
+        source, target = dirs
+        entries = ctx.core.get_file_entries_for_organization(source)
+        ctx.core.prepare_organization(entries)
+        results = AsyncOrganizePipeline(ctx.core, ctx.args.concurrency).organize_files(entries, target)
+        return sum(result.ok for result in results)
+
+    return setup, run
+
+
+def bench_search(ctx: BenchmarkContext):
+    source = ctx.make_tree("search")
+    return lambda: None, lambda _: len(ctx.core.search_files(source, ctx.args.pattern))
+
+
+def bench_separate(ctx: BenchmarkContext):
+    def setup():
+        return ctx.make_tree("separate_source"), ctx.fresh_dir("separate_target")
+
+    def run(dirs):
+        source, target = dirs
+        moved, _ = ctx.core.separate_files(source, target, ctx.args.pattern, "separated")
+        return moved
+
+    return setup, run
+
+
+def bench_catalog_build(ctx: BenchmarkContext):
+    source = ctx.make_tree("catalog")
+    return lambda: None, lambda _: len(ctx.core.build_catalog(source))
+
+
+def bench_catalog_select(ctx: BenchmarkContext):
+    catalog = ctx.core.build_catalog(ctx.make_tree("catalog"))
+    search_filter = ctx.core.compile_search_filter("size>1KB modified>=2000")
+
+    def run(_):
+        catalog.select(search_filter)
+        return len(catalog)
+
+    return lambda: None, run
+
+
+def bench_config_load(ctx: BenchmarkContext):
+    def run(_):
+        ConfigManager(ctx.config_file)
+        return 1
+
+    return lambda: None, run
+
+
+def bench_config_save(ctx: BenchmarkContext):
+    def run(_):
+        ctx.config_manager.save_config()
+        return 1
+
+    return lambda: None, run
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "enumerate_flat": bench_enumerate_flat,
+    "enumerate_recursive": bench_enumerate_recursive,
+    "categorize": bench_categorize,
+    "organize": bench_organize,
+    "organize_async": bench_organize_async,
+    "search": bench_search,
+    "separate": bench_separate,
+    "catalog_build": bench_catalog_build,
+    "catalog_select": bench_catalog_select,
+    "config_load": bench_config_load,
+    "config_save": bench_config_save,
+}
+
+
+def run_benchmark(name: str, ctx: BenchmarkContext) -> dict:
+    """Run one benchmark repeatedly and summarize its timings"""
+    setup, run = BENCHMARKS[name](ctx)
+    timings: List[float] = []
+    items = 0
+
+    for _ in range(ctx.args.repeat):
+        state = setup()
+        if ctx.filesystem:
+            ctx.filesystem.reset_counters()
+        with quiet():
+            start = time.perf_counter()
+            items = run(state)
+            timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    result = {
+        "items": items,
+        "repeat": len(timings),
+        "min_s": min(timings),
+        "median_s": median,
+        "max_s": max(timings),
+        "items_per_s": items / median if median > 0 else None,
+    }
+    if ctx.filesystem:
+        # Filesystem calls of the last repetition
+        result["fs_calls"] = dict(ctx.filesystem.calls)
+    return result
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """List benchmarks whose median time grew by more than threshold over the baseline"""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_s"):
+            continue
+        ratio = result["median_s"] / previous["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {previous['median_s']:.4f}s -> {result['median_s']:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="File organizer benchmarks")
+    parser.add_argument("--count", type=int, default=5000, help="files per synthetic tree")
+    parser.add_argument("--depth", type=int, default=2, help="directory depth of recursive trees")
+    parser.add_argument("--fanout", type=int, default=4, help="subdirectories per level")
+    parser.add_argument("--extensions", help='extension distribution, e.g. "jpg=3,pdf=2,=1"')
+    parser.add_argument("--collision-rate", type=float, default=0.05, help="share of duplicated file names")
+    parser.add_argument("--sizes", default="fixed:64", help="size distribution (fixed:N, uniform:A:B, lognormal:MU:SIGMA)")
+    parser.add_argument("--pattern", default=r"\.jpg$", help="search/separate pattern")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the synthetic trees")
+    parser.add_argument("--concurrency", type=int, default=32, help="files in flight for organize_async")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated latency per filesystem call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="simulated extra latency, up to this much per call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of simulated filesystem calls that fail")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per benchmark")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--work-dir", help="scratch directory (default: a temporary directory)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before reporting a regression")
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="organizer_bench_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        ctx = BenchmarkContext(args, work_dir)
+        results = {}
+        for name in args.only or BENCHMARKS:
+            results[name] = run_benchmark(name, ctx)
+            print(f"{name:22s} median {results[name]['median_s']:.4f}s  ({results[name]['items']} items)")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {key: value for key, value in vars(args).items()
+                           if key not in ("output", "compare", "work_dir", "only")},
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
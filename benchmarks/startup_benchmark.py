@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup Benchmark
+Measures import time of the main application (python -X importtime) and wall time from
+process start to the first painted main window, including config load
+
+Usage:
+    python benchmarks/startup_benchmark.py --budget-ms 200 --output startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, 'src')
+
+# Child script: build the application window, paint it once and report
+FIRST_PAINT_SCRIPT = """
+import sys
+sys.path.insert(0, {src_dir!r})
+from main_app import FileOrganizerApp
+app = FileOrganizerApp()
+app.root.update()
+sys.stderr.write("FIRST_PAINT\\n")
+sys.stderr.flush()
+app.root.destroy()
+"""
+
+# Configuration used by the child so that the first-run language dialog is skipped
+BENCH_CONFIG = {"language": "en", "language_selected": True}
+
+
+def measure_imports(module: str) -> Dict[str, object]:
+    """Run python -X importtime and return the total and the slowest imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True)
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue
+        imports.append((cumulative_us, self_us, fields[2].strip()))
+
+    total_us = next((cumulative for cumulative, _, name in imports if name == module), 0)
+    slowest = sorted(imports, key=lambda item: item[1], reverse=True)[:10]
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "slowest_self_ms": [{"module": name, "self_ms": self_us / 1000} for _, self_us, name in slowest],
+    }
+
+
+def measure_first_paint() -> Optional[float]:
+    """Wall time in seconds from process start until the main window is painted"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(work_dir, "file_organizer_config.json"), 'w', encoding='utf-8') as f:
+            json.dump(BENCH_CONFIG, f)
+
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", FIRST_PAINT_SCRIPT.format(src_dir=SRC_DIR)],
+            cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        for line in process.stderr:
+            if line.strip() == "FIRST_PAINT":
+                elapsed = time.perf_counter() - start
+                process.wait()
+                return elapsed
+        process.wait()
+        return None
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="File organizer startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measured launches")
+    parser.add_argument("--budget-ms", type=float, default=200.0, help="first paint budget in milliseconds")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    imports = measure_imports("main_app")
+    print(f"import main_app: {imports['total_ms']:.1f} ms")
+    for item in imports["slowest_self_ms"][:5]:
+        print(f"  {item['module']}: {item['self_ms']:.1f} ms")
+
+    paints: List[float] = []
+    for _ in range(args.repeat):
+        elapsed = measure_first_paint()
+        if elapsed is None:
+            print("First paint could not be measured (no display available?)")
+            break
+        paints.append(elapsed * 1000)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "imports": imports,
+        "first_paint_ms": {
+            "samples": paints,
+            "median": statistics.median(paints) if paints else None,
+            "budget": args.budget_ms,
+        },
+    }
+
+    if paints:
+        median = report["first_paint_ms"]["median"]
+        print(f"first paint: median {median:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if paints and report["first_paint_ms"]["median"] > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,30 @@
 """
 テスト用サンプルファイル作成スクリプト
 ファイル仕分けシステムのテスト用に様々な種類のファイルを作成します
+
+引数なしで実行すると test_files/ に少数のサンプルファイルを作成します。
+--tree を指定するとベンチマーク用の合成ツリー（ファイル数・深さ・拡張子分布・
+名前の重複率・サイズ分布を指定可能、同じシードなら同じ内容）を作成します。
 """
 
 import os
+import json
 import random
+import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+# 合成ツリーのデフォルト拡張子分布（拡張子: 重み、"" は拡張子なし）
+DEFAULT_EXTENSION_WEIGHTS = {
+    ".jpg": 20, ".png": 8, ".gif": 2, ".mp4": 5, ".mov": 2, ".mp3": 5, ".wav": 1,
+    ".pdf": 10, ".docx": 6, ".txt": 10, ".xlsx": 4, ".csv": 4, ".pptx": 2,
+    ".zip": 3, ".gz": 1, ".exe": 1, ".py": 4, ".js": 3, ".html": 2,
+    ".log": 4, "": 3,
+}
+
+# これより大きいファイルはスパースファイルとして作成（ディスクを消費しない）
+DEFAULT_SPARSE_THRESHOLD = 1024 * 1024
 
 def create_test_files():
     """テスト用ファイルを作成"""
@@ -120,5 +138,146 @@ def create_test_files():
     
     print(f"\n🎯 ファイル仕分けシステムを起動して、'{test_dir}' をソースディレクトリとして選択してください。")
 
+def parse_extension_weights(spec: str) -> Dict[str, float]:
+    """拡張子分布の指定 "jpg=3,pdf=2,=1" を辞書に変換（空の拡張子は拡張子なし）"""
+    weights = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        ext, _, weight = item.partition("=")
+        ext = ext.strip().lower()
+        if ext and not ext.startswith("."):
+            ext = "." + ext
+        weights[ext] = float(weight) if weight else 1.0
+    return weights
+
+
+def make_size_sampler(spec: str, rng: random.Random):
+    """サイズ分布の指定からサンプラーを作成
+
+    fixed:N / uniform:MIN:MAX / lognormal:MU:SIGMA（バイト単位、MU と SIGMA は ln(バイト) スケール）
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda: int(values[0])
+    if kind == "uniform":
+        return lambda: rng.randint(int(values[0]), int(values[1]))
+    if kind == "lognormal":
+        return lambda: int(min(rng.lognormvariate(values[0], values[1]), 2 ** 40))
+    raise ValueError(f"不明なサイズ分布: {spec}")
+
+
+def generate_tree(root, file_count: int = 1000, depth: int = 0, fanout: int = 4,
+                  extension_weights: Optional[Dict[str, float]] = None, collision_rate: float = 0.0,
+                  size_spec: str = "fixed:64", sparse_threshold: int = DEFAULT_SPARSE_THRESHOLD,
+                  days: int = 365, seed: int = 0) -> dict:
+    """ベンチマーク用の合成ツリーを作成
+
+    ファイルは深さ depth・各階層 fanout 個のディレクトリに分散されます。
+    collision_rate の割合のファイルは既存のファイル名を別ディレクトリで再利用します
+    （分離や整理での名前の重複処理を発生させるため）。
+    同じ引数とシードからは常に同じツリーが作成されます。
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    weights = extension_weights or DEFAULT_EXTENSION_WEIGHTS
+    extensions = list(weights.keys())
+    cumulative_weights = []
+    total_weight = 0.0
+    for ext in extensions:
+        total_weight += weights[ext]
+        cumulative_weights.append(total_weight)
+    sample_size = make_size_sampler(size_spec, rng)
+    
+    # ディレクトリ一覧を作成
+    directories = [root]
+    level = [root]
+    for current_depth in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(fanout):
+                directory = parent / f"dir_{current_depth}_{i}"
+                directory.mkdir(exist_ok=True)
+                next_level.append(directory)
+        directories.extend(next_level)
+        level = next_level
+    
+    now = datetime.now().timestamp()
+    used_names = []
+    names_by_directory = {directory: set() for directory in directories}
+    total_bytes = 0
+    sparse_files = 0
+    collisions = 0
+    
+    for index in range(file_count):
+        directory = directories[rng.randrange(len(directories))]
+        
+        # 既存の名前を別ディレクトリで再利用して重複を作る
+        filename = None
+        if used_names and rng.random() < collision_rate:
+            candidate = used_names[rng.randrange(len(used_names))]
+            if candidate not in names_by_directory[directory]:
+                filename = candidate
+                collisions += 1
+        if filename is None:
+            ext = rng.choices(extensions, cum_weights=cumulative_weights)[0]
+            filename = f"file_{index:08d}{ext}"
+            used_names.append(filename)
+        names_by_directory[directory].add(filename)
+        
+        file_path = directory / filename
+        size = sample_size()
+        with open(file_path, "wb") as f:
+            if size > sparse_threshold:
+                f.truncate(size)
+                sparse_files += 1
+            else:
+                f.write(b"x" * size)
+        total_bytes += size
+        
+        # 更新日時を過去 days 日以内に分散
+        timestamp = now - rng.random() * days * 86400
+        os.utime(file_path, (timestamp, timestamp))
+    
+    return {
+        "root": str(root),
+        "files": file_count,
+        "directories": len(directories),
+        "bytes": total_bytes,
+        "sparse_files": sparse_files,
+        "collisions": collisions,
+        "seed": seed,
+    }
+
+
+def main():
+    """コマンドライン引数を解析して実行"""
+    parser = argparse.ArgumentParser(description="テスト用ファイル / ベンチマーク用合成ツリーを作成")
+    parser.add_argument("--tree", help="合成ツリーの作成先ディレクトリ（省略時はサンプルファイルを作成）")
+    parser.add_argument("--count", type=int, default=1000, help="ファイル数")
+    parser.add_argument("--depth", type=int, default=0, help="ディレクトリの深さ")
+    parser.add_argument("--fanout", type=int, default=4, help="各階層のサブディレクトリ数")
+    parser.add_argument("--extensions", help='拡張子分布（例: "jpg=3,pdf=2,=1"）')
+    parser.add_argument("--collision-rate", type=float, default=0.0, help="ファイル名を重複させる割合 (0-1)")
+    parser.add_argument("--sizes", default="fixed:64", help="サイズ分布（fixed:N / uniform:MIN:MAX / lognormal:MU:SIGMA）")
+    parser.add_argument("--sparse-threshold", type=int, default=DEFAULT_SPARSE_THRESHOLD,
+                        help="これより大きいファイルはスパースファイルにする（バイト）")
+    parser.add_argument("--days", type=int, default=365, help="更新日時を分散させる日数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード")
+    args = parser.parse_args()
+    
+    if not args.tree:
+        create_test_files()
+        return
+    
+    summary = generate_tree(
+        args.tree, args.count, args.depth, args.fanout,
+        parse_extension_weights(args.extensions) if args.extensions else None,
+        args.collision_rate, args.sizes, args.sparse_threshold, args.days, args.seed)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
 if __name__ == "__main__":
-    create_test_files()
+    main()
@@ -8,14 +8,39 @@ An application that automatically categorizes files and provides GUI operation
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
-import shutil
 import re
 from pathlib import Path
 import json
-from datetime import datetime
 import threading
+import sys
 from typing import Dict, List, Tuple, Optional
 
+# Add src directory to Python path for the shared utilities
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from core.file_organizer_core import FileOrganizerCore
+from utils.logger import Logger
+from utils.profiler import configure_profiling, profiled
+
+
+class LegacyConfigAdapter:
+    """Exposes the legacy configuration dictionary through the ConfigManager interface used by FileOrganizerCore"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    def get_file_types(self) -> Dict[str, List[str]]:
+        """Get current file types configuration"""
+        return self.app.config.get("file_types", {})
+    
+    def get_setting(self, key: str, default=None):
+        """Get a configuration setting"""
+        return self.app.config.get(key, default)
+    
+    def get_text(self, key: str) -> str:
+        """Get text in current language"""
+        return self.app.get_text(key)
+
 class FileOrganizer:
     def __init__(self):
         print("Application initialization started")
@@ -45,6 +70,10 @@ class FileOrganizer:
         
         # Load config after language setup
         self.load_config()
+        configure_profiling(self.config.get("profiling", ""))
+        
+        # All file operations are delegated to the shared core engine
+        self.file_organizer_core = FileOrganizerCore(LegacyConfigAdapter(self))
         
         # Check if this is first run and show language selection
         if not self.config.get("language_selected", False):
@@ -76,9 +105,9 @@ class FileOrganizer:
         # File type categories for different languages
         self.file_type_categories = {
             "ja": {
-                "画像": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                "画像": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                 "動画": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                "音声": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                "音声": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                 "文書": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                 "スプレッドシート": [".xls", ".xlsx", ".csv", ".ods"],
                 "プレゼンテーション": [".ppt", ".pptx", ".odp"],
@@ -87,9 +116,9 @@ class FileOrganizer:
                 "コード": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".php"]
             },
             "en": {
-                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                 "Videos": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                 "Documents": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                 "Spreadsheets": [".xls", ".xlsx", ".csv", ".ods"],
                 "Presentations": [".ppt", ".pptx", ".odp"],
@@ -98,9 +127,9 @@ class FileOrganizer:
                 "Code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".php"]
             },
             "sv": {
-                "Bilder": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                "Bilder": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                 "Videor": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                "Ljud": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                "Ljud": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                 "Dokument": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                 "Kalkylblad": [".xls", ".xlsx", ".csv", ".ods"],
                 "Presentationer": [".ppt", ".pptx", ".odp"],
@@ -200,6 +229,11 @@ class FileOrganizer:
                 "confirm_reset_defaults": "すべての設定を初期化しますか？\nこの操作は元に戻せません。",
                 "cache_cleared": "キャッシュをクリアしました。",
                 "settings_reset": "設定を初期化しました。\nアプリケーションを再起動してください。",
+                "insufficient_space": "空き容量が不足しています:",
+                "space_check_files": "ファイル",
+                "space_check_refused": "空き容量が不足しているため仕分けを開始しませんでした（空き容量を確保するか、free_space_check を \"warn\" に設定してください）",
+                "space_check_failed": "空き容量の確認をスキップしました:",
+                "already_organized": "整理済み:",
                 "other": "その他"
             },
             "en": {
@@ -288,6 +322,11 @@ class FileOrganizer:
                 "confirm_reset_defaults": "Reset all settings to defaults?\nThis action cannot be undone.",
                 "cache_cleared": "Cache cleared.",
                 "settings_reset": "Settings reset to defaults.\nPlease restart the application.",
+                "insufficient_space": "Not enough free space on",
+                "space_check_files": "files",
+                "space_check_refused": "Organization was not started because of insufficient free space (free up space or set free_space_check to \"warn\")",
+                "space_check_failed": "Free space check skipped:",
+                "already_organized": "Already organized:",
                 "other": "Other"
             },
             "sv": {
@@ -376,6 +415,11 @@ class FileOrganizer:
                 "confirm_reset_defaults": "Återställ alla inställningar till standard?\nDenna åtgärd kan inte ångras.",
                 "cache_cleared": "Cache rensad.",
                 "settings_reset": "Inställningar återställda till standard.\nStarta om applikationen.",
+                "insufficient_space": "Inte tillräckligt med ledigt utrymme på",
+                "space_check_files": "filer",
+                "space_check_refused": "Organiseringen startades inte på grund av otillräckligt ledigt utrymme (frigör utrymme eller sätt free_space_check till \"warn\")",
+                "space_check_failed": "Kontroll av ledigt utrymme hoppades över:",
+                "already_organized": "Redan organiserad:",
                 "other": "Övrigt"
             }
         }
@@ -935,6 +979,9 @@ class FileOrganizer:
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, width=80)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.logger = Logger(self.log_text, self.get_text)
+        for text_key in ("move_file", "copy_file", "link_file", "already_organized"):
+            self.logger.set_formatter(text_key, self.file_organizer_core.format_result)
         
         # Log clear button
         ttk.Button(log_frame, text=self.get_text("clear_log"), command=self.clear_log).grid(row=1, column=0, pady=(10, 0))
@@ -993,6 +1040,7 @@ class FileOrganizer:
         self.stop_btn.config(state=tk.DISABLED)
         self.log_message(self.get_text("organization_stopped"))
     
+    @profiled()
     def auto_organize_files(self):
         """Auto organize files"""
         try:
@@ -1007,8 +1055,9 @@ class FileOrganizer:
             target_path.mkdir(parents=True, exist_ok=True)
             
             # Get files
-            files = [f for f in source_path.iterdir() if f.is_file()]
-            total_files = len(files)
+            self.file_organizer_core.metrics.reset()
+            entries = self.file_organizer_core.get_file_entries_for_organization(source_path)
+            total_files = len(entries)
             
             if total_files == 0:
                 self.log_message(self.get_text("error_no_files_found"))
@@ -1016,26 +1065,28 @@ class FileOrganizer:
             
             self.log_message(f"{self.get_text('start_organization')} {total_files} {self.get_text('files_processed')}")
             
+            # Sniff unknown files, read capture dates and compile rules in bulk
+            self.file_organizer_core.prepare_organization(entries)
+            if not self.check_free_space(entries, target_path):
+                return
+            
             processed = 0
-            for file_path in files:
-                if not self.organizing:
-                    break
-                
-                try:
-                    self.organize_single_file(file_path, target_path)
-                    processed += 1
-                    progress = (processed / total_files) * 100
-                    self.progress_var.set(progress)
-                    self.status_var.set(f"{self.get_text('processing')}: {processed}/{total_files}")
-                    
-                except Exception as e:
-                    self.log_message(f"Error ({file_path.name}): {e}")
+            self.logger.reset_event_counts()
+            for result in self.file_organizer_core.organize_iter(entries, target_path, lambda: not self.organizing,
+                                                                 prepare=False):
+                self.report_result(result)
+                processed += 1
+                progress = (processed / total_files) * 100
+                self.progress_var.set(progress)
+                self.status_var.set(f"{self.get_text('processing')}: {processed}/{total_files}")
             
             if self.organizing:
                 self.log_message(f"{self.get_text('organization_complete_files')} {processed} {self.get_text('files_processed_complete')}")
                 self.status_var.set(self.get_text("organization_complete"))
             else:
                 self.log_message(self.get_text("organization_stopped"))
+            for line in self.logger.event_summary():
+                self.log_message(line)
                 
         except Exception as e:
             self.log_message(f"Error: {e}")
@@ -1044,43 +1095,47 @@ class FileOrganizer:
             self.organize_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.DISABLED)
     
-    def organize_single_file(self, file_path: Path, target_path: Path):
+    def check_free_space(self, entries: list, target_path: Path) -> bool:
+        """Check free space on the target filesystems; False if the run must not start"""
+        return self.check_space(lambda: self.file_organizer_core.check_free_space(entries, target_path))
+    
+    def check_move_space(self, moves: dict) -> bool:
+        """Check free space for a separation; False if it must not start"""
+        return self.check_space(lambda: self.file_organizer_core.check_move_space(moves))
+    
+    def check_space(self, check) -> bool:
+        """Log the filesystems a space check finds short; False if the run is refused"""
+        action = self.config.get("free_space_check", "refuse")
+        if action == "off":
+            return True
+        
+        from core.space_check import format_requirement
+        
+        try:
+            short = check()
+        except OSError as e:
+            self.log_message(f"{self.get_text('space_check_failed')} {e}")
+            return True
+        
+        for requirement in short:
+            self.log_message(f"WARNING: {format_requirement(requirement, self.get_text)}")
+        if short and action == "refuse":
+            self.log_message(f"ERROR: {self.get_text('space_check_refused')}")
+            return False
+        return True
+    
+    def organize_single_file(self, file_path: Path, target_path: Path, file_stat: Optional[os.stat_result] = None):
         """Organize single file"""
-        file_extension = file_path.suffix.lower()
-        
-        # Determine file type
-        category = self.get_text("other")
-        for cat, extensions in self.config["file_types"].items():
-            if file_extension in extensions:
-                category = cat
-                break
-        
-        # Create category directory
-        category_path = target_path / category
-        category_path.mkdir(exist_ok=True)
-        
-        # Create date folder (if setting is enabled)
-        if self.config["create_date_folders"]:
-            file_date = datetime.fromtimestamp(file_path.stat().st_mtime)
-            date_folder = file_date.strftime("%Y-%m")
-            category_path = category_path / date_folder
-            category_path.mkdir(exist_ok=True)
-        
-        # Move file
-        destination = category_path / file_path.name
-        
-        # Duplicate check
-        if destination.exists() and self.config["move_duplicates"]:
-            base_name = file_path.stem
-            counter = 1
-            while destination.exists():
-                new_name = f"{base_name}_{counter}{file_extension}"
-                destination = category_path / new_name
-                counter += 1
-        
-        shutil.move(str(file_path), str(destination))
-        self.log_message(f"{self.get_text('move_file')} {file_path.name} → {category}/{destination.name}")
+        self.report_result(self.file_organizer_core._organize_file(file_path, target_path, file_stat))
     
+    def report_result(self, result):
+        """Log the result of an organized file (successes are rendered only when displayed)"""
+        if result.ok:
+            self.logger.log_event(result.text_key, result, group=result.category)
+        else:
+            self.log_message(f"Error ({result.source.name}): {self.file_organizer_core.format_result(result)}")
+    
+    @profiled()
     def search_files(self):
         """Search files"""
         if not self.source_directory.get():
@@ -1094,13 +1149,11 @@ class FileOrganizer:
         
         try:
             source_path = Path(self.source_directory.get())
-            matching_files = []
+            # The core reports an invalid pattern as no matches; show the regex error instead
+            re.compile(pattern)
             
             # Search files
-            for file_path in source_path.rglob("*"):
-                if file_path.is_file():
-                    if re.search(pattern, file_path.name, re.IGNORECASE):
-                        matching_files.append(file_path)
+            matching_files = self.file_organizer_core.search_files(source_path, pattern)
             
             # Display results
             self.result_text.delete(1.0, tk.END)
@@ -1116,6 +1169,7 @@ class FileOrganizer:
         except Exception as e:
             self.log_message(f"{self.get_text('search_error')} {e}")
     
+    @profiled()
     def separate_files(self):
         """Separate matching files"""
         if not self.target_directory.get():
@@ -1130,28 +1184,21 @@ class FileOrganizer:
         try:
             source_path = Path(self.source_directory.get())
             target_path = Path(self.target_directory.get())
+            # Reject an invalid pattern before the separation directory is created
+            re.compile(pattern)
             
-            # Create separation directory
-            separate_path = target_path / f"分離_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            separate_path.mkdir(parents=True, exist_ok=True)
+            # Separate files into a timestamped separation directory
+            space_refused = False
             
-            moved_count = 0
-            for file_path in source_path.rglob("*"):
-                if file_path.is_file():
-                    if re.search(pattern, file_path.name, re.IGNORECASE):
-                        destination = separate_path / file_path.name
-                        
-                        # Duplicate check
-                        if destination.exists():
-                            base_name = file_path.stem
-                            counter = 1
-                            while destination.exists():
-                                new_name = f"{base_name}_{counter}{file_path.suffix}"
-                                destination = separate_path / new_name
-                                counter += 1
-                        
-                        shutil.move(str(file_path), str(destination))
-                        moved_count += 1
+            def preflight(moves):
+                nonlocal space_refused
+                space_refused = not self.check_move_space(moves)
+                return not space_refused
+            
+            moved_count, separate_path = self.file_organizer_core.separate_files(source_path, target_path, pattern,
+                                                                                 preflight=preflight)
+            if space_refused:
+                return
             
             self.log_message(f"{self.get_text('separation_complete')} {moved_count} {self.get_text('files_moved_to')} {separate_path.name} {self.get_text('moved_to')}")
             messagebox.showinfo("Complete", f"{moved_count} {self.get_text('files_separated')}\n{self.get_text('save_location')} {separate_path}")
@@ -1166,16 +1213,11 @@ class FileOrganizer:
     
     def log_message(self, message: str):
         """Add log message"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-        print(log_entry.strip())
+        self.logger.log_message(message)
     
     def clear_log(self):
         """Clear log"""
-        self.log_text.delete(1.0, tk.END)
+        self.logger.clear_log()
     
     def run(self):
         """Run application"""
@@ -1375,9 +1417,9 @@ class SettingsWindow:
                         # Get the original default categories for each language
                         if lang == "ja":
                             default_categories = {
-                                "画像": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                                "画像": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                                 "動画": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                                "音声": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                                "音声": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                                 "文書": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                                 "スプレッドシート": [".xls", ".xlsx", ".csv", ".ods"],
                                 "プレゼンテーション": [".ppt", ".pptx", ".odp"],
@@ -1387,9 +1429,9 @@ class SettingsWindow:
                             }
                         elif lang == "en":
                             default_categories = {
-                                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                                 "Videos": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                                "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                                "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                                 "Documents": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                                 "Spreadsheets": [".xls", ".xlsx", ".csv", ".ods"],
                                 "Presentations": [".ppt", ".pptx", ".odp"],
@@ -1399,9 +1441,9 @@ class SettingsWindow:
                             }
                         elif lang == "sv":
                             default_categories = {
-                                "Bilder": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                                "Bilder": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                                 "Videor": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                                "Ljud": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                                "Ljud": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                                 "Dokument": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                                 "Kalkylblad": [".xls", ".xlsx", ".csv", ".ods"],
                                 "Presentationer": [".ppt", ".pptx", ".odp"],
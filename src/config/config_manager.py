@@ -31,7 +31,21 @@ class ConfigManager:
             "recent_directories": [],
             "auto_organize": True,
             "create_date_folders": True,
+            "date_folder_granularity": "month",
+            "date_source": "mtime",
             "move_duplicates": True,
+            "organize_mode": "move",
+            "sniff_unknown_files": True,
+            "organize_concurrency": 1,
+            "incremental_organize": False,
+            "view_dimensions": [],
+            "free_space_check": "refuse",
+            "free_space_margin_percent": 5,
+            "content_search_max_mb": 100,
+            "separation_routes": [],
+            "organize_rules": [],
+            "run_report_dir": "",
+            "profiling": "",
             "language": "ja",
             "language_selected": False,
             "deleted_default_categories": []
@@ -146,6 +160,69 @@ class ConfigManager:
                 "invalid_folder_name": "フォルダ名に無効な文字が含まれています",
                 "target_not_set": "ターゲットディレクトリが設定されていません",
                 "folder_not_exists": "選択されたフォルダが存在しません",
+                "scanning": "スキャン中",
+                "directories_scanned": "フォルダ",
+                "matches_found": "件一致",
+                "directories_per_second": "フォルダ/秒",
+                "search_stopped": "検索が停止されました。",
+                "date_folder_granularity": "日付フォルダの単位:",
+                "granularity_year": "年 (YYYY)",
+                "granularity_month": "月 (YYYY-MM)",
+                "granularity_day": "日 (YYYY-MM-DD)",
+                "granularity_week": "ISO週 (YYYY-Www)",
+                "date_source": "日付の取得元:",
+                "date_source_mtime": "更新日時",
+                "date_source_ctime": "作成/変更日時 (ctime)",
+                "date_source_capture": "撮影日時 (EXIF/動画メタデータ)",
+                "sniff_unknown_files": "拡張子で判別できないファイルを内容から判別する",
+                "run_report_saved": "実行レポートを保存しました:",
+                "organize_concurrency": "同時に処理するファイル数 (ネットワーク共有向け):",
+                "resume_organize": "仕分け再開",
+                "no_checkpoint": "再開できる中断された仕分けはありません。",
+                "resume_organization": "仕分け再開:",
+                "incremental_organize": "前回の実行以降に追加・変更されたファイルだけを仕分けする",
+                "unchanged_directories_skipped": "変更のないフォルダをスキップ:",
+                "link_file": "リンク:",
+                "copy_file": "コピー:",
+                "organize_mode": "仕分け方法:",
+                "organize_mode_move": "ファイルを移動する",
+                "organize_mode_hardlink": "ハードリンクを作成 (元ファイルを残す)",
+                "organize_mode_reflink": "リフリンク複製を作成 (元ファイルを残す)",
+                "views": "ビュー (仕分け先にシンボリックリンクで作成)",
+                "view_category": "カテゴリ別",
+                "view_date": "年月別",
+                "view_size": "サイズ別",
+                "view_extension": "拡張子別",
+                "update_views": "ビュー更新",
+                "views_updated": "ビューを更新しました:",
+                "search_mode": "検索対象:",
+                "search_mode_name": "ファイル名 (正規表現)",
+                "search_mode_glob": "パス (glob、!で除外)",
+                "search_mode_content": "ファイルの内容 (正規表現)",
+                "route_files": "ルールで振り分け",
+                "error_no_routes": "振り分けルールがありません (設定ファイルの separation_routes に追加してください)",
+                "search_filter": "フィルター:",
+                "search_filter_hint": "例: size>1GB modified<2022 type:動画",
+                "error_invalid_filter": "フィルターが正しくありません:",
+                "analyze_source": "ソースを分析",
+                "analysis_complete": "分析完了:",
+                "analytics_files": "ファイル数:",
+                "analytics_categories": "カテゴリ別",
+                "analytics_age": "更新日時別",
+                "analytics_size": "サイズ別",
+                "analytics_largest": "最も大きいファイル",
+                "age_week": "1週間未満",
+                "age_month": "1週間〜1か月",
+                "age_half_year": "1〜6か月",
+                "age_year": "6か月〜1年",
+                "age_3_years": "1〜3年",
+                "age_5_years": "3〜5年",
+                "age_older": "5年以上",
+                "insufficient_space": "空き容量が不足しています:",
+                "space_check_files": "ファイル",
+                "space_check_refused": "空き容量が不足しているため仕分けを開始しませんでした（空き容量を確保するか、free_space_check を \"warn\" に設定してください）",
+                "space_check_failed": "空き容量の確認をスキップしました:",
+                "already_organized": "整理済み:",
                 "other": "その他"
             },
             "en": {
@@ -254,6 +331,69 @@ class ConfigManager:
                 "invalid_folder_name": "Folder name contains invalid characters",
                 "target_not_set": "Target directory is not set",
                 "folder_not_exists": "Selected folder does not exist",
+                "scanning": "Scanning",
+                "directories_scanned": "directories",
+                "matches_found": "matches",
+                "directories_per_second": "dirs/s",
+                "search_stopped": "Search stopped.",
+                "date_folder_granularity": "Date folder granularity:",
+                "granularity_year": "Year (YYYY)",
+                "granularity_month": "Month (YYYY-MM)",
+                "granularity_day": "Day (YYYY-MM-DD)",
+                "granularity_week": "ISO week (YYYY-Www)",
+                "date_source": "Date source:",
+                "date_source_mtime": "Modification time",
+                "date_source_ctime": "Creation/change time (ctime)",
+                "date_source_capture": "Capture date (EXIF/video metadata)",
+                "sniff_unknown_files": "Detect type of unknown files from their content",
+                "run_report_saved": "Run report saved:",
+                "organize_concurrency": "Files processed concurrently (network shares):",
+                "resume_organize": "Resume",
+                "no_checkpoint": "There is no stopped organization to resume.",
+                "resume_organization": "Resuming organization:",
+                "incremental_organize": "Only organize files added or changed since the last run",
+                "unchanged_directories_skipped": "Unchanged folders skipped:",
+                "link_file": "Link:",
+                "copy_file": "Copy:",
+                "organize_mode": "Organize mode:",
+                "organize_mode_move": "Move files",
+                "organize_mode_hardlink": "Create hard links (keep originals)",
+                "organize_mode_reflink": "Create reflink clones (keep originals)",
+                "views": "Views (symlink trees in the target folder)",
+                "view_category": "By category",
+                "view_date": "By month",
+                "view_size": "By size",
+                "view_extension": "By extension",
+                "update_views": "Update Views",
+                "views_updated": "Views updated:",
+                "search_mode": "Match:",
+                "search_mode_name": "File name (regex)",
+                "search_mode_glob": "Path (glob, ! excludes)",
+                "search_mode_content": "File contents (regex)",
+                "route_files": "Separate by Routes",
+                "error_no_routes": "No separation routes (add them to separation_routes in the configuration file)",
+                "search_filter": "Filter:",
+                "search_filter_hint": "e.g. size>1GB modified<2022 type:Videos",
+                "error_invalid_filter": "Invalid filter:",
+                "analyze_source": "Analyze Source",
+                "analysis_complete": "Analysis complete:",
+                "analytics_files": "Files:",
+                "analytics_categories": "By category",
+                "analytics_age": "By age",
+                "analytics_size": "By size",
+                "analytics_largest": "Largest files",
+                "age_week": "Under 1 week",
+                "age_month": "1 week - 1 month",
+                "age_half_year": "1-6 months",
+                "age_year": "6-12 months",
+                "age_3_years": "1-3 years",
+                "age_5_years": "3-5 years",
+                "age_older": "Over 5 years",
+                "insufficient_space": "Not enough free space on",
+                "space_check_files": "files",
+                "space_check_refused": "Organization was not started because of insufficient free space (free up space or set free_space_check to \"warn\")",
+                "space_check_failed": "Free space check skipped:",
+                "already_organized": "Already organized:",
                 "other": "Other"
             },
             "sv": {
@@ -361,6 +501,69 @@ class ConfigManager:
                 "invalid_folder_name": "Mappnamnet innehåller ogiltiga tecken",
                 "target_not_set": "Målmapp är inte inställd",
                 "folder_not_exists": "Vald mapp finns inte",
+                "scanning": "Skannar",
+                "directories_scanned": "mappar",
+                "matches_found": "träffar",
+                "directories_per_second": "mappar/s",
+                "search_stopped": "Sökningen stoppades.",
+                "date_folder_granularity": "Datummappens period:",
+                "granularity_year": "År (ÅÅÅÅ)",
+                "granularity_month": "Månad (ÅÅÅÅ-MM)",
+                "granularity_day": "Dag (ÅÅÅÅ-MM-DD)",
+                "granularity_week": "ISO-vecka (ÅÅÅÅ-Vvv)",
+                "date_source": "Datumkälla:",
+                "date_source_mtime": "Ändringstid",
+                "date_source_ctime": "Skapad/ändrad (ctime)",
+                "date_source_capture": "Fotodatum (EXIF/videometadata)",
+                "sniff_unknown_files": "Identifiera okända filer utifrån innehållet",
+                "run_report_saved": "Körningsrapport sparad:",
+                "organize_concurrency": "Filer som bearbetas samtidigt (nätverksresurser):",
+                "resume_organize": "Återuppta",
+                "no_checkpoint": "Det finns ingen avbruten organisering att återuppta.",
+                "resume_organization": "Återupptar organisering:",
+                "incremental_organize": "Organisera bara filer som lagts till eller ändrats sedan förra körningen",
+                "unchanged_directories_skipped": "Oförändrade mappar överhoppade:",
+                "link_file": "Länk:",
+                "copy_file": "Kopiera:",
+                "organize_mode": "Organiseringsläge:",
+                "organize_mode_move": "Flytta filer",
+                "organize_mode_hardlink": "Skapa hårda länkar (behåll originalen)",
+                "organize_mode_reflink": "Skapa reflink-kloner (behåll originalen)",
+                "views": "Vyer (symboliska länkträd i målmappen)",
+                "view_category": "Efter kategori",
+                "view_date": "Efter månad",
+                "view_size": "Efter storlek",
+                "view_extension": "Efter filändelse",
+                "update_views": "Uppdatera vyer",
+                "views_updated": "Vyer uppdaterade:",
+                "search_mode": "Matcha:",
+                "search_mode_name": "Filnamn (reguljärt uttryck)",
+                "search_mode_glob": "Sökväg (glob, ! exkluderar)",
+                "search_mode_content": "Filinnehåll (reguljärt uttryck)",
+                "route_files": "Sortera enligt regler",
+                "error_no_routes": "Inga sorteringsregler (lägg till dem i separation_routes i konfigurationsfilen)",
+                "search_filter": "Filter:",
+                "search_filter_hint": "t.ex. size>1GB modified<2022 type:Videor",
+                "error_invalid_filter": "Ogiltigt filter:",
+                "analyze_source": "Analysera källa",
+                "analysis_complete": "Analys klar:",
+                "analytics_files": "Filer:",
+                "analytics_categories": "Per kategori",
+                "analytics_age": "Per ålder",
+                "analytics_size": "Per storlek",
+                "analytics_largest": "Största filerna",
+                "age_week": "Under 1 vecka",
+                "age_month": "1 vecka - 1 månad",
+                "age_half_year": "1-6 månader",
+                "age_year": "6-12 månader",
+                "age_3_years": "1-3 år",
+                "age_5_years": "3-5 år",
+                "age_older": "Över 5 år",
+                "insufficient_space": "Inte tillräckligt med ledigt utrymme på",
+                "space_check_files": "filer",
+                "space_check_refused": "Organiseringen startades inte på grund av otillräckligt ledigt utrymme (frigör utrymme eller sätt free_space_check till \"warn\")",
+                "space_check_failed": "Kontroll av ledigt utrymme hoppades över:",
+                "already_organized": "Redan organiserad:",
                 "other": "Övrigt"
             }
         }
@@ -369,9 +572,9 @@ class ConfigManager:
         """Setup file type categories for different languages"""
         return {
             "ja": {
-                "画像": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                "画像": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                 "動画": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                "音声": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                "音声": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                 "文書": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                 "スプレッドシート": [".xls", ".xlsx", ".csv", ".ods"],
                 "プレゼンテーション": [".ppt", ".pptx", ".odp"],
@@ -380,9 +583,9 @@ class ConfigManager:
                 "コード": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".php"]
             },
             "en": {
-                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                 "Videos": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                 "Documents": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                 "Spreadsheets": [".xls", ".xlsx", ".csv", ".ods"],
                 "Presentations": [".ppt", ".pptx", ".odp"],
@@ -391,9 +594,9 @@ class ConfigManager:
                 "Code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".php"]
             },
             "sv": {
-                "Bilder": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"],
+                "Bilder": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".heic", ".heif", ".avif"],
                 "Videor": [".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"],
-                "Ljud": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"],
+                "Ljud": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".m4b"],
                 "Dokument": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"],
                 "Kalkylblad": [".xls", ".xlsx", ".csv", ".ods"],
                 "Presentationer": [".ppt", ".pptx", ".odp"],
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Async Organizer
+Responsible for organizing files with many filesystem calls in flight, for network shares
+where every stat, mkdir, exists and rename is a round-trip
+"""
+
+import os
+import time
+import asyncio
+import functools
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .file_organizer_core import REFERENCE_METHODS, CancelCheck
+from .organize_result import OrganizeResult, error_code
+
+
+# Called on the event loop thread with the result of every organized file
+ResultCallback = Callable[[OrganizeResult], None]
+
+
+class AsyncOrganizePipeline:
+    """Organizes files through asyncio, dispatching blocking filesystem calls to a bounded executor
+
+    Stat, date folder resolution, directory creation and moves of different files overlap.
+    Destination names are claimed strictly in input order, so renamed duplicates get the
+    same names as in a serial run. Each destination directory is created and listed once;
+    collisions are then checked against that listing instead of one exists() call per file.
+    Names are compared case-insensitively so that case-insensitive shares never overwrite.
+    """
+
+    def __init__(self, core, max_in_flight: int = 32):
+        self.core = core
+        self.max_in_flight = max(1, max_in_flight)
+
+    def organize_files(self, entries: Iterable[os.DirEntry], target_path: Path,
+                       cancel_check: Optional[CancelCheck] = None,
+                       result_callback: Optional[ResultCallback] = None) -> List[OrganizeResult]:
+        """Organize entries into target_path and return their results in input order"""
+        # Imported on first use to keep application startup fast
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            run = _PipelineRun(self.core, executor, target_path, self.max_in_flight, result_callback)
+            return asyncio.run(run.organize(entries, cancel_check))
+
+
+class _PipelineRun:
+    """State of one pipeline run, only touched on the event loop thread"""
+
+    def __init__(self, core, executor, target_path: Path, max_in_flight: int,
+                 result_callback: Optional[ResultCallback]):
+        self.core = core
+        self.executor = executor
+        self.target_path = target_path
+        self.max_in_flight = max_in_flight
+        self.result_callback = result_callback
+        self.metrics = core.metrics
+        self.fs = core.fs
+        self.needs_stat = core.needs_file_stat()
+        self.date_folders = core.config_manager.get_setting("create_date_folders", True)
+        self.move_duplicates = core.config_manager.get_setting("move_duplicates", True)
+        self.organize_mode = core.config_manager.get_setting("organize_mode", "move")
+        self.directories: Dict[Path, asyncio.Future] = {}
+        if self.date_folders:
+            core._configure_date_resolver()
+
+    async def _call(self, func: Callable, *args, **kwargs):
+        """Run a blocking call on the executor"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+
+    async def organize(self, entries: Iterable[os.DirEntry],
+                       cancel_check: Optional[CancelCheck]) -> List[OrganizeResult]:
+        """Dispatch files with at most max_in_flight of them in progress"""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        previous_turn = loop.create_future()
+        previous_turn.set_result(None)
+        tasks = []
+
+        for entry in entries:
+            if cancel_check and cancel_check():
+                break
+            await slots.acquire()
+            own_turn = loop.create_future()
+            task = asyncio.ensure_future(self._organize_one(entry, previous_turn, own_turn))
+            task.add_done_callback(lambda _: slots.release())
+            tasks.append(task)
+            previous_turn = own_turn
+
+        return list(await asyncio.gather(*tasks))
+
+    async def _organize_one(self, entry: os.DirEntry, previous_turn: asyncio.Future,
+                            own_turn: asyncio.Future) -> OrganizeResult:
+        """Organize one file; claims its destination name after the previous file claimed its own"""
+        metrics = self.metrics
+        clock = time.perf_counter
+        file_path = Path(entry.path)
+        file_start = clock()
+        category = file_stat = None
+        existing = None
+        try:
+            try:
+                category, directory, file_stat = await self._resolve_directory(entry, file_path)
+                names = self._directory_names(directory)
+                if self.organize_mode in REFERENCE_METHODS:
+                    # A previous run may already have linked or cloned this original here
+                    await names
+                    existing = await self._call(self.core._find_reference, file_path, file_stat,
+                                                directory / file_path.name)
+            finally:
+                await previous_turn
+
+            try:
+                names = await names
+                phase_start = clock()
+                name = file_path.name
+                if existing is not None:
+                    name = existing.name
+                elif name.casefold() in names and self.move_duplicates:
+                    name = self._unique_name(file_path, directory, names)
+                    metrics.count("renamed_duplicates")
+                names.add(name.casefold())
+                metrics.record("collision_check", clock() - phase_start)
+            finally:
+                own_turn.set_result(None)
+
+            destination = directory / name
+            if existing is not None:
+                now = clock()
+                metrics.file_done(file_path.name, now - file_start, None)
+                metrics.count("already_organized")
+                result = OrganizeResult(file_path, destination, category, "existing", 0, now - file_start)
+            else:
+                # Move file
+                phase_start = clock()
+                method = await self._call(self.core._transfer_file, file_path, destination, self.organize_mode)
+                now = clock()
+                metrics.record("move", now - phase_start)
+                size = file_stat.st_size if file_stat is not None else None
+                metrics.file_done(file_path.name, now - file_start, size)
+                if method != "move":
+                    metrics.count(method)
+
+                result = OrganizeResult(file_path, destination, category, method, size, now - file_start)
+
+        except Exception as e:
+            if not own_turn.done():
+                own_turn.set_result(None)
+            metrics.file_failed(e)
+            result = OrganizeResult(file_path, None, category, None,
+                                    file_stat.st_size if file_stat is not None else None,
+                                    clock() - file_start, error_code(e), e)
+
+        if self.result_callback:
+            self.result_callback(result)
+        return result
+
+    async def _resolve_directory(self, entry: os.DirEntry, file_path: Path) -> Tuple[str, Path, Optional[os.stat_result]]:
+        """Stat and categorize a file and build its destination directory"""
+        clock = time.perf_counter
+        file_stat = None
+        if self.needs_stat:
+            stat_start = clock()
+            file_stat = await self._call(entry.stat)
+            self.metrics.record("stat", clock() - stat_start)
+
+        categorize_start = clock()
+        category = self.core.categorize_file(file_path, file_stat)
+        self.metrics.record("categorize", clock() - categorize_start)
+
+        directory = self.target_path / category
+        if self.date_folders:
+            date_folder = await self._call(self.core.date_resolver.get_folder_name, file_path, file_stat)
+            directory = directory / date_folder
+        return category, directory, file_stat
+
+    def _directory_names(self, directory: Path) -> asyncio.Future:
+        """Get the (shared) task creating a destination directory and listing its names"""
+        task = self.directories.get(directory)
+        if task is None:
+            task = self.directories[directory] = asyncio.ensure_future(self._prepare_directory(directory))
+        return task
+
+    async def _prepare_directory(self, directory: Path) -> Set[str]:
+        """Create a destination directory and list its casefolded names"""
+        start = time.perf_counter()
+        await self._call(self.fs.mkdir, directory, parents=True, exist_ok=True)
+        names = await self._call(self.fs.listdir, directory)
+        self.metrics.record("mkdir", time.perf_counter() - start)
+        return {name.casefold() for name in names}
+
+    def _unique_name(self, file_path: Path, directory: Path, names: Set[str]) -> str:
+        """Generate a name not yet used in the destination directory, numbered like a serial run"""
+        unique_path = self.core.next_duplicate_name(directory / file_path.name,
+                                                    lambda path: path.name.casefold() in names)
+        return unique_path.name
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checkpoint
+Responsible for saving the progress of organize runs so that a stopped run can be resumed
+"""
+
+import os
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+CHECKPOINT_VERSION = 1
+# Minimum number of seconds between two periodic checkpoints
+CHECKPOINT_INTERVAL = 2.0
+
+
+class CheckpointStore:
+    """Stores the progress of one organize run next to the configuration file
+
+    The file list is written once per run (gzip, NUL-separated names); the small state file
+    (position, destination directory cache and duplicate name registry) is rewritten
+    atomically at every checkpoint.
+    """
+
+    def __init__(self, state_file: str, interval: float = CHECKPOINT_INTERVAL):
+        self.state_file = state_file
+        self.files_file = os.path.splitext(state_file)[0] + ".files.gz"
+        self.interval = interval
+        self._header = {}
+        self._last_save = 0.0
+
+    def exists(self) -> bool:
+        """Check whether a resumable run is stored"""
+        return os.path.exists(self.state_file) and os.path.exists(self.files_file)
+
+    def begin(self, source_path: Path, target_path: Path, file_names: List[str]) -> None:
+        """Start checkpointing a new run over file_names (in processing order)"""
+        self.clear()
+        self._write_atomic(self.files_file, gzip.compress("\0".join(file_names).encode("utf-8", "surrogateescape")))
+        self._header = {
+            "version": CHECKPOINT_VERSION,
+            "source": str(source_path),
+            "target": str(target_path),
+            "total": len(file_names),
+        }
+        self.save(0, dict, force=True)
+
+    def resume(self, checkpoint: dict) -> None:
+        """Continue checkpointing a loaded run"""
+        self._header = {key: checkpoint[key] for key in ("version", "source", "target", "total")}
+        self._last_save = time.monotonic()
+
+    def save(self, position: int, get_run_state: Callable[[], dict], force: bool = False) -> bool:
+        """Save the run position and state, at most once per interval unless forced
+
+        get_run_state is only called when a checkpoint is actually written.
+        """
+        now = time.monotonic()
+        if not self._header or (not force and now - self._last_save < self.interval):
+            return False
+
+        self._last_save = now
+        state = dict(self._header, position=position, **get_run_state())
+        try:
+            self._write_atomic(self.state_file, json.dumps(state).encode("utf-8"))
+            return True
+        except OSError as e:
+            print(f"Checkpoint save error: {e}")
+            return False
+
+    def load(self) -> Optional[dict]:
+        """Load the stored run; "files" holds the names that are still to be processed"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("version") != CHECKPOINT_VERSION:
+                return None
+            with gzip.open(self.files_file, 'rb') as f:
+                file_names = f.read().decode("utf-8", "surrogateescape").split("\0")
+        except (OSError, ValueError) as e:
+            print(f"Checkpoint load error: {e}")
+            return None
+
+        checkpoint["files"] = file_names[checkpoint["position"]:checkpoint["total"]]
+        return checkpoint
+
+    def clear(self) -> None:
+        """Delete the stored run"""
+        self._header = {}
+        for file_path in (self.state_file, self.files_file):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def _write_atomic(self, file_path: str, data: bytes) -> None:
+        """Write a file through a temporary file so that a crash never leaves it half written"""
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, file_path)
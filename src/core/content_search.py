@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content Search
+Responsible for finding files whose content matches a pattern, searching memory-mapped files
+on a thread pool
+"""
+
+import os
+import re
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .file_organizer_core import CancelCheck
+
+
+# Files larger than this (in MB) are skipped by default
+DEFAULT_MAX_SIZE_MB = 100
+# Number of leading bytes probed for NUL bytes; files containing one are treated as binary
+BINARY_PROBE_SIZE = 8192
+# Files searched per batch; cancellation is checked between batches
+BATCH_SIZE = 256
+
+
+class ContentSearcher:
+    """Matches file contents against a bytes regex
+
+    Files are memory-mapped instead of read, so the regex scans the page cache directly and
+    stops reading at the first match. Empty files, files over the size cap and files whose
+    first bytes contain NUL (binary files) are skipped without mapping them. Batches of files are
+    searched on a thread pool: the regex holds the GIL, so matching itself runs one file at a
+    time, and the threads only overlap opening, mapping and probing files.
+    """
+
+    def __init__(self, pattern: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+                 max_workers: Optional[int] = None):
+        # UTF-8 text is matched byte for byte; "^" and "$" match at every line
+        self.regex = re.compile(pattern.encode("utf-8", "surrogateescape"), re.IGNORECASE | re.MULTILINE)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def matches(self, path: str, size: Optional[int] = None) -> bool:
+        """Check whether a text file contains a match"""
+        try:
+            if size is None:
+                size = os.stat(path).st_size
+            if size == 0 or size > self.max_size:
+                return False
+
+            with open(path, 'rb') as f:
+                if b"\0" in f.read(BINARY_PROBE_SIZE):
+                    return False
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self.regex.search(mapped) is not None
+        except (OSError, ValueError):
+            # Unreadable, vanished or truncated while mapping
+            return False
+
+    def search(self, candidates: Iterable[Tuple[str, Optional[int]]],
+               cancel_check: Optional[CancelCheck] = None) -> Iterator[str]:
+        """Yield the paths of matching files from (path, size) pairs, in input order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch in _batches(candidates, BATCH_SIZE):
+                if cancel_check and cancel_check():
+                    return
+                found = executor.map(lambda candidate: self.matches(*candidate), batch)
+                for (path, _), matched in zip(batch, found):
+                    if matched:
+                        yield path
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
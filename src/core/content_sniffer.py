@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content Sniffer
+Responsible for recognizing file types from magic numbers when the extension is missing or unknown
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Number of bytes read from the start of a file
+PREFIX_SIZE = 64
+
+# Signatures as (pattern, extension); "?" in a str pattern matches any single byte
+SIGNATURES: List[Tuple[object, str]] = [
+    # Images
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"II*\x00", ".tiff"),
+    (b"MM\x00*", ".tiff"),
+    ("RIFF????WEBP", ".webp"),
+    # ISO base media files (MP4, QuickTime, HEIF, ...) are told apart by the major brand after
+    # "ftyp"; unknown brands are left to the extension
+    ("????ftypheic", ".heic"),
+    ("????ftypheix", ".heic"),
+    ("????ftypmif1", ".heif"),
+    ("????ftypmsf1", ".heif"),
+    ("????ftypavif", ".avif"),
+    ("????ftypM4A ", ".m4a"),
+    ("????ftypM4B ", ".m4b"),
+    # Videos
+    ("????ftypqt  ", ".mov"),
+    ("????ftypisom", ".mp4"),
+    ("????ftypiso2", ".mp4"),
+    ("????ftypmp41", ".mp4"),
+    ("????ftypmp42", ".mp4"),
+    ("????ftyp3gp", ".mp4"),
+    ("RIFF????AVI ", ".avi"),
+    (b"\x1a\x45\xdf\xa3", ".mkv"),
+    (b"FLV\x01", ".flv"),
+    (b"0&\xb2u\x8ef\xcf\x11", ".wmv"),
+    # Audio
+    (b"ID3", ".mp3"),
+    (b"\xff\xfb", ".mp3"),
+    ("RIFF????WAVE", ".wav"),
+    (b"fLaC", ".flac"),
+    (b"OggS", ".ogg"),
+    # Documents
+    (b"%PDF-", ".pdf"),
+    (b"{\\rtf", ".rtf"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", ".doc"),
+    # Archives
+    (b"PK\x03\x04", ".zip"),
+    (b"Rar!\x1a\x07", ".rar"),
+    (b"7z\xbc\xaf\x27\x1c", ".7z"),
+    (b"\x1f\x8b", ".gz"),
+    # Executables
+    (b"MZ", ".exe"),
+    (b"!<arch>\ndebian", ".deb"),
+    (b"\xed\xab\xee\xdb", ".rpm"),
+    # Code
+    (b"#!/usr/bin/env python", ".py"),
+    (b"#!/usr/bin/python", ".py"),
+    (b"<!DOCTYPE html", ".html"),
+    (b"<!doctype html", ".html"),
+    (b"<html", ".html"),
+]
+
+# Trie edge key matching any byte
+_WILDCARD = -1
+# Trie node key holding the extension of a complete signature
+_TERMINAL = -2
+
+
+def _pattern_bytes(pattern) -> List[int]:
+    """Convert a signature pattern to a list of byte values, using _WILDCARD for "?" """
+    if isinstance(pattern, bytes):
+        return list(pattern)
+    return [_WILDCARD if char == "?" else ord(char) for char in pattern]
+
+
+def compile_signatures(signatures: Iterable[Tuple[object, str]]) -> Dict[int, object]:
+    """Compile signatures into a byte trie with wildcard edges"""
+    root: Dict[int, object] = {}
+    for pattern, extension in signatures:
+        node = root
+        for value in _pattern_bytes(pattern):
+            node = node.setdefault(value, {})
+        node[_TERMINAL] = extension
+    return root
+
+
+class ContentSniffer:
+    """Matches file prefixes against a compiled signature trie"""
+
+    def __init__(self, signatures: Iterable[Tuple[object, str]] = SIGNATURES, max_workers: int = 8):
+        self.trie = compile_signatures(signatures)
+        self.max_workers = max_workers
+
+    def sniff_extension(self, prefix: bytes) -> Optional[str]:
+        """Get the extension of the longest signature matching prefix"""
+        best_extension = None
+        best_length = -1
+        stack = [(self.trie, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+            extension = node.get(_TERMINAL)
+            if extension is not None and depth > best_length:
+                best_extension, best_length = extension, depth
+            if depth >= len(prefix):
+                continue
+
+            child = node.get(prefix[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+            wildcard = node.get(_WILDCARD)
+            if wildcard is not None:
+                stack.append((wildcard, depth + 1))
+
+        return best_extension
+
+    def read_prefix(self, file_path: Path) -> bytes:
+        """Read the first PREFIX_SIZE bytes of a file (empty on error)"""
+        try:
+            with open(file_path, "rb") as f:
+                return f.read(PREFIX_SIZE)
+        except OSError:
+            return b""
+
+    def sniff_file(self, file_path: Path) -> Optional[str]:
+        """Guess the extension of a single file from its content"""
+        return self.sniff_extension(self.read_prefix(file_path))
+
+    def sniff_files(self, file_paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        """Guess the extensions of many files, reading prefixes in a thread pool"""
+        file_paths = list(file_paths)
+        if not file_paths:
+            return {}
+
+        # Imported on first use to keep application startup fast
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            extensions = executor.map(self.sniff_file, file_paths)
+            return {str(file_path): extension for file_path, extension in zip(file_paths, extensions)}
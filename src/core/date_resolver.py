@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Date Resolver
+Responsible for choosing the date folder of a file: date source (mtime, ctime or
+capture date from EXIF/container metadata) and folder granularity (year, month, day, ISO week)
+"""
+
+import os
+import struct
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+
+GRANULARITIES = ("year", "month", "day", "week")
+DATE_SOURCES = ("mtime", "ctime", "capture")
+
+# Extensions whose capture date can be read from file headers
+EXIF_EXTENSIONS = {".jpg", ".jpeg", ".tif", ".tiff"}
+CONTAINER_EXTENSIONS = {".mp4", ".mov", ".m4v", ".3gp"}
+
+# Upper bounds for header parsing; no file is ever read beyond a few kilobytes
+MAX_JPEG_SEGMENTS = 32
+MAX_IFD_ENTRIES = 512
+MAX_ATOMS = 64
+EXIF_DATE_LENGTH = 19
+
+# Seconds between 1904-01-01 (QuickTime epoch) and 1970-01-01
+QUICKTIME_EPOCH_OFFSET = 2082844800
+
+TAG_DATETIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+TAG_DATETIME_ORIGINAL = 0x9003
+
+
+class DateBucketCache:
+    """Memoizes timestamp -> date folder names by period boundaries
+
+    Each period seen once is stored as a [start, end) timestamp range, so later files
+    from the same period resolve with a bisect instead of a datetime allocation.
+    The three parallel lists are only read and changed under a lock, since the async
+    pipeline resolves folders on executor threads.
+    """
+
+    def __init__(self, granularity: str = "month"):
+        self.granularity = granularity
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+
+    def _period(self, file_date: datetime) -> Tuple[datetime, datetime, str]:
+        """Get the start, end and folder name of the period containing file_date"""
+        if self.granularity == "year":
+            start = datetime(file_date.year, 1, 1)
+            return start, datetime(file_date.year + 1, 1, 1), file_date.strftime("%Y")
+        if self.granularity == "day":
+            start = datetime(file_date.year, file_date.month, file_date.day)
+            return start, start + timedelta(days=1), file_date.strftime("%Y-%m-%d")
+        if self.granularity == "week":
+            day = datetime(file_date.year, file_date.month, file_date.day)
+            start = day - timedelta(days=day.weekday())
+            iso_year, iso_week, _ = file_date.isocalendar()
+            return start, start + timedelta(days=7), f"{iso_year}-W{iso_week:02d}"
+
+        start = datetime(file_date.year, file_date.month, 1)
+        if file_date.month == 12:
+            end = datetime(file_date.year + 1, 1, 1)
+        else:
+            end = datetime(file_date.year, file_date.month + 1, 1)
+        return start, end, file_date.strftime("%Y-%m")
+
+    def get(self, timestamp: float) -> str:
+        """Get the date folder name for a timestamp"""
+        with self._lock:
+            index = bisect_right(self._starts, timestamp) - 1
+            if index >= 0 and timestamp < self._ends[index]:
+                return self._labels[index]
+
+            start, end, label = self._period(datetime.fromtimestamp(timestamp))
+            index += 1
+            self._starts.insert(index, start.timestamp())
+            self._ends.insert(index, end.timestamp())
+            self._labels.insert(index, label)
+            return label
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    """Read exactly size bytes or raise ValueError"""
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file")
+    return data
+
+
+def _parse_exif_date(raw: bytes) -> Optional[float]:
+    """Convert an EXIF "YYYY:MM:DD HH:MM:SS" value to a local timestamp"""
+    try:
+        text = raw[:EXIF_DATE_LENGTH].decode("ascii")
+        return datetime.strptime(text, "%Y:%m:%d %H:%M:%S").timestamp()
+    except (UnicodeDecodeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _read_tiff_date(f: BinaryIO, base: int) -> Optional[float]:
+    """Read DateTimeOriginal (or DateTime) from a TIFF structure starting at base"""
+    f.seek(base)
+    header = _read_exact(f, 8)
+    if header[:2] == b"II":
+        endian = "<"
+    elif header[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+
+    def read_ifd(offset: int) -> Dict[int, Tuple[int, int, bytes]]:
+        f.seek(base + offset)
+        count = struct.unpack(endian + "H", _read_exact(f, 2))[0]
+        count = min(count, MAX_IFD_ENTRIES)
+        data = _read_exact(f, count * 12)
+        tags = {}
+        for i in range(count):
+            tag, value_type, value_count = struct.unpack(endian + "HHI", data[i * 12:i * 12 + 8])
+            tags[tag] = (value_type, value_count, data[i * 12 + 8:i * 12 + 12])
+        return tags
+
+    def read_ascii(value: Tuple[int, int, bytes]) -> Optional[float]:
+        _, value_count, raw = value
+        if value_count < EXIF_DATE_LENGTH:
+            return None
+        f.seek(base + struct.unpack(endian + "I", raw)[0])
+        return _parse_exif_date(_read_exact(f, EXIF_DATE_LENGTH))
+
+    ifd0 = read_ifd(struct.unpack(endian + "I", header[4:8])[0])
+    if TAG_EXIF_IFD in ifd0:
+        exif_ifd = read_ifd(struct.unpack(endian + "I", ifd0[TAG_EXIF_IFD][2])[0])
+        if TAG_DATETIME_ORIGINAL in exif_ifd:
+            timestamp = read_ascii(exif_ifd[TAG_DATETIME_ORIGINAL])
+            if timestamp is not None:
+                return timestamp
+    if TAG_DATETIME in ifd0:
+        return read_ascii(ifd0[TAG_DATETIME])
+    return None
+
+
+def _read_jpeg_date(f: BinaryIO) -> Optional[float]:
+    """Locate the APP1 Exif segment of a JPEG by walking segment headers"""
+    if _read_exact(f, 2) != b"\xff\xd8":
+        return None
+
+    for _ in range(MAX_JPEG_SEGMENTS):
+        marker, length = struct.unpack(">2sH", _read_exact(f, 4))
+        if marker[0] != 0xFF or marker[1] == 0xDA:
+            # Start of scan: metadata segments are over
+            return None
+        if marker[1] == 0xE1:
+            segment_start = f.tell()
+            if _read_exact(f, 6) == b"Exif\x00\x00":
+                return _read_tiff_date(f, segment_start + 6)
+            f.seek(segment_start)
+        f.seek(length - 2, os.SEEK_CUR)
+    return None
+
+
+def _read_container_date(f: BinaryIO) -> Optional[float]:
+    """Read the mvhd creation time of an ISO base media (MP4/QuickTime) file"""
+
+    def find_atom(name: bytes, end: Optional[int]) -> Optional[Tuple[int, Optional[int]]]:
+        """Skip sibling atoms until name; return (payload start, atom end)"""
+        for _ in range(MAX_ATOMS):
+            start = f.tell()
+            if end is not None and start + 8 > end:
+                return None
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            size, atom_type = struct.unpack(">I4s", header)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack(">Q", _read_exact(f, 8))[0]
+                header_size = 16
+            elif size == 0:
+                # Atom extends to the end of the file
+                return (start + header_size, end) if atom_type == name else None
+            if size < header_size:
+                return None
+            if atom_type == name:
+                return start + header_size, start + size
+            f.seek(start + size)
+        return None
+
+    moov = find_atom(b"moov", None)
+    if moov is None:
+        return None
+    f.seek(moov[0])
+    if find_atom(b"mvhd", moov[1]) is None:
+        return None
+
+    version = _read_exact(f, 4)[0]
+    if version == 1:
+        creation_time = struct.unpack(">Q", _read_exact(f, 8))[0]
+    else:
+        creation_time = struct.unpack(">I", _read_exact(f, 4))[0]
+    if creation_time <= QUICKTIME_EPOCH_OFFSET:
+        return None
+    return float(creation_time - QUICKTIME_EPOCH_OFFSET)
+
+
+def read_capture_timestamp(file_path: Path) -> Optional[float]:
+    """Read the capture date of an image or video from its header, or None if unavailable"""
+    extension = file_path.suffix.lower()
+    try:
+        with open(file_path, "rb") as f:
+            if extension in (".jpg", ".jpeg"):
+                return _read_jpeg_date(f)
+            if extension in (".tif", ".tiff"):
+                return _read_tiff_date(f, 0)
+            if extension in CONTAINER_EXTENSIONS:
+                return _read_container_date(f)
+    except (OSError, ValueError, struct.error):
+        pass
+    return None
+
+
+class DateResolver:
+    """Resolves the date folder of files, caching capture dates per inode"""
+
+    def __init__(self, granularity: str = "month", source: str = "mtime", max_workers: int = 8):
+        self.max_workers = max_workers
+        self._capture_cache: Dict[Tuple[int, int], Tuple[int, int, Optional[float]]] = {}
+        self._cache_lock = threading.Lock()
+        self.granularity = ""
+        self.source = ""
+        self._buckets = DateBucketCache()
+        self.configure(granularity, source)
+
+    def configure(self, granularity: str, source: str) -> None:
+        """Change granularity and date source, keeping cached capture dates"""
+        if granularity not in GRANULARITIES:
+            granularity = "month"
+        if source not in DATE_SOURCES:
+            source = "mtime"
+        if granularity != self.granularity:
+            self.granularity = granularity
+            self._buckets = DateBucketCache(granularity)
+        self.source = source
+
+    def needs_header(self, file_path: Path) -> bool:
+        """Check whether the capture date of file_path comes from its header"""
+        extension = file_path.suffix.lower()
+        return extension in EXIF_EXTENSIONS or extension in CONTAINER_EXTENSIONS
+
+    def _capture_timestamp(self, file_path: Path, file_stat: os.stat_result) -> Optional[float]:
+        """Get the capture timestamp of a file through the per-inode cache"""
+        key = (file_stat.st_dev, file_stat.st_ino)
+        with self._cache_lock:
+            cached = self._capture_cache.get(key)
+        if cached is not None and cached[0] == file_stat.st_mtime_ns and cached[1] == file_stat.st_size:
+            return cached[2]
+
+        timestamp = read_capture_timestamp(file_path)
+        with self._cache_lock:
+            self._capture_cache[key] = (file_stat.st_mtime_ns, file_stat.st_size, timestamp)
+        return timestamp
+
+    def get_timestamp(self, file_path: Path, file_stat: os.stat_result) -> float:
+        """Get the timestamp used for the date folder of a file"""
+        if self.source == "ctime":
+            return file_stat.st_ctime
+        if self.source == "capture" and self.needs_header(file_path):
+            timestamp = self._capture_timestamp(file_path, file_stat)
+            if timestamp is not None:
+                return timestamp
+        return file_stat.st_mtime
+
+    def get_folder_name(self, file_path: Path, file_stat: os.stat_result) -> str:
+        """Get the date folder name for a file"""
+        return self._buckets.get(self.get_timestamp(file_path, file_stat))
+
+    def prefetch(self, files: Iterable[Tuple[Path, os.stat_result]]) -> None:
+        """Read capture dates of many files in a thread pool ahead of organization"""
+        if self.source != "capture":
+            return
+
+        pending = [(file_path, file_stat) for file_path, file_stat in files
+                   if self.needs_header(file_path)]
+        if not pending:
+            return
+
+        # Imported on first use to keep application startup fast
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for file_path, file_stat in pending:
+                executor.submit(self._capture_timestamp, file_path, file_stat)
+
+    def clear_cache(self) -> None:
+        """Forget cached capture dates"""
+        with self._cache_lock:
+            self._capture_cache.clear()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Directory State
+Responsible for the persistent directory state cache that lets incremental organize runs
+skip directories unchanged since the previous run and examine only new files in the others
+"""
+
+import os
+import gzip
+import json
+import time
+from typing import Dict, Optional
+
+CACHE_VERSION = 2
+# Directories modified this recently can't be cached yet: on filesystems with coarse timestamps
+# (FAT: 2 s) a later change could keep the same mtime
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class DirectoryStateCache:
+    """Maps directory paths to [mtime_ns or None, entry count, {file name: mtime_ns}] of their last run
+
+    The file map lists the files still in the directory that a completed run handled, so a
+    changed directory only needs its new or modified files examined. A directory whose mtime
+    is unchanged has the same entries as when it was cached and is skipped entirely; the
+    mtime is None while some of its files are unhandled. New states are staged while a run
+    scans and only committed once the run completed.
+    """
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self._states: Dict[str, list] = {}
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache file (an unreadable cache is treated as empty)"""
+        self._states = {}
+        try:
+            with gzip.open(self.cache_file, 'rb') as f:
+                data = json.loads(f.read().decode("utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self._states = data["directories"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Directory cache load error: {e}")
+
+    def save(self) -> bool:
+        """Write the cache file atomically"""
+        temp_path = self.cache_file + ".tmp"
+        try:
+            with gzip.open(temp_path, 'wb') as f:
+                f.write(json.dumps({"version": CACHE_VERSION, "directories": self._states}).encode("utf-8"))
+            os.replace(temp_path, self.cache_file)
+            return True
+        except OSError as e:
+            print(f"Directory cache save error: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Forget all directory states"""
+        self._states = {}
+        self._pending = {}
+        try:
+            os.remove(self.cache_file)
+        except FileNotFoundError:
+            pass
+
+    def unchanged_state(self, directory: str, dir_stat: os.stat_result) -> Optional[list]:
+        """Get the cached state if the directory is unchanged and all its files were handled"""
+        state = self._states.get(directory)
+        if state is not None and state[0] == dir_stat.st_mtime_ns:
+            return state
+        return None
+
+    def handled_files(self, directory: str) -> Dict[str, int]:
+        """Get {file name: mtime_ns} of the files in a directory that earlier runs handled"""
+        state = self._states.get(directory)
+        return state[2] if state is not None else {}
+
+    def scanned(self, directory: str, files: Dict[str, int]) -> None:
+        """Stage the files ({name: mtime_ns}) of a directory that are handled once this run completes"""
+        self._pending[directory] = dict(files)
+
+    def file_failed(self, file_path: str) -> None:
+        """Unstage a file that could not be organized, so that the next run examines it again"""
+        examined = self._pending.get(os.path.abspath(os.path.dirname(file_path)))
+        if examined is not None:
+            examined.pop(os.path.basename(file_path), None)
+
+    def discard_pending(self) -> None:
+        """Drop the states staged by an incomplete run"""
+        self._pending = {}
+
+    def commit(self, fs) -> int:
+        """Cache the directories scanned by a completed run; returns the number cached as unchanged
+
+        Each directory is listed once more (in move mode organizing moved most files out, so the
+        listing is short) and recorded with the mtime it has after the run. When the run itself
+        just modified a directory (moves out of it), this waits once until the racy window has
+        passed, so the next run can skip it with a single stat call. Only files the run handled
+        and that are unmodified are recorded; files that failed or arrived meanwhile are
+        examined next time.
+        """
+        self._wait_for_racy_window(fs)
+        cached = 0
+        now_ns = time.time_ns()
+        for directory, examined in self._pending.items():
+            self._states.pop(directory, None)
+            try:
+                dir_stat = fs.stat(directory)
+                handled: Dict[str, int] = {}
+                entry_count = unhandled = 0
+                with fs.scandir(directory) as entries:
+                    for entry in entries:
+                        entry_count += 1
+                        if entry.is_dir(follow_symlinks=False):
+                            continue
+                        mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                        if examined.get(entry.name) == mtime_ns:
+                            handled[entry.name] = mtime_ns
+                        else:
+                            unhandled += 1
+            except OSError:
+                continue
+
+            unchanged = not unhandled and now_ns - dir_stat.st_mtime_ns >= RACY_WINDOW_NS
+            self._states[directory] = [dir_stat.st_mtime_ns if unchanged else None, entry_count, handled]
+            if unchanged:
+                cached += 1
+
+        self._pending = {}
+        return cached
+
+    def _wait_for_racy_window(self, fs) -> None:
+        """Sleep until no staged directory was modified within RACY_WINDOW_NS"""
+        newest_ns = 0
+        for directory in self._pending:
+            try:
+                newest_ns = max(newest_ns, fs.stat(directory).st_mtime_ns)
+            except OSError:
+                continue
+        wait_ns = newest_ns + RACY_WINDOW_NS - time.time_ns()
+        if 0 < wait_ns <= RACY_WINDOW_NS:
+            time.sleep(wait_ns / 1e9)
@@ -6,98 +6,573 @@ Responsible for file organization business logic, file categorization, and file
 """
 
 import os
-import shutil
 import re
+import time
+import errno
+import filecmp
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Set
+
+from .content_sniffer import ContentSniffer
+from .date_resolver import DateResolver
+from .directory_state import DirectoryStateCache
+from .filesystem import LocalFileSystem
+from .glob_matcher import GlobMatcher, compile_globs
+from .organize_result import OrganizeResult, error_code, format_result
+from .routing import compile_routes
+from .search_filter import SearchFilter, parse_search_filter
+from .rule_engine import RuleSet, compile_rules
+from .run_metrics import RunMetrics
+
+
+# Callback types used by long-running operations executed on a background thread
+CancelCheck = Callable[[], bool]
+ProgressCallback = Callable[[int, int], None]
+# Called with {destination folder: file entries} before files are moved; False stops the operation
+SpacePreflight = Callable[[Dict[Path, List[os.DirEntry]]], bool]
+
+# Organize modes: move the originals, or keep them and reference them from the target tree
+ORGANIZE_MODES = ("move", "hardlink", "reflink")
+# Methods tried in order by the reference modes; copy always works
+REFERENCE_METHODS = {"hardlink": ("link", "copy"), "reflink": ("clone", "link", "copy")}
+# Search modes: regex on file names, glob patterns on relative paths, regex on file contents
+SEARCH_MODES = ("name", "glob", "content")
+# Folder of the symlink views (view_farm) inside a target; recursive walks never descend into it
+VIEWS_DIR_NAME = "_views"
+# Errors meaning a method can't work for this source/target pair at all (other device, no reflinks)
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS}
 
 
 class FileOrganizerCore:
     """Core file organization logic"""
     
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, filesystem: Optional[LocalFileSystem] = None):
         self.config_manager = config_manager
+        self.fs = filesystem or LocalFileSystem()
+        self.date_resolver = DateResolver()
+        self.content_sniffer = ContentSniffer()
+        self._sniffed_extensions: Dict[str, Optional[str]] = {}
+        self._rule_set: Optional[RuleSet] = None
+        self._rule_source = None
+        self.metrics = RunMetrics()
+        # Guards the duplicate numbering shared with the async pipeline's threads
+        self._duplicate_lock = threading.Lock()
+        self.reset_run_state()
     
-    def categorize_file(self, file_path: Path) -> str:
-        """Categorize a file based on its extension"""
-        file_extension = file_path.suffix.lower()
-        
-        # Check if extension matches any category
+    def _category_for_extension(self, file_extension: str) -> Optional[str]:
+        """Get the category configured for an extension, or None"""
         file_types = self.config_manager.get_file_types()
         for category, extensions in file_types.items():
             if file_extension in extensions:
                 return category
+        return None
+    
+    def prepare_rules(self) -> None:
+        """Compile the configured organize rules (also refreshes their age cutoffs)"""
+        self._rule_source = self.config_manager.get_setting("organize_rules")
+        self._rule_set = compile_rules(self._rule_source)
+    
+    def _get_rule_set(self) -> RuleSet:
+        """Get the compiled organize rules, recompiling when the configuration changed"""
+        if self._rule_set is None or self._rule_source is not self.config_manager.get_setting("organize_rules"):
+            self.prepare_rules()
+        return self._rule_set
+    
+    def prepare_organization(self, entries: List[os.DirEntry]) -> None:
+        """Prepare an organize run: sniff unknown files, read capture dates and compile rules in bulk"""
+        self.reset_run_state()
+        self.prefetch_content_types(Path(entry.path) for entry in entries)
+        self.prefetch_dates(entries)
+        self.prepare_rules()
+    
+    def needs_file_stat(self) -> bool:
+        """Check whether organizing needs stat data (date folders or stat-based rules)"""
+        return self.config_manager.get_setting("create_date_folders", True) or self._get_rule_set().needs_stat
+    
+    def categorize_file(self, file_path: Path, file_stat: Optional[os.stat_result] = None) -> str:
+        """Categorize a file by organize rules, then by its extension, falling back to its content"""
+        category = self._categorize_by_type(file_path)
+        
+        rule_set = self._get_rule_set()
+        if rule_set:
+            if file_stat is None and rule_set.needs_stat:
+                file_stat = self.fs.stat(file_path)
+            destination = rule_set.match(file_path, file_stat, category)
+            if destination is not None:
+                return destination
+        
+        return category
+    
+    def _categorize_by_type(self, file_path: Path) -> str:
+        """Categorize a file based on its extension, falling back to its content"""
+        # Check if extension matches any category
+        category = self._category_for_extension(file_path.suffix.lower())
+        if category is not None:
+            return category
+        
+        # Sniff the content of files the extension table doesn't resolve
+        if self.config_manager.get_setting("sniff_unknown_files", True):
+            key = str(file_path)
+            if key in self._sniffed_extensions:
+                sniffed_extension = self._sniffed_extensions.pop(key)
+            else:
+                sniffed_extension = self.content_sniffer.sniff_file(file_path)
+            if sniffed_extension:
+                category = self._category_for_extension(sniffed_extension)
+                if category is not None:
+                    return category
         
         # Return "other" if no category matches
         return self.config_manager.get_text("other")
     
-    def organize_single_file(self, file_path: Path, target_path: Path) -> Tuple[bool, str]:
-        """Organize a single file to its appropriate category folder"""
+    def prefetch_content_types(self, file_paths: Iterable[Path]) -> None:
+        """Sniff, in one batch, the content of files whose extension has no category"""
+        self._sniffed_extensions.clear()
+        if not self.config_manager.get_setting("sniff_unknown_files", True):
+            return
+        
+        unresolved = [file_path for file_path in file_paths
+                      if self._category_for_extension(file_path.suffix.lower()) is None]
+        self._sniffed_extensions.update(self.content_sniffer.sniff_files(unresolved))
+    
+    def organize_single_file(self, file_path: Path, target_path: Path,
+                             file_stat: Optional[os.stat_result] = None) -> Tuple[bool, str]:
+        """Organize a single file to its appropriate category folder and return (success, log message)"""
+        result = self._organize_file(file_path, target_path, file_stat)
+        return result.ok, self.format_result(result)
+    
+    def organize_iter(self, entries: Iterable[os.DirEntry], target_path: Path,
+                      cancel_check: Optional[CancelCheck] = None, prepare: bool = True) -> Iterator[OrganizeResult]:
+        """Organize entries into target_path, yielding one OrganizeResult per file in input order
+        
+        Results carry no log text; render them with format_result only where they are shown.
+        With prepare, the entries are first prepared in bulk (prepare_organization); pass False
+        when the caller already did.
+        """
+        if prepare:
+            entries = list(entries)
+            self.prepare_organization(entries)
+        needs_stat = self.needs_file_stat()
+        for entry in entries:
+            if cancel_check and cancel_check():
+                return
+            file_stat = self.get_entry_stat(entry) if needs_stat else None
+            yield self._organize_file(Path(entry.path), target_path, file_stat)
+    
+    def format_result(self, result: OrganizeResult) -> str:
+        """Render an organize result as a localized log line"""
+        return format_result(result, self.config_manager.get_text)
+    
+    def _organize_file(self, file_path: Path, target_path: Path,
+                       file_stat: Optional[os.stat_result] = None) -> OrganizeResult:
+        """Organize a single file to its appropriate category folder
+        
+        file_stat may carry the stat result collected during enumeration to avoid a second stat call.
+        Phase latencies are recorded in self.metrics.
+        """
+        metrics = self.metrics
+        clock = time.perf_counter
+        file_start = clock()
+        category = None
         try:
             # Determine file category
-            category = self.categorize_file(file_path)
+            category = self.categorize_file(file_path, file_stat)
+            phase_start = clock()
+            metrics.record("categorize", phase_start - file_start)
             
-            # Create category directory
+            # Category directory (rule destinations may be nested)
             category_path = target_path / category
-            category_path.mkdir(exist_ok=True)
             
-            # Create date folder if enabled
+            # Date folder if enabled
             if self.config_manager.get_setting("create_date_folders", True):
-                file_date = datetime.fromtimestamp(file_path.stat().st_mtime)
-                date_folder = file_date.strftime("%Y-%m")
+                if file_stat is None:
+                    stat_start = clock()
+                    file_stat = self.fs.stat(file_path)
+                    metrics.record("stat", clock() - stat_start)
+                self._configure_date_resolver()
+                date_folder = self.date_resolver.get_folder_name(file_path, file_stat)
                 category_path = category_path / date_folder
-                category_path.mkdir(exist_ok=True)
+            
+            self._ensure_directory(category_path)
+            now = clock()
+            metrics.record("mkdir", now - phase_start)
+            phase_start = now
             
             # Determine destination path
             destination = category_path / file_path.name
             
             # Handle duplicate files if enabled
-            if destination.exists() and self.config_manager.get_setting("move_duplicates", True):
-                destination = self._generate_unique_filename(destination)
+            organize_mode = self.config_manager.get_setting("organize_mode", "move")
+            if self.fs.exists(destination):
+                existing = (self._find_reference(file_path, file_stat, destination)
+                            if organize_mode in REFERENCE_METHODS else None)
+                if existing is not None:
+                    # A previous run already linked or cloned this original here
+                    now = clock()
+                    metrics.record("collision_check", now - phase_start)
+                    metrics.file_done(file_path.name, now - file_start, None)
+                    metrics.count("already_organized")
+                    return OrganizeResult(file_path, existing, category, "existing", 0, now - file_start)
+                if self.config_manager.get_setting("move_duplicates", True):
+                    destination = self._generate_unique_filename(destination)
+                    metrics.count("renamed_duplicates")
+            now = clock()
+            metrics.record("collision_check", now - phase_start)
+            phase_start = now
             
-            # Move file
-            shutil.move(str(file_path), str(destination))
+            # Move file (or reference it in organize-by-reference modes)
+            method = self._transfer_file(file_path, destination, organize_mode)
+            now = clock()
+            metrics.record("move", now - phase_start)
+            size = file_stat.st_size if file_stat is not None else None
+            metrics.file_done(file_path.name, now - file_start, size)
+            if method != "move":
+                metrics.count(method)
             
-            # Log the operation
-            log_message = f"{self.config_manager.get_text('move_file')} {file_path.name} → {category}/{destination.name}"
-            
-            return True, log_message
+            return OrganizeResult(file_path, destination, category, method, size, now - file_start)
             
         except Exception as e:
-            error_message = f"Error organizing {file_path.name}: {e}"
-            return False, error_message
+            metrics.file_failed(e)
+            return OrganizeResult(file_path, None, category, None,
+                                  file_stat.st_size if file_stat is not None else None,
+                                  clock() - file_start, error_code(e), e)
+    
+    def _find_reference(self, file_path: Path, file_stat: Optional[os.stat_result],
+                        destination: Path) -> Optional[Path]:
+        """Find a reference of file_path made by an earlier run at destination or its numbered names
+        
+        Probes destination, then name_1, name_2, ... as _generate_unique_filename hands them out,
+        until a name is free.
+        """
+        candidate = destination
+        counter = 1
+        while self.fs.exists(candidate):
+            if self._is_reference_of(file_path, file_stat, candidate):
+                return candidate
+            candidate = destination.parent / f"{destination.stem}_{counter}{destination.suffix}"
+            counter += 1
+        return None
+    
+    def _is_reference_of(self, file_path: Path, file_stat: Optional[os.stat_result], destination: Path) -> bool:
+        """Check whether destination is a hard link of file_path, or a clone / copy of it
+        
+        Hard links are decided by the inode alone. Clones and copies made by _transfer_file keep
+        the size and modification time of the original; those only select candidates, which
+        then must have the same content.
+        """
+        try:
+            if file_stat is None:
+                file_stat = self.fs.stat(file_path)
+            destination_stat = self.fs.stat(destination)
+            if (file_stat.st_dev, file_stat.st_ino) == (destination_stat.st_dev, destination_stat.st_ino):
+                return True
+            if (file_stat.st_size != destination_stat.st_size
+                    or file_stat.st_mtime_ns != destination_stat.st_mtime_ns):
+                return False
+            return filecmp.cmp(file_path, destination, shallow=False)
+        except OSError:
+            return False
+    
+    def _transfer_file(self, file_path: Path, destination: Path, mode: str) -> str:
+        """Move a file to destination, or hard link / clone / copy it there; returns the method used
+        
+        Reference modes never overwrite an existing destination. A method that fails because the
+        filesystems don't support it is not tried again during this run for destinations on the
+        same device, so one category folder on another mount doesn't turn every link into a copy.
+        """
+        methods = REFERENCE_METHODS.get(mode)
+        if methods is None:
+            self.fs.move(file_path, destination)
+            return "move"
+        
+        device = self._directory_device(destination.parent)
+        for method in methods:
+            if (method, device) in self._unsupported_methods:
+                continue
+            try:
+                getattr(self.fs, method)(file_path, destination)
+                return method
+            except FileExistsError:
+                raise
+            except OSError as e:
+                if method == methods[-1]:
+                    raise
+                if e.errno in _UNSUPPORTED_ERRNOS:
+                    self._unsupported_methods.add((method, device))
+        
+        raise OSError(errno.ENOTSUP, f"No usable method for organize mode {mode}", str(file_path))
+    
+    def _directory_device(self, directory: Path) -> int:
+        """Get the device of a destination directory, stat'ed once per run"""
+        device = self._directory_devices.get(directory)
+        if device is None:
+            device = self._directory_devices[directory] = self.fs.stat(directory).st_dev
+        return device
+    
+    def get_entry_stat(self, entry: os.DirEntry) -> Optional[os.stat_result]:
+        """Get the (cached) stat result of a directory entry, or None if it vanished"""
+        stat_start = time.perf_counter()
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+        finally:
+            self.metrics.record("stat", time.perf_counter() - stat_start)
+    
+    def _configure_date_resolver(self) -> None:
+        """Apply the date folder settings to the date resolver"""
+        self.date_resolver.configure(self.config_manager.get_setting("date_folder_granularity", "month"),
+                                     self.config_manager.get_setting("date_source", "mtime"))
+    
+    def prefetch_dates(self, entries: Iterable[os.DirEntry]) -> None:
+        """Resolve capture dates of many files in bulk before organizing them"""
+        if not self.config_manager.get_setting("create_date_folders", True):
+            return
+        
+        self._configure_date_resolver()
+        if self.date_resolver.source != "capture":
+            return
+        
+        files = []
+        for entry in entries:
+            file_path = Path(entry.path)
+            if self.date_resolver.needs_header(file_path):
+                try:
+                    files.append((file_path, entry.stat()))
+                except OSError:
+                    continue
+        self.date_resolver.prefetch(files)
     
     def _generate_unique_filename(self, file_path: Path) -> Path:
-        """Generate a unique filename to avoid conflicts"""
+        """Generate a unique filename to avoid conflicts
+        
+        Numbering continues from the last name generated for file_path in this run,
+        so n duplicates of one name cost O(n) existence checks instead of O(n²).
+        """
+        if not self.fs.exists(file_path):
+            return file_path
+        return self.next_duplicate_name(file_path, self.fs.exists)
+    
+    def next_duplicate_name(self, file_path: Path, is_taken: Callable[[Path], bool]) -> Path:
+        """Get the next numbered name (name_1, name_2, ...) of a taken file_path that is_taken rejects
+        
+        The per-destination counters are shared by serial and async runs (and saved in
+        checkpoints), so both number the same collisions alike.
+        """
         base_name = file_path.stem
         extension = file_path.suffix
-        counter = 1
+        with self._duplicate_lock:
+            counter = self._duplicate_counters.get(file_path, 1)
+            while True:
+                unique_path = file_path.parent / f"{base_name}_{counter}{extension}"
+                counter += 1
+                if not is_taken(unique_path):
+                    break
+            self._duplicate_counters[file_path] = counter
+        return unique_path
+    
+    def _ensure_directory(self, directory: Path) -> None:
+        """Create a destination directory unless this run already did"""
+        if directory not in self._known_directories:
+            self.fs.mkdir(directory, parents=True, exist_ok=True)
+            self._known_directories.add(directory)
+    
+    def reset_run_state(self) -> None:
+        """Forget the destination directories, duplicate numbering and unsupported methods of the previous run"""
+        self._known_directories: Set[Path] = set()
+        self._duplicate_counters: Dict[Path, int] = {}
+        # (method, destination device) pairs that failed as unsupported
+        self._unsupported_methods: Set[Tuple[str, int]] = set()
+        self._directory_devices: Dict[Path, int] = {}
+    
+    def get_run_state(self) -> dict:
+        """Get the destination directory cache and duplicate name registry in a JSON-friendly form"""
+        return {
+            "directories": [str(directory) for directory in self._known_directories],
+            "duplicates": {str(file_path): counter for file_path, counter in self._duplicate_counters.items()},
+        }
+    
+    def restore_run_state(self, run_state: dict) -> None:
+        """Restore the state saved with get_run_state, dropping directories that no longer exist"""
+        self._known_directories = {Path(directory) for directory in run_state.get("directories", [])
+                                   if self.fs.exists(directory)}
+        self._duplicate_counters = {Path(file_path): counter
+                                    for file_path, counter in run_state.get("duplicates", {}).items()}
+    
+    def _iter_file_entries(self, source_path: Path, cancel_check: Optional[CancelCheck] = None,
+                           progress_callback: Optional[Callable[[int], None]] = None) -> Iterator[os.DirEntry]:
+        """Recursively yield file entries below source_path using os.scandir
         
-        while file_path.exists():
-            new_name = f"{base_name}_{counter}{extension}"
-            file_path = file_path.parent / new_name
-            counter += 1
+        Symlinks are not followed, so the links of a _views folder are never organized again.
+        """
+        pending = [str(source_path)]
+        dirs_scanned = 0
         
-        return file_path
+        while pending:
+            if cancel_check and cancel_check():
+                return
+            
+            directory = pending.pop()
+            try:
+                with self.fs.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name != VIEWS_DIR_NAME:
+                                    pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Scan error ({directory}): {e}")
+            
+            dirs_scanned += 1
+            if progress_callback:
+                progress_callback(dirs_scanned)
     
-    def search_files(self, source_path: Path, pattern: str) -> List[Path]:
-        """Search for files matching a pattern"""
+    def _iter_glob_entries(self, source_path: Path, matcher: GlobMatcher,
+                           cancel_check: Optional[CancelCheck] = None,
+                           progress_callback: Optional[Callable[[int], None]] = None) -> Iterator[os.DirEntry]:
+        """Recursively yield file entries matching glob patterns, skipping subtrees that can't match"""
+        pending = [(str(source_path), matcher.root_state())]
+        dirs_scanned = 0
+        
+        while pending:
+            if cancel_check and cancel_check():
+                return
+            
+            directory, state = pending.pop()
+            try:
+                with self.fs.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                child_state = matcher.enter(state, entry.name)
+                                if child_state is not None and entry.name != VIEWS_DIR_NAME:
+                                    pending.append((entry.path, child_state))
+                            elif entry.is_file(follow_symlinks=False) and matcher.matches(state, entry.name):
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Scan error ({directory}): {e}")
+            
+            dirs_scanned += 1
+            if progress_callback:
+                progress_callback(dirs_scanned)
+    
+    def search_files(self, source_path: Path, pattern: str, cancel_check: Optional[CancelCheck] = None,
+                     progress_callback: Optional[ProgressCallback] = None,
+                     search_mode: str = "name", search_filter: Optional[SearchFilter] = None) -> List[Path]:
+        """Search for files matching a pattern
+        
+        search_mode is one of SEARCH_MODES: "name" matches a regex against file names, "glob"
+        matches whitespace-separated glob patterns (with "!" exclusions) against paths relative
+        to source_path, "content" matches a regex against file contents.
+        search_filter adds metadata conditions; its name conditions are checked before the
+        pattern and its stat conditions after it, so each file is stat'ed at most once.
+        cancel_check is polled once per directory and stops the scan when it returns True.
+        progress_callback receives (directories scanned, matches found) after each directory.
+        """
         matching_files = []
         
         try:
-            for file_path in source_path.rglob("*"):
-                if file_path.is_file():
-                    if re.search(pattern, file_path.name, re.IGNORECASE):
-                        matching_files.append(file_path)
+            def on_directory_scanned(dirs_scanned: int) -> None:
+                progress_callback(dirs_scanned, len(matching_files))
+            
+            on_scanned = on_directory_scanned if progress_callback else None
+            if search_mode == "glob":
+                # Directories that can't contain a match are never scanned
+                for entry in self._iter_glob_entries(source_path, compile_globs(pattern), cancel_check, on_scanned):
+                    try:
+                        if search_filter is not None and not search_filter.matches(entry):
+                            continue
+                    except OSError:
+                        # Vanished or unreadable files are skipped
+                        continue
+                    matching_files.append(Path(entry.path))
+            elif search_mode == "content":
+                # Imported on first use to keep application startup fast
+                from .content_search import ContentSearcher
+                
+                searcher = ContentSearcher(pattern, self.config_manager.get_setting("content_search_max_mb", 100))
+                entries = self._iter_file_entries(source_path, cancel_check, on_scanned)
+                if search_filter is not None:
+                    def filtered_candidates():
+                        for entry in entries:
+                            try:
+                                if not search_filter.matches(entry):
+                                    continue
+                                # The size is handed on so the content search doesn't stat again
+                                size = entry.stat().st_size if search_filter.needs_stat else None
+                            except OSError:
+                                # Vanished or unreadable files are skipped
+                                continue
+                            yield entry.path, size
+                    
+                    candidates = filtered_candidates()
+                else:
+                    candidates = ((entry.path, None) for entry in entries)
+                for path in searcher.search(candidates, cancel_check):
+                    matching_files.append(Path(path))
+            else:
+                regex = re.compile(pattern, re.IGNORECASE)
+                for entry in self._iter_file_entries(source_path, cancel_check, on_scanned):
+                    if search_filter is not None and not search_filter.matches_name(entry.name):
+                        continue
+                    if not regex.search(entry.name):
+                        continue
+                    if search_filter is not None and search_filter.needs_stat:
+                        try:
+                            if not search_filter.matches_stat(entry.stat()):
+                                continue
+                        except OSError:
+                            # Vanished or unreadable files are skipped
+                            continue
+                    matching_files.append(Path(entry.path))
         except Exception as e:
             print(f"Search error: {e}")
         
         return matching_files
     
+    def _move_matching_files(self, matching_files: List[Path], destination_dir: Path,
+                             cancel_check: Optional[CancelCheck] = None) -> int:
+        """Move files into destination_dir, renaming duplicates; returns the number moved"""
+        self.reset_run_state()
+        moved_count = 0
+        for file_path in matching_files:
+            if cancel_check and cancel_check():
+                break
+            
+            try:
+                destination = destination_dir / file_path.name
+                
+                # Handle duplicates
+                if self.fs.exists(destination):
+                    destination = self._generate_unique_filename(destination)
+                
+                # Move file
+                self.fs.move(file_path, destination)
+                moved_count += 1
+                
+            except Exception as e:
+                print(f"Error moving {file_path.name}: {e}")
+        
+        return moved_count
+    
     def separate_files(self, source_path: Path, target_path: Path, pattern: str, 
-                      custom_folder_name: Optional[str] = None) -> Tuple[int, Path]:
-        """Separate files matching a pattern to a separate directory"""
+                      custom_folder_name: Optional[str] = None, cancel_check: Optional[CancelCheck] = None,
+                      progress_callback: Optional[ProgressCallback] = None,
+                      search_mode: str = "name",
+                      search_filter: Optional[SearchFilter] = None,
+                      preflight: Optional[SpacePreflight] = None) -> Tuple[int, Path]:
+        """Separate files matching a pattern to a separate directory
+        
+        preflight is called with the matching files before any is moved; False stops the run.
+        """
         try:
             # Create separation directory with custom name or timestamp
             if custom_folder_name:
@@ -106,26 +581,14 @@ class FileOrganizerCore:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 separate_path = target_path / f"分離_{timestamp}"
             
-            separate_path.mkdir(parents=True, exist_ok=True)
-            
             # Find matching files
-            matching_files = self.search_files(source_path, pattern)
+            matching_files = self.search_files(source_path, pattern, cancel_check, progress_callback,
+                                               search_mode, search_filter)
+            if preflight and not preflight({separate_path: [self.fs.entry(path) for path in matching_files]}):
+                return 0, separate_path
             
-            moved_count = 0
-            for file_path in matching_files:
-                try:
-                    destination = separate_path / file_path.name
-                    
-                    # Handle duplicates
-                    if destination.exists():
-                        destination = self._generate_unique_filename(destination)
-                    
-                    # Move file
-                    shutil.move(str(file_path), str(destination))
-                    moved_count += 1
-                    
-                except Exception as e:
-                    print(f"Error moving {file_path.name}: {e}")
+            self.fs.mkdir(separate_path, parents=True, exist_ok=True)
+            moved_count = self._move_matching_files(matching_files, separate_path, cancel_check)
             
             return moved_count, separate_path
             
@@ -133,27 +596,24 @@ class FileOrganizerCore:
             print(f"Separation error: {e}")
             return 0, target_path
     
-    def move_files_to_existing_folder(self, source_path: Path, target_folder: Path, pattern: str) -> Tuple[int, Path]:
-        """Move files matching a pattern directly to an existing folder (no subfolder creation)"""
+    def move_files_to_existing_folder(self, source_path: Path, target_folder: Path, pattern: str,
+                                      cancel_check: Optional[CancelCheck] = None,
+                                      progress_callback: Optional[ProgressCallback] = None,
+                                      search_mode: str = "name",
+                                      search_filter: Optional[SearchFilter] = None,
+                                      preflight: Optional[SpacePreflight] = None) -> Tuple[int, Path]:
+        """Move files matching a pattern directly to an existing folder (no subfolder creation)
+        
+        preflight is called with the matching files before any is moved; False stops the run.
+        """
         try:
             # Find matching files
-            matching_files = self.search_files(source_path, pattern)
+            matching_files = self.search_files(source_path, pattern, cancel_check, progress_callback,
+                                               search_mode, search_filter)
+            if preflight and not preflight({target_folder: [self.fs.entry(path) for path in matching_files]}):
+                return 0, target_folder
             
-            moved_count = 0
-            for file_path in matching_files:
-                try:
-                    destination = target_folder / file_path.name
-                    
-                    # Handle duplicates
-                    if destination.exists():
-                        destination = self._generate_unique_filename(destination)
-                    
-                    # Move file
-                    shutil.move(str(file_path), str(destination))
-                    moved_count += 1
-                    
-                except Exception as e:
-                    print(f"Error moving {file_path.name}: {e}")
+            moved_count = self._move_matching_files(matching_files, target_folder, cancel_check)
             
             return moved_count, target_folder
             
@@ -161,17 +621,150 @@ class FileOrganizerCore:
             print(f"Move to existing folder error: {e}")
             return 0, target_folder
     
+    def route_files(self, source_path: Path, target_path: Path, routes: List[dict],
+                    cancel_check: Optional[CancelCheck] = None,
+                    progress_callback: Optional[ProgressCallback] = None,
+                    preflight: Optional[SpacePreflight] = None) -> Tuple[int, Path]:
+        """Separate files into the destination of the first route whose pattern matches, in one walk
+        
+        Relative destinations are created inside target_path. Files already in their
+        destination folder are left alone. preflight is called with the routed files of all
+        destinations before any is moved; False stops the run.
+        """
+        try:
+            table = compile_routes(routes)
+            if not table:
+                return 0, target_path
+            destinations = [target_path / destination for destination in table.destinations]
+            routed: Dict[int, List[os.DirEntry]] = {}
+            routed_count = 0
+            
+            def on_directory_scanned(dirs_scanned: int) -> None:
+                progress_callback(dirs_scanned, routed_count)
+            
+            for entry in self._iter_file_entries(source_path, cancel_check,
+                                                 on_directory_scanned if progress_callback else None):
+                index = table.match(entry.name)
+                if index is None or os.path.dirname(entry.path) == str(destinations[index]):
+                    continue
+                routed.setdefault(index, []).append(entry)
+                routed_count += 1
+            
+            if preflight and not preflight({destinations[index]: entries for index, entries in routed.items()}):
+                return 0, target_path
+            
+            moved_count = 0
+            for index, entries in sorted(routed.items()):
+                if cancel_check and cancel_check():
+                    break
+                self.fs.mkdir(destinations[index], parents=True, exist_ok=True)
+                moved_count += self._move_matching_files([Path(entry.path) for entry in entries],
+                                                         destinations[index], cancel_check)
+            
+            return moved_count, target_path
+            
+        except Exception as e:
+            print(f"Routing error: {e}")
+            return 0, target_path
+    
+    def build_catalog(self, source_path: Path, cancel_check: Optional[CancelCheck] = None,
+                      progress_callback: Optional[ProgressCallback] = None):
+        """Scan source_path recursively into a compact FileCatalog (for very large trees)"""
+        # Imported on first use to keep application startup fast
+        from .file_catalog import FileCatalog
+        
+        enumerate_start = time.perf_counter()
+        try:
+            return FileCatalog.build(self, source_path, cancel_check, progress_callback)
+        finally:
+            self.metrics.record("enumerate", time.perf_counter() - enumerate_start)
+    
+    def check_free_space(self, entries: List[os.DirEntry], target_path: Path) -> list:
+        """Get the target filesystems without room for organizing entries (empty when all fit)
+        
+        Cross-device bytes and file counts are compared with the free blocks and inodes of each
+        target filesystem plus a free_space_margin_percent margin; see space_check.estimate_space.
+        """
+        # Imported on first use to keep application startup fast
+        from .space_check import estimate_space
+        
+        return self._insufficient_space(lambda: estimate_space(self, entries, target_path))
+    
+    def check_move_space(self, moves: Dict[Path, List[os.DirEntry]]) -> list:
+        """Get the filesystems without room for moving files into folders (empty when all fit)
+        
+        moves maps destination folders to the entries moved there unchanged, as separation and
+        routing do; see space_check.estimate_moves.
+        """
+        # Imported on first use to keep application startup fast
+        from .space_check import estimate_moves
+        
+        return self._insufficient_space(lambda: estimate_moves(self, moves))
+    
+    def _insufficient_space(self, estimate: Callable[[], list]) -> list:
+        """Run a space estimate and keep the requirements over the free space plus the margin"""
+        preflight_start = time.perf_counter()
+        try:
+            margin = self.config_manager.get_setting("free_space_margin_percent", 5) / 100
+            return [requirement for requirement in estimate() if not requirement.is_sufficient(margin)]
+        finally:
+            self.metrics.record("preflight", time.perf_counter() - preflight_start)
+    
     def get_files_for_organization(self, source_path: Path) -> List[Path]:
         """Get list of files to organize from source directory"""
+        return [Path(entry.path) for entry in self.get_file_entries_for_organization(source_path)]
+    
+    def get_file_entries_for_organization(self, source_path: Path) -> List[os.DirEntry]:
+        """Get directory entries of the files to organize from source directory
+        
+        DirEntry caches its stat result, so passing entry.stat() on to organize_single_file
+        costs at most one stat call per file.
+        """
+        enumerate_start = time.perf_counter()
         try:
-            if not source_path.exists():
+            if not self.fs.exists(source_path):
                 return []
             
-            files = [f for f in source_path.iterdir() if f.is_file()]
-            return files
+            with self.fs.scandir(source_path) as entries:
+                return [entry for entry in entries if entry.is_file()]
         except Exception as e:
             print(f"Error getting files: {e}")
             return []
+        finally:
+            self.metrics.record("enumerate", time.perf_counter() - enumerate_start)
+    
+    def get_changed_file_entries(self, source_path: Path, directory_cache: DirectoryStateCache) -> List[os.DirEntry]:
+        """Get the file entries of the source directory that the completed runs haven't handled yet
+        
+        Lists the same files as get_file_entries_for_organization, minus the files an earlier run
+        handled and that are unmodified since; an unchanged source directory costs a single stat call.
+        """
+        directory = os.path.abspath(source_path)
+        try:
+            state = directory_cache.unchanged_state(directory, self.fs.stat(directory))
+        except OSError as e:
+            print(f"Scan error ({directory}): {e}")
+            return []
+        if state is not None:
+            self.metrics.count("directories_skipped")
+            self.metrics.count("entries_skipped", state[1])
+            return []
+        
+        handled = directory_cache.handled_files(directory)
+        examined: Dict[str, int] = {}
+        new_entries = []
+        for entry in self.get_file_entries_for_organization(source_path):
+            file_stat = self.get_entry_stat(entry)
+            if file_stat is None:
+                continue
+            examined[entry.name] = file_stat.st_mtime_ns
+            if handled.get(entry.name) == file_stat.st_mtime_ns:
+                self.metrics.count("entries_skipped")
+            else:
+                new_entries.append(entry)
+        directory_cache.scanned(directory, examined)
+        self.metrics.count("directories_scanned")
+        return new_entries
     
     def validate_directories(self, source_path: str, target_path: str) -> Tuple[bool, str]:
         """Validate source and target directories"""
@@ -189,3 +782,15 @@ class FileOrganizerCore:
         if not pattern:
             return False, self.config_manager.get_text("error_pattern_required")
         return True, ""
+    
+    def compile_search_filter(self, filter_text: str) -> Optional[SearchFilter]:
+        """Compile a filter expression against the configured file types (raises ValueError)"""
+        return parse_search_filter(filter_text, self.config_manager.get_file_types())
+    
+    def validate_search_filter(self, filter_text: str) -> Tuple[bool, str]:
+        """Validate a filter expression"""
+        try:
+            self.compile_search_filter(filter_text)
+        except ValueError as e:
+            return False, f"{self.config_manager.get_text('error_invalid_filter')} {e}"
+        return True, ""
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File System
+Responsible for the filesystem operations used by file organization (stat, scandir, mkdir, move, copy, link),
+with a local implementation and a simulated one that injects latency and errors
+"""
+
+import os
+import time
+import zlib
+import errno
+import shutil
+import stat as stat_module
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Reflinks are only available where the FICLONE ioctl exists (Linux)
+    fcntl = None
+
+PathLike = Union[str, Path]
+
+# ioctl request cloning a whole file (linux/fs.h), supported by btrfs, XFS and others
+FICLONE = 0x40049409
+
+
+class LocalFileSystem:
+    """Filesystem operations backed by the local os module"""
+
+    def stat(self, path: PathLike) -> os.stat_result:
+        """Get the stat result of a path"""
+        return os.stat(path)
+
+    def exists(self, path: PathLike) -> bool:
+        """Check whether a path exists"""
+        return os.path.exists(path)
+
+    def scandir(self, path: PathLike):
+        """Iterate over the entries of a directory (usable as a context manager)"""
+        return os.scandir(path)
+
+    def listdir(self, path: PathLike) -> List[str]:
+        """List the names in a directory"""
+        return os.listdir(path)
+
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        """Create a directory"""
+        Path(path).mkdir(parents=parents, exist_ok=exist_ok)
+
+    def move(self, source: PathLike, destination: PathLike) -> None:
+        """Move a file (rename, copying across devices)"""
+        shutil.move(str(source), str(destination))
+
+    def copy(self, source: PathLike, destination: PathLike) -> None:
+        """Copy a file with its metadata"""
+        shutil.copy2(str(source), str(destination))
+
+    def link(self, source: PathLike, destination: PathLike) -> None:
+        """Create a hard link (same filesystem only)"""
+        os.link(source, destination)
+
+    def clone(self, source: PathLike, destination: PathLike) -> None:
+        """Create a copy-on-write clone (reflink) of a file; raises OSError where unsupported"""
+        if fcntl is None:
+            raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform", str(source))
+
+        with open(source, 'rb') as source_file, open(destination, 'xb') as destination_file:
+            try:
+                fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+            except OSError:
+                destination_file.close()
+                os.remove(destination)
+                raise
+        shutil.copystat(str(source), str(destination))
+
+    def free_space(self, path: PathLike) -> Tuple[int, Optional[int], int]:
+        """Get (free bytes, free inodes or None where not reported, block size) of the filesystem holding path"""
+        if not hasattr(os, "statvfs"):
+            # Windows reports neither inodes nor the cluster size here
+            return shutil.disk_usage(path).free, None, 1
+        usage = os.statvfs(path)
+        block_size = usage.f_frsize or usage.f_bsize
+        # Filesystems with dynamic inodes (btrfs) report no inode totals
+        return usage.f_bavail * block_size, usage.f_favail if usage.f_files else None, block_size
+
+    def entry(self, path: PathLike) -> "FileEntry":
+        """Get a DirEntry-like object for a known file path without scanning its directory"""
+        return FileEntry(self, str(path))
+
+
+class FileEntry:
+    """DirEntry-like file entry whose stat() goes through a filesystem adapter"""
+
+    __slots__ = ("_fs", "path", "name", "_stat")
+
+    def __init__(self, fs: LocalFileSystem, path: str):
+        self._fs = fs
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat = None
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        try:
+            return stat_module.S_ISREG(self.stat().st_mode)
+        except OSError:
+            return False
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        # Like DirEntry, the result of the first call is cached
+        if self._stat is None:
+            self._stat = self._fs.stat(self.path)
+        return self._stat
+
+
+class SimulatedFileSystem(LocalFileSystem):
+    """Local filesystem with injected per-call latency and error rates, e.g. to imitate a network share
+
+    Every operation sleeps for latency plus up to jitter seconds and fails with an I/O error
+    with probability error_rate. Both are derived from a hash of (seed, operation, path tail,
+    call number) rather than a shared random stream, so results depend neither on thread
+    scheduling nor on where the tree is located.
+    """
+
+    OPERATIONS = ("stat", "exists", "scandir", "listdir", "mkdir", "move", "copy", "link", "clone", "free_space")
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, error_operations: Optional[List[str]] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.error_operations = set(error_operations or self.OPERATIONS)
+        self.calls: Dict[str, int] = {}
+        self._call_numbers: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reset_counters(self) -> None:
+        """Reset the call counters, restarting the latency and error sequence"""
+        with self._lock:
+            self.calls.clear()
+            self._call_numbers.clear()
+
+    def _draw(self, key: str) -> float:
+        """Deterministic pseudo-random number in [0, 1) for one call"""
+        return zlib.crc32(key.encode("utf-8", "surrogateescape")) / 0x100000000
+
+    def _simulate(self, operation: str, path: PathLike) -> None:
+        """Count, delay and possibly fail one call"""
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            # The last two path components identify a call independently of the tree location
+            call_key = f"{operation}:{os.sep.join(Path(path).parts[-2:])}"
+            number = self._call_numbers.get(call_key, 0)
+            self._call_numbers[call_key] = number + 1
+
+        key = f"{self.seed}:{call_key}:{number}"
+        delay = self.latency + self.jitter * self._draw(key + ":latency")
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and operation in self.error_operations and self._draw(key + ":error") < self.error_rate:
+            raise OSError(errno.EIO, f"Injected I/O error ({operation})", str(path))
+
+    def stat(self, path: PathLike) -> os.stat_result:
+        self._simulate("stat", path)
+        return super().stat(path)
+
+    def exists(self, path: PathLike) -> bool:
+        self._simulate("exists", path)
+        return super().exists(path)
+
+    @contextmanager
+    def scandir(self, path: PathLike) -> Iterator[Iterator["_SimulatedDirEntry"]]:
+        self._simulate("scandir", path)
+        with super().scandir(path) as entries:
+            yield (_SimulatedDirEntry(self, entry) for entry in entries)
+
+    def listdir(self, path: PathLike) -> List[str]:
+        self._simulate("listdir", path)
+        return super().listdir(path)
+
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        self._simulate("mkdir", path)
+        super().mkdir(path, parents, exist_ok)
+
+    def move(self, source: PathLike, destination: PathLike) -> None:
+        self._simulate("move", source)
+        super().move(source, destination)
+
+    def copy(self, source: PathLike, destination: PathLike) -> None:
+        self._simulate("copy", source)
+        super().copy(source, destination)
+
+    def link(self, source: PathLike, destination: PathLike) -> None:
+        self._simulate("link", source)
+        super().link(source, destination)
+
+    def clone(self, source: PathLike, destination: PathLike) -> None:
+        self._simulate("clone", source)
+        super().clone(source, destination)
+
+    def free_space(self, path: PathLike) -> Tuple[int, Optional[int], int]:
+        self._simulate("free_space", path)
+        return super().free_space(path)
+
+
+class _SimulatedDirEntry:
+    """Directory entry whose stat() goes through the simulated filesystem"""
+
+    __slots__ = ("_fs", "_entry", "_stat")
+
+    def __init__(self, fs: SimulatedFileSystem, entry: os.DirEntry):
+        self._fs = fs
+        self._entry = entry
+        self._stat = None
+
+    @property
+    def name(self) -> str:
+        return self._entry.name
+
+    @property
+    def path(self) -> str:
+        return self._entry.path
+
+    def __fspath__(self) -> str:
+        return self._entry.path
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def inode(self) -> int:
+        return self._entry.inode()
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        # Like DirEntry, the result of the first call is cached
+        if self._stat is None:
+            self._fs._simulate("stat", self._entry.path)
+            self._stat = self._entry.stat(follow_symlinks=follow_symlinks)
+        return self._stat
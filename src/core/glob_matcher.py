@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glob Matcher
+Responsible for matching relative paths against glob patterns with "**" and "!" exclusions,
+deciding per directory whether its subtree can contain a match at all
+"""
+
+import re
+import fnmatch
+from typing import List, Optional, Tuple, Union
+
+# A pattern segment: "**", a casefolded literal name, or a compiled name pattern
+Segment = Union[str, re.Pattern]
+# Matcher state of a directory: for every pattern, the segment positions reachable at it
+GlobState = Tuple[frozenset, ...]
+
+_ANY_DEPTH = "**"
+_WILDCARDS = set("*?[")
+
+
+class GlobPattern:
+    """One glob pattern split into path segments
+
+    Matching runs as a small NFA over the segments: a "**" segment may consume any number of
+    path components, every other segment exactly one. A pattern without "/" matches the file
+    name at any depth, like "**/<pattern>"; a leading "/" anchors it at the search root.
+    """
+
+    def __init__(self, pattern: str):
+        pattern = pattern.replace("\\", "/")
+        anchored = pattern.startswith("/")
+        pattern = pattern.strip("/")
+        if "/" not in pattern and not anchored:
+            pattern = f"{_ANY_DEPTH}/{pattern}"
+        self.segments: List[Segment] = []
+        for part in pattern.split("/"):
+            if not part or (part == _ANY_DEPTH and self.segments and self.segments[-1] == _ANY_DEPTH):
+                continue
+            if part == _ANY_DEPTH:
+                self.segments.append(_ANY_DEPTH)
+            elif _WILDCARDS.intersection(part):
+                self.segments.append(re.compile(fnmatch.translate(part), re.IGNORECASE))
+            else:
+                self.segments.append(part.casefold())
+        self.start = self._closure({0})
+
+    def _closure(self, positions) -> frozenset:
+        """Add the positions reachable by letting "**" match no components"""
+        closure = set(positions)
+        for position in sorted(positions):
+            while position < len(self.segments) and self.segments[position] == _ANY_DEPTH:
+                position += 1
+                closure.add(position)
+        return frozenset(closure)
+
+    def advance(self, positions: frozenset, name: str) -> frozenset:
+        """Get the positions after consuming one path component"""
+        folded = None
+        reached = set()
+        for position in positions:
+            if position >= len(self.segments):
+                continue
+            segment = self.segments[position]
+            if segment == _ANY_DEPTH:
+                reached.add(position)
+            elif isinstance(segment, str):
+                if folded is None:
+                    folded = name.casefold()
+                if segment == folded:
+                    reached.add(position + 1)
+            elif segment.match(name):
+                reached.add(position + 1)
+        return self._closure(reached) if reached else frozenset()
+
+    def is_complete(self, positions: frozenset) -> bool:
+        """Check whether the consumed components match the whole pattern"""
+        return len(self.segments) in positions
+
+    def covers_subtree(self, positions: frozenset) -> bool:
+        """Check whether every path below the consumed components matches"""
+        return self.is_complete(positions) or (len(self.segments) - 1 in positions
+                                               and self.segments[-1] == _ANY_DEPTH)
+
+
+class GlobMatcher:
+    """Include patterns and "!" exclusion patterns evaluated together during a walk
+
+    A file matches when some include pattern matches its path relative to the search root and
+    no exclusion does. Directories are only entered while some include pattern can still
+    match below them and no exclusion covers them (an excluded directory excludes its contents).
+    """
+
+    def __init__(self, includes: List[GlobPattern], excludes: List[GlobPattern]):
+        self.includes = includes
+        self.excludes = excludes
+
+    def root_state(self) -> GlobState:
+        """Get the state of the search root"""
+        return tuple(pattern.start for pattern in self.includes + self.excludes)
+
+    def enter(self, state: GlobState, name: str) -> Optional[GlobState]:
+        """Get the state of a subdirectory, or None if its subtree can be skipped"""
+        count = len(self.includes)
+        include_states = [pattern.advance(positions, name) for pattern, positions in zip(self.includes, state)]
+        if not any(include_states):
+            return None
+        exclude_states = []
+        for pattern, positions in zip(self.excludes, state[count:]):
+            positions = pattern.advance(positions, name)
+            if pattern.covers_subtree(positions):
+                return None
+            exclude_states.append(positions)
+        return tuple(include_states + exclude_states)
+
+    def matches(self, state: GlobState, name: str) -> bool:
+        """Check whether a file in the directory with the given state matches"""
+        count = len(self.includes)
+        if not any(pattern.is_complete(pattern.advance(positions, name))
+                   for pattern, positions in zip(self.includes, state) if positions):
+            return False
+        return not any(pattern.is_complete(pattern.advance(positions, name))
+                       for pattern, positions in zip(self.excludes, state[count:]) if positions)
+
+
+def compile_globs(text: str) -> GlobMatcher:
+    """Compile whitespace-separated glob patterns; patterns starting with "!" are exclusions
+
+    Without include patterns every file not excluded matches.
+    """
+    includes, excludes = [], []
+    for pattern in text.split():
+        if pattern.startswith("!"):
+            if pattern[1:]:
+                excludes.append(GlobPattern(pattern[1:]))
+        else:
+            includes.append(GlobPattern(pattern))
+    return GlobMatcher(includes or [GlobPattern(_ANY_DEPTH)], excludes)
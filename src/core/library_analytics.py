@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Library Analytics
+Responsible for summarizing a file catalog before organizing it: counts and bytes per category,
+age and size histograms and the largest files
+"""
+
+import time
+import heapq
+from bisect import bisect_right
+from typing import Callable, List, Optional
+
+from .file_catalog import CatalogRecord, FileCatalog, numpy
+from .view_farm import SIZE_BANDS
+
+SECONDS_PER_DAY = 86400
+# Age bins as (upper bound in days, text key); the last bin has no upper bound
+AGE_BINS = [
+    (7, "age_week"),
+    (30, "age_month"),
+    (182, "age_half_year"),
+    (365, "age_year"),
+    (3 * 365, "age_3_years"),
+    (5 * 365, "age_5_years"),
+    (None, "age_older"),
+]
+DEFAULT_TOP_N = 20
+
+
+class LibraryReport:
+    """Aggregates of one catalog; histogram rows are (label, file count, bytes)"""
+
+    __slots__ = ("files", "total_bytes", "categories", "age_histogram", "size_histogram", "largest", "elapsed")
+
+    def __init__(self, files: int, total_bytes: int, categories: List[tuple], age_histogram: List[tuple],
+                 size_histogram: List[tuple], largest: List[CatalogRecord], elapsed: float):
+        self.files = files
+        self.total_bytes = total_bytes
+        self.categories = categories
+        self.age_histogram = age_histogram
+        self.size_histogram = size_histogram
+        self.largest = largest
+        self.elapsed = elapsed
+
+
+def analyze_catalog(catalog: FileCatalog, top_n: int = DEFAULT_TOP_N, now: Optional[float] = None) -> LibraryReport:
+    """Compute the aggregates of a catalog (vectorized with NumPy when it is installed)"""
+    start = time.perf_counter()
+    if now is None:
+        now = time.time()
+    # Bin edges on mtime, oldest first, so that the bin index grows with the mtime
+    age_edges = sorted(now - days * SECONDS_PER_DAY for days, _ in AGE_BINS if days is not None)
+    size_edges = [limit for limit, _ in SIZE_BANDS if limit is not None]
+
+    if numpy is not None and len(catalog):
+        aggregates = _aggregate_numpy(catalog, age_edges, size_edges, top_n)
+    else:
+        aggregates = _aggregate_python(catalog, age_edges, size_edges, top_n)
+    category_counts, category_bytes, age_counts, age_bytes, size_counts, size_bytes, largest = aggregates
+
+    categories = sorted(((name, category_counts[category_id], category_bytes[category_id])
+                         for category_id, name in enumerate(catalog.categories)),
+                        key=lambda row: row[2], reverse=True)
+    # Age bins were counted oldest first; report them newest first like AGE_BINS
+    age_keys = [key for _, key in AGE_BINS]
+    age_histogram = list(zip(age_keys, reversed(age_counts), reversed(age_bytes)))
+    size_histogram = list(zip([name for _, name in SIZE_BANDS], size_counts, size_bytes))
+
+    return LibraryReport(len(catalog), sum(category_bytes), categories, age_histogram, size_histogram,
+                         [catalog.record(index) for index in largest], time.perf_counter() - start)
+
+
+def _aggregate_numpy(catalog: FileCatalog, age_edges: List[float], size_edges: List[int], top_n: int):
+    """bincount per category and bin, argpartition for the largest files"""
+    columns = catalog.columns()
+    sizes = columns["size"]
+    weights = sizes.astype(numpy.float64)
+    category_count = len(catalog.categories)
+    age_bins = numpy.searchsorted(numpy.asarray(age_edges), columns["mtime"], side="right")
+    size_bins = numpy.searchsorted(numpy.asarray(size_edges), sizes, side="right")
+
+    def counts_and_bytes(bins, length):
+        counts = numpy.bincount(bins, minlength=length)
+        total = numpy.bincount(bins, weights=weights, minlength=length)
+        return [int(value) for value in counts], [int(value) for value in total]
+
+    category_counts, category_bytes = counts_and_bytes(columns["category_id"], category_count)
+    age_counts, age_bytes = counts_and_bytes(age_bins, len(age_edges) + 1)
+    size_counts, size_bytes = counts_and_bytes(size_bins, len(size_edges) + 1)
+
+    top_n = min(top_n, len(sizes))
+    if top_n:
+        candidates = numpy.argpartition(sizes, len(sizes) - top_n)[-top_n:]
+        largest = [int(index) for index in candidates[numpy.argsort(sizes[candidates])[::-1]]]
+    else:
+        largest = []
+    return category_counts, category_bytes, age_counts, age_bytes, size_counts, size_bytes, largest
+
+
+def _aggregate_python(catalog: FileCatalog, age_edges: List[float], size_edges: List[int], top_n: int):
+    """One pass over the columns with bisect for the bins, heapq for the largest files"""
+    category_counts = [0] * len(catalog.categories)
+    category_bytes = [0] * len(catalog.categories)
+    age_counts = [0] * (len(age_edges) + 1)
+    age_bytes = [0] * (len(age_edges) + 1)
+    size_counts = [0] * (len(size_edges) + 1)
+    size_bytes = [0] * (len(size_edges) + 1)
+
+    for category_id, size, mtime in zip(catalog.category_ids, catalog.sizes, catalog.mtimes):
+        category_counts[category_id] += 1
+        category_bytes[category_id] += size
+        age_bin = bisect_right(age_edges, mtime)
+        age_counts[age_bin] += 1
+        age_bytes[age_bin] += size
+        size_bin = bisect_right(size_edges, size)
+        size_counts[size_bin] += 1
+        size_bytes[size_bin] += size
+
+    sizes = catalog.sizes
+    largest = heapq.nlargest(top_n, range(len(sizes)), key=sizes.__getitem__)
+    return category_counts, category_bytes, age_counts, age_bytes, size_counts, size_bytes, largest
+
+
+def format_size(size: float) -> str:
+    """Format a byte count with a binary unit"""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_report(report: LibraryReport, get_text: Callable[[str], str]) -> str:
+    """Render a report as plain text tables, with labels localized through get_text"""
+    lines = [f"{get_text('analytics_files')} {report.files:,}  /  {format_size(report.total_bytes)}", ""]
+
+    def table(title: str, rows: List[tuple], label: Callable[[str], str]) -> None:
+        lines.append(title)
+        width = max((len(label(name)) for name, _, _ in rows), default=0)
+        for name, count, total in rows:
+            if count:
+                lines.append(f"  {label(name):<{width}}  {count:>10,}  {format_size(total):>10}")
+        lines.append("")
+
+    table(get_text("analytics_categories"), report.categories, str)
+    table(get_text("analytics_age"), report.age_histogram, get_text)
+    table(get_text("analytics_size"), report.size_histogram, str)
+
+    lines.append(get_text("analytics_largest"))
+    for record in report.largest:
+        lines.append(f"  {format_size(record.size):>10}  {record.path}")
+    return "\n".join(lines)
+
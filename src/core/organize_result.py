@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Organize Result
+Responsible for the outcome record of one organized file and for rendering it as log text
+"""
+
+import errno
+from pathlib import Path
+from typing import Callable, Optional
+
+# Log text key per transfer method; the reference methods without an entry are links.
+# "existing" marks a file a previous reference-mode run already linked or cloned
+_METHOD_TEXT_KEYS = {"move": "move_file", "copy": "copy_file", "existing": "already_organized"}
+
+
+class OrganizeResult:
+    """Outcome of organizing one file
+
+    Holds plain values only; log text is built by format_result when somebody reads it.
+    error is None on success, otherwise a short code: the errno name of an OSError
+    ("ENOSPC", "EACCES") or the exception class name.
+    """
+
+    __slots__ = ("source", "destination", "category", "method", "bytes", "elapsed", "error", "exception")
+
+    def __init__(self, source: Path, destination: Optional[Path], category: Optional[str], method: Optional[str],
+                 bytes: Optional[int], elapsed: float, error: Optional[str] = None,
+                 exception: Optional[BaseException] = None):
+        self.source = source
+        self.destination = destination
+        self.category = category
+        self.method = method
+        self.bytes = bytes
+        self.elapsed = elapsed
+        self.error = error
+        self.exception = exception
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def text_key(self) -> Optional[str]:
+        """Text key of the log line of a successful result ("move_file", "copy_file", "link_file", "already_organized")"""
+        return _METHOD_TEXT_KEYS.get(self.method, "link_file") if self.ok else None
+
+
+def error_code(error: BaseException) -> str:
+    """Get the short code of an exception"""
+    code = errno.errorcode.get(error.errno) if isinstance(error, OSError) and error.errno else None
+    return code or type(error).__name__
+
+
+def format_result(result: OrganizeResult, get_text: Callable[[str], str]) -> str:
+    """Render a result as the log line of the application"""
+    if not result.ok:
+        return f"Error organizing {result.source.name}: {result.exception or result.error}"
+    return f"{get_text(result.text_key)} {result.source.name} → {result.category}/{result.destination.name}"
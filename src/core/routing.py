@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Routing
+Responsible for compiling separation routes (search pattern -> destination folder) into a
+routing table that picks the destination of a file name with a constant number of scans
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Characters with a special meaning in regular expressions
+_REGEX_SPECIAL = set(".^$*+?{}[]|()\\")
+# Escapes standing for the character itself, e.g. "\." in "report\.pdf"
+_ESCAPED_LITERAL = re.compile(r"\\([^\w\s])")
+
+
+def literal_of(pattern: str) -> Optional[str]:
+    """Get the plain text a pattern matches, or None if it is a real regular expression"""
+    text = _ESCAPED_LITERAL.sub("", pattern)
+    if not pattern or any(char in _REGEX_SPECIAL for char in text):
+        return None
+    return _ESCAPED_LITERAL.sub(r"\1", pattern)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over casefolded literals
+
+    All literals are found in one pass over the text, however many there are. Every state
+    stores the lowest index of the literals ending there (through failure links as well).
+    """
+
+    def __init__(self, literals: List[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[int]] = [None]
+
+        for literal, index in literals:
+            state = 0
+            for char in literal.casefold():
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(None)
+                state = next_state
+            if self._output[state] is None or index < self._output[state]:
+                self._output[state] = index
+
+        # Breadth-first construction of failure links
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail_target if fail_target != next_state else 0
+                inherited = self._output[self._fail[next_state]]
+                if inherited is not None and (self._output[next_state] is None
+                                              or inherited < self._output[next_state]):
+                    self._output[next_state] = inherited
+
+    def first_match(self, text: str) -> Optional[int]:
+        """Get the lowest index of the literals occurring in text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        best = None
+        state = 0
+        for char in text.casefold():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found = output[state]
+            if found is not None and (best is None or found < best):
+                best = found
+        return best
+
+
+class RoutingTable:
+    """Ordered routes where the first route whose pattern matches a file name wins"""
+
+    def __init__(self, destinations: List[str], literals: Optional[AhoCorasick],
+                 combined_regex: Optional[re.Pattern], regexes: List[Tuple[int, re.Pattern]]):
+        self.destinations = destinations
+        self._literals = literals
+        self._combined_regex = combined_regex
+        self._regexes = regexes
+        self._first_regex = regexes[0][0] if regexes else len(destinations)
+
+    def __bool__(self) -> bool:
+        return bool(self.destinations)
+
+    def match(self, name: str) -> Optional[int]:
+        """Get the index of the first route matching a file name, or None"""
+        best = self._literals.first_match(name) if self._literals else None
+        if self._regexes and (best is None or self._first_regex < best):
+            found = self._match_regex(name)
+            if found is not None and (best is None or found < best):
+                best = found
+        return best
+
+    def _match_regex(self, name: str) -> Optional[int]:
+        """Get the index of the first regex route matching a name"""
+        if self._combined_regex is not None:
+            match = self._combined_regex.match(name)
+            return int(match.lastgroup[1:]) if match else None
+        for index, regex in self._regexes:
+            if regex.search(name):
+                return index
+        return None
+
+
+def compile_routes(routes: List[Dict[str, Any]]) -> RoutingTable:
+    """Compile route dictionaries ({"pattern", "destination"}) from the configuration
+
+    Plain-text patterns go into one Aho-Corasick automaton; regular expressions are combined
+    into one alternation of lookaheads tried in route order, each tagged by a named group.
+    Invalid routes are reported and skipped.
+    """
+    destinations = []
+    literals = []
+    regexes = []
+    for route_number, route in enumerate(routes or [], start=1):
+        if not route.get("enabled", True):
+            continue
+        try:
+            pattern = route["pattern"]
+            destination = route["destination"]
+            literal = literal_of(pattern)
+            regex = None if literal is not None else re.compile(pattern, re.IGNORECASE)
+        except (KeyError, TypeError, re.error) as e:
+            print(f"Invalid separation route #{route_number}: {e}")
+            continue
+
+        index = len(destinations)
+        destinations.append(destination)
+        if literal is not None:
+            literals.append((literal, index))
+        else:
+            regexes.append((index, regex))
+
+    return RoutingTable(destinations,
+                        AhoCorasick(literals) if literals else None,
+                        _combine_regexes(regexes),
+                        regexes)
+
+
+def _combine_regexes(regexes: List[Tuple[int, re.Pattern]]) -> Optional[re.Pattern]:
+    """Combine route regexes into one pattern whose matching alternative names the first matching route
+
+    Alternatives are tried in order at the start of the name, each looking ahead for its
+    pattern anywhere in the name. Returns None when the patterns cannot be combined safely
+    (numbered backreferences, named groups or global inline flags).
+    """
+    if len(regexes) < 2:
+        return None
+    patterns = [regex.pattern for _, regex in regexes]
+    if any(re.search(r"\\\d|\(\?P[<=]|^\(\?[aiLmsux]+\)", pattern) for pattern in patterns):
+        return None
+    try:
+        return re.compile("|".join(f"(?=.*?(?:{pattern}))(?P<r{index}>)"
+                                   for (index, _), pattern in zip(regexes, patterns)),
+                          re.IGNORECASE | re.DOTALL)
+    except re.error:
+        return None
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rule Engine
+Responsible for compiling ordered organize rules (category, size, age, name and path
+conditions) into predicate functions evaluated against already-collected stat data
+"""
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# A predicate receives (file path, stat result, extension category)
+Predicate = Callable[[Path, os.stat_result, str], bool]
+
+SECONDS_PER_DAY = 86400
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def parse_size(value: Any) -> int:
+    """Parse a size given as a number of bytes or a string such as "2 GB" """
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?B?)\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+class CompiledRule:
+    """A single rule compiled into an ordered list of predicates"""
+
+    def __init__(self, destination: str, predicates: List[Predicate], name_regex: Optional[re.Pattern],
+                 needs_stat: bool):
+        self.destination = destination
+        self.predicates = predicates
+        self.name_regex = name_regex
+        self.needs_stat = needs_stat
+
+    def matches(self, file_path: Path, file_stat: Optional[os.stat_result], category: str) -> bool:
+        """Check whether all conditions of the rule hold"""
+        for predicate in self.predicates:
+            if not predicate(file_path, file_stat, category):
+                return False
+        return True
+
+
+class RuleSet:
+    """Ordered rules where the first matching rule picks the destination folder"""
+
+    def __init__(self, rules: List[CompiledRule], combined_name_regex: Optional[re.Pattern]):
+        self.rules = rules
+        self.combined_name_regex = combined_name_regex
+        self.needs_stat = any(rule.needs_stat for rule in rules)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, file_path: Path, file_stat: Optional[os.stat_result], category: str) -> Optional[str]:
+        """Get the destination of the first matching rule, or None"""
+        # One search over the alternation of all name patterns rules out every name rule at once
+        name_may_match = (self.combined_name_regex is None
+                          or self.combined_name_regex.search(file_path.name) is not None)
+
+        for rule in self.rules:
+            if rule.name_regex is not None and not name_may_match:
+                continue
+            if rule.matches(file_path, file_stat, category):
+                return rule.destination
+        return None
+
+
+def _compile_rule(rule: Dict[str, Any], now: float) -> Tuple[CompiledRule, Optional[str]]:
+    """Compile one rule dictionary; returns the rule and its name pattern"""
+    destination = rule["destination"]
+    conditions = rule.get("conditions", {})
+    predicates: List[Predicate] = []
+    needs_stat = False
+
+    # Cheapest conditions first: set lookups, then stat fields, then regular expressions
+    if conditions.get("categories"):
+        categories = frozenset(conditions["categories"])
+        predicates.append(lambda path, st, category: category in categories)
+
+    if conditions.get("extensions"):
+        extensions = frozenset(ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+                               for ext in conditions["extensions"])
+        predicates.append(lambda path, st, category: path.suffix.lower() in extensions)
+
+    if "min_size" in conditions:
+        min_size = parse_size(conditions["min_size"])
+        predicates.append(lambda path, st, category: st.st_size >= min_size)
+        needs_stat = True
+
+    if "max_size" in conditions:
+        max_size = parse_size(conditions["max_size"])
+        predicates.append(lambda path, st, category: st.st_size <= max_size)
+        needs_stat = True
+
+    if "older_than_days" in conditions:
+        older_cutoff = now - float(conditions["older_than_days"]) * SECONDS_PER_DAY
+        predicates.append(lambda path, st, category: st.st_mtime < older_cutoff)
+        needs_stat = True
+
+    if "newer_than_days" in conditions:
+        newer_cutoff = now - float(conditions["newer_than_days"]) * SECONDS_PER_DAY
+        predicates.append(lambda path, st, category: st.st_mtime >= newer_cutoff)
+        needs_stat = True
+
+    name_pattern = conditions.get("name_regex")
+    name_regex = None
+    if name_pattern:
+        name_regex = re.compile(name_pattern, re.IGNORECASE)
+        predicates.append(lambda path, st, category: name_regex.search(path.name) is not None)
+
+    if conditions.get("path_regex"):
+        path_regex = re.compile(conditions["path_regex"], re.IGNORECASE)
+        predicates.append(lambda path, st, category: path_regex.search(path.as_posix()) is not None)
+
+    return CompiledRule(destination, predicates, name_regex, needs_stat), name_pattern
+
+
+def compile_rules(rules: List[Dict[str, Any]], now: Optional[float] = None) -> RuleSet:
+    """Compile rule dictionaries from the configuration into a RuleSet
+
+    Invalid rules are reported and skipped.
+    """
+    if now is None:
+        now = time.time()
+
+    compiled_rules = []
+    name_patterns = []
+    for index, rule in enumerate(rules or []):
+        if not rule.get("enabled", True):
+            continue
+        try:
+            compiled_rule, name_pattern = _compile_rule(rule, now)
+        except (KeyError, TypeError, ValueError, re.error) as e:
+            print(f"Invalid organize rule #{index + 1}: {e}")
+            continue
+        compiled_rules.append(compiled_rule)
+        if name_pattern:
+            name_patterns.append(name_pattern)
+
+    return RuleSet(compiled_rules, _combine_patterns(name_patterns))
+
+
+def _combine_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+    """Combine name patterns into a single alternation
+
+    Returns None when the patterns cannot be combined safely (backreferences or global
+    inline flags), in which case each rule tests its own pattern.
+    """
+    if not patterns:
+        return None
+    if any(re.search(r"\\\d|\(\?P=|^\(\?[aiLmsux]+\)", pattern) for pattern in patterns):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    except re.error:
+        return None
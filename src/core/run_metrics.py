@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run Metrics
+Responsible for per-phase counters, latency histograms and the summary of an organize run
+"""
+
+import heapq
+import json
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Histogram buckets grow by 2 ** (1 / BUCKETS_PER_OCTAVE) starting at MIN_LATENCY seconds,
+# which keeps percentile estimates within ~10% using a fixed list of counters per phase
+MIN_LATENCY = 1e-6
+BUCKETS_PER_OCTAVE = 8
+BUCKET_COUNT = BUCKETS_PER_OCTAVE * 30
+SLOWEST_FILES = 10
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Record one latency sample"""
+        if seconds > MIN_LATENCY:
+            index = min(int(math.log2(seconds / MIN_LATENCY) * BUCKETS_PER_OCTAVE), BUCKET_COUNT - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile (upper bound of the bucket holding it)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(MIN_LATENCY * 2 ** ((index + 1) / BUCKETS_PER_OCTAVE), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the histogram"""
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "p50_s": self.percentile(0.50),
+            "p95_s": self.percentile(0.95),
+            "p99_s": self.percentile(0.99),
+            "max_s": self.max,
+        }
+
+
+class RunMetrics:
+    """Counters and per-phase latency histograms of one organize run"""
+
+    PHASES = ("enumerate", "stat", "categorize", "mkdir", "collision_check", "move")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run"""
+        self.phases: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in self.PHASES}
+        self.counters: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.files_ok = 0
+        self.files_failed = 0
+        self.bytes_moved = 0
+        self._slowest: List[Tuple[float, str]] = []
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the latency of one phase"""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a named counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def file_done(self, file_name: str, seconds: float, size: Optional[int]) -> None:
+        """Record a successfully organized file"""
+        self.files_ok += 1
+        if size is not None:
+            self.bytes_moved += size
+        if len(self._slowest) < SLOWEST_FILES:
+            heapq.heappush(self._slowest, (seconds, file_name))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, file_name))
+
+    def file_failed(self, error: BaseException) -> None:
+        """Record a file that could not be organized"""
+        self.files_failed += 1
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def finish(self) -> None:
+        """Mark the end of the run"""
+        self.end_time = time.perf_counter()
+
+    def summary(self) -> dict:
+        """Build the run summary"""
+        elapsed = (self.end_time or time.perf_counter()) - self.start_time
+        return {
+            "elapsed_s": elapsed,
+            "files_ok": self.files_ok,
+            "files_failed": self.files_failed,
+            "bytes_moved": self.bytes_moved,
+            "files_per_s": self.files_ok / elapsed if elapsed > 0 else 0.0,
+            "bytes_per_s": self.bytes_moved / elapsed if elapsed > 0 else 0.0,
+            "errors": dict(self.errors),
+            "counters": dict(self.counters),
+            "phases": {phase: histogram.summary() for phase, histogram in self.phases.items() if histogram.count},
+            "slowest_files": [{"file": name, "seconds": seconds}
+                              for seconds, name in sorted(self._slowest, reverse=True)],
+        }
+
+    def format_summary(self) -> List[str]:
+        """Format the run summary as log lines"""
+        summary = self.summary()
+        lines = [
+            f"Run summary: {summary['files_ok']} files ok, {summary['files_failed']} failed in "
+            f"{summary['elapsed_s']:.2f}s ({summary['files_per_s']:.1f} files/s, "
+            f"{summary['bytes_per_s'] / (1024 * 1024):.1f} MiB/s)"
+        ]
+        for phase, stats in summary["phases"].items():
+            lines.append(
+                f"  {phase}: n={stats['count']} total={stats['total_s']:.3f}s "
+                f"p50={stats['p50_s'] * 1000:.3f}ms p95={stats['p95_s'] * 1000:.3f}ms "
+                f"p99={stats['p99_s'] * 1000:.3f}ms max={stats['max_s'] * 1000:.3f}ms")
+        if summary["errors"]:
+            lines.append("  errors: " + ", ".join(f"{name}={count}" for name, count in summary["errors"].items()))
+        if summary["slowest_files"]:
+            lines.append("  slowest: " + ", ".join(
+                f"{item['file']} ({item['seconds'] * 1000:.1f}ms)" for item in summary["slowest_files"][:5]))
+        return lines
+
+    def export_json(self, file_path: str) -> bool:
+        """Export the run summary as JSON"""
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            print(f"Failed to export run metrics: {e}")
+            return False
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search Filter
+Responsible for metadata conditions on searched files (size, modification time, type),
+parsed from a short filter expression and evaluated from scandir data
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .rule_engine import parse_size
+
+_COMPARISON = re.compile(r"(size|modified)(<=|>=|<|>)(.+)", re.IGNORECASE)
+_DATE_FORMATS = (("%Y-%m-%d", "day"), ("%Y-%m", "month"), ("%Y", "year"))
+
+
+def _parse_period(value: str) -> Tuple[float, float]:
+    """Parse "2022", "2022-06" or "2022-06-15" into the (start, end) timestamps of that period"""
+    for date_format, unit in _DATE_FORMATS:
+        try:
+            start = datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        if unit == "year":
+            end = start.replace(year=start.year + 1)
+        elif unit == "month":
+            end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        else:
+            end = datetime.fromordinal(start.toordinal() + 1)
+        return start.timestamp(), end.timestamp()
+    raise ValueError(f"Invalid date: {value}")
+
+
+class SearchFilter:
+    """Metadata conditions a searched file must meet
+
+    Conditions on the name (extensions) are checked first and cost a set lookup; size and
+    modification time come from the entry's stat data, read at most once per file (free on
+    Windows, where scandir returns it). The bounds are plain attributes so that a file index
+    can apply them itself instead of calling matches().
+    """
+
+    def __init__(self, extensions: Optional[FrozenSet[str]] = None,
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 modified_after: Optional[float] = None, modified_before: Optional[float] = None):
+        self.extensions = extensions
+        self.min_size = min_size
+        self.max_size = max_size
+        # modified_after is inclusive, modified_before exclusive
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.needs_stat = any(bound is not None for bound in (min_size, max_size, modified_after, modified_before))
+
+    def matches_name(self, name: str) -> bool:
+        """Check the conditions decided by the file name alone"""
+        return self.extensions is None or os.path.splitext(name)[1].lower() in self.extensions
+
+    def matches_stat(self, file_stat: os.stat_result) -> bool:
+        """Check the conditions on stat data"""
+        size = file_stat.st_size
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        mtime = file_stat.st_mtime
+        if self.modified_after is not None and mtime < self.modified_after:
+            return False
+        if self.modified_before is not None and mtime >= self.modified_before:
+            return False
+        return True
+
+    def matches(self, entry: os.DirEntry) -> bool:
+        """Check all conditions for a directory entry, cheapest first"""
+        if not self.matches_name(entry.name):
+            return False
+        return not self.needs_stat or self.matches_stat(entry.stat())
+
+
+def parse_search_filter(text: str, file_types: Dict[str, List[str]]) -> Optional[SearchFilter]:
+    """Parse a filter expression such as "size>1GB modified<2022 type:Videos"
+
+    Terms are separated by spaces and must all hold: size and modified compare with < <= > >=
+    (dates are years, months or days; "<" and ">=" refer to the start of the period, "<=" and
+    ">" to its end), type: takes category names and ext: extensions, both comma-separated.
+    Returns None for an empty expression and raises ValueError for invalid terms.
+    """
+    extensions = None
+    min_size = max_size = modified_after = modified_before = None
+    categories = {category.casefold(): category_extensions for category, category_extensions in file_types.items()}
+
+    for term in text.split():
+        key, _, values = term.partition(":")
+        if values and key.lower() in ("type", "ext"):
+            if key.lower() == "type":
+                unknown = [value for value in values.split(",") if value.casefold() not in categories]
+                if unknown:
+                    raise ValueError(f"Unknown type: {', '.join(unknown)} ({', '.join(file_types)})")
+                term_extensions = {extension.lower() for value in values.split(",")
+                                   for extension in categories[value.casefold()]}
+            else:
+                term_extensions = {value.lower() if value.startswith(".") else f".{value.lower()}"
+                                   for value in values.split(",") if value}
+            extensions = frozenset(term_extensions if extensions is None else extensions & term_extensions)
+            continue
+
+        match = _COMPARISON.fullmatch(term)
+        if not match:
+            raise ValueError(f"Invalid filter: {term}")
+        field, operator, value = match.group(1).lower(), match.group(2), match.group(3)
+
+        if field == "size":
+            size = parse_size(value)
+            if operator in (">", ">="):
+                bound = size + 1 if operator == ">" else size
+                min_size = bound if min_size is None else max(min_size, bound)
+            else:
+                bound = size - 1 if operator == "<" else size
+                max_size = bound if max_size is None else min(max_size, bound)
+        else:
+            start, end = _parse_period(value)
+            if operator in (">", ">="):
+                bound = end if operator == ">" else start
+                modified_after = bound if modified_after is None else max(modified_after, bound)
+            else:
+                bound = start if operator == "<" else end
+                modified_before = bound if modified_before is None else min(modified_before, bound)
+
+    if extensions is None and not any(bound is not None for bound in (min_size, max_size, modified_after, modified_before)):
+        return None
+    return SearchFilter(extensions, min_size, max_size, modified_after, modified_before)
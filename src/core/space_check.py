@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Space Check
+Responsible for checking, before any file is moved, that every target filesystem has room for
+the bytes and files an organize, separation or routing run will copy onto it
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Actions of the free space check: stop the run, only log a warning, or skip the check
+SPACE_CHECK_MODES = ("refuse", "warn", "off")
+
+
+class SpaceRequirement:
+    """What an organize run will write to one target filesystem, and what the filesystem has free"""
+
+    __slots__ = ("path", "device", "bytes", "files", "free_bytes", "free_files", "block_size")
+
+    def __init__(self, path: Path, device: int):
+        self.path = path
+        self.device = device
+        self.bytes = 0
+        self.files = 0
+        self.free_bytes = 0
+        self.free_files: Optional[int] = None
+        self.block_size = 1
+
+    def is_sufficient(self, margin: float) -> bool:
+        """Check that the free bytes and inodes cover the requirement plus a relative margin"""
+        if self.bytes * (1 + margin) > self.free_bytes:
+            return False
+        return self.free_files is None or self.files * (1 + margin) <= self.free_files
+
+
+def estimate_space(core, entries: Iterable[os.DirEntry], target_path: Path) -> List[SpaceRequirement]:
+    """Sum the bytes and files each target filesystem receives when organizing entries
+
+    Files on the target's filesystem are renamed, hard linked or cloned and cost no data blocks
+    (a clone still takes an inode); files on other filesystems are copied, rounded up to whole
+    blocks. Source devices are read once per source folder and sizes come from the entries'
+    cached stat data. Category folders that are mount points (or symlinks) of other filesystems
+    count as their own target, with files assigned to categories by extension.
+    """
+    fs = core.fs
+    requirements: Dict[int, SpaceRequirement] = {}
+    target_device = fs.stat(target_path).st_dev
+    target_requirement = _requirement_for(fs, requirements, target_path, target_device)
+
+    category_devices: Dict[str, SpaceRequirement] = {}
+    with fs.scandir(target_path) as target_entries:
+        for entry in target_entries:
+            try:
+                if entry.is_dir():
+                    device = entry.stat().st_dev
+                    if device != target_device:
+                        category_devices[entry.name] = _requirement_for(fs, requirements, Path(entry.path), device)
+            except OSError:
+                continue
+
+    clones_take_inodes = core.config_manager.get_setting("organize_mode", "move") == "reflink"
+    categories: Dict[str, Optional[str]] = {}
+    directory_devices: Dict[str, int] = {}
+    for entry in entries:
+        requirement = target_requirement
+        if category_devices:
+            extension = os.path.splitext(entry.name)[1].lower()
+            if extension not in categories:
+                categories[extension] = core._category_for_extension(extension)
+            requirement = category_devices.get(categories[extension], requirement)
+        _add_file(fs, requirement, entry, directory_devices, clones_take_inodes)
+
+    return [requirement for requirement in requirements.values() if requirement.files]
+
+
+def estimate_moves(core, moves: Dict[Path, Iterable[os.DirEntry]]) -> List[SpaceRequirement]:
+    """Sum the bytes and files each filesystem receives when moving entries into folders as they are
+
+    moves maps destination folders to their entries, as separation and routing move them.
+    Folders that don't exist yet count on the filesystem of their nearest existing parent.
+    """
+    fs = core.fs
+    requirements: Dict[int, SpaceRequirement] = {}
+    directory_devices: Dict[str, int] = {}
+    for destination, entries in moves.items():
+        folder = Path(destination)
+        while not fs.exists(folder) and folder.parent != folder:
+            folder = folder.parent
+        requirement = _requirement_for(fs, requirements, folder, fs.stat(folder).st_dev)
+        for entry in entries:
+            _add_file(fs, requirement, entry, directory_devices, False)
+
+    return [requirement for requirement in requirements.values() if requirement.files]
+
+
+def _requirement_for(fs, requirements: Dict[int, SpaceRequirement], path: Path, device: int) -> SpaceRequirement:
+    """Get the requirement of a device, reading its free space the first time"""
+    requirement = requirements.get(device)
+    if requirement is None:
+        requirement = requirements[device] = SpaceRequirement(path, device)
+        requirement.free_bytes, requirement.free_files, requirement.block_size = fs.free_space(path)
+    return requirement
+
+
+def _add_file(fs, requirement: SpaceRequirement, entry: os.DirEntry, directory_devices: Dict[str, int],
+              clones_take_inodes: bool) -> None:
+    """Count one file on its target's requirement; same-device files are renamed in place"""
+    directory = os.path.dirname(entry.path)
+    source_device = directory_devices.get(directory)
+    if source_device is None:
+        source_device = directory_devices[directory] = fs.stat(directory).st_dev
+
+    if requirement.device == source_device:
+        if clones_take_inodes:
+            requirement.files += 1
+        return
+    try:
+        size = entry.stat().st_size
+    except OSError:
+        # Vanished files are reported by the run itself
+        return
+    requirement.files += 1
+    block_size = requirement.block_size
+    requirement.bytes += -(-size // block_size) * block_size
+
+
+def format_requirement(requirement: SpaceRequirement, get_text: Callable[[str], str]) -> str:
+    """Render a requirement the target filesystem can't meet as a log line"""
+    from .library_analytics import format_size
+
+    free_files = "-" if requirement.free_files is None else f"{requirement.free_files:,}"
+    return (f"{get_text('insufficient_space')} {requirement.path}: "
+            f"{format_size(requirement.bytes)} / {format_size(requirement.free_bytes)}, "
+            f"{requirement.files:,} / {free_files} {get_text('space_check_files')}")
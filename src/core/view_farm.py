@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+View Farm
+Responsible for symlink views that show the organized target by category, month, size band
+and extension at once, built from one scan and updated incrementally
+"""
+
+import os
+import gzip
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .date_resolver import DateBucketCache
+from .file_organizer_core import VIEWS_DIR_NAME, CancelCheck
+
+
+MANIFEST_NAME = ".views_manifest.gz"
+VIEW_DIMENSIONS = ("category", "date", "size", "extension")
+
+# Size bands as (upper bound in bytes, folder name); the last band has no upper bound
+SIZE_BANDS: List[Tuple[Optional[int], str]] = [
+    (1024 ** 2, "under_1MB"),
+    (10 * 1024 ** 2, "1MB-10MB"),
+    (100 * 1024 ** 2, "10MB-100MB"),
+    (1024 ** 3, "100MB-1GB"),
+    (None, "over_1GB"),
+]
+
+# Links live at <views>/<by_dimension>/<bucket>/<name>, three levels below the target root
+_LINK_PREFIX = os.path.join(os.pardir, os.pardir, os.pardir)
+
+
+def size_band(size: int) -> str:
+    """Get the size band folder of a file size"""
+    for limit, name in SIZE_BANDS:
+        if limit is None or size < limit:
+            return name
+    return SIZE_BANDS[-1][1]
+
+
+class ViewFarm:
+    """Maintains symlink trees over an organized target directory
+
+    One scan of the target yields a record per file (relative path and its bucket in every
+    dimension). The records of the previous update are kept in a manifest, so re-runs only
+    remove and create the links that changed. Links are created per bucket directory through
+    a directory file descriptor where the platform supports it.
+    """
+
+    def __init__(self, target_path: Path):
+        self.target_path = Path(target_path)
+        self.views_path = self.target_path / VIEWS_DIR_NAME
+        self.manifest_path = self.views_path / MANIFEST_NAME
+        self._months = DateBucketCache("month")
+
+    def scan(self, dimensions: Iterable[str], cancel_check: Optional[CancelCheck] = None) -> Dict[str, List[str]]:
+        """Walk the target once and get {relative path: [bucket per dimension]}"""
+        dimensions = list(dimensions)
+        needs_stat = "date" in dimensions or "size" in dimensions
+        records = {}
+        root = str(self.target_path)
+        pending = [(root, "")]
+
+        while pending:
+            if cancel_check and cancel_check():
+                break
+            directory, relative_dir = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            # Tabs and newlines can't be stored in the manifest
+                            if "\t" in entry.name or "\n" in entry.name:
+                                continue
+                            relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                            if entry.is_dir(follow_symlinks=False):
+                                if relative_path != VIEWS_DIR_NAME:
+                                    pending.append((entry.path, relative_path))
+                            elif entry.is_file(follow_symlinks=False):
+                                file_stat = entry.stat(follow_symlinks=False) if needs_stat else None
+                                records[relative_path] = [self._bucket(dimension, relative_dir, entry.name, file_stat)
+                                                          for dimension in dimensions]
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Scan error ({directory}): {e}")
+
+        return records
+
+    def _bucket(self, dimension: str, relative_dir: str, name: str, file_stat: Optional[os.stat_result]) -> str:
+        """Get the bucket folder of a file in one dimension"""
+        if dimension == "category":
+            return relative_dir.split(os.sep, 1)[0] if relative_dir else "_unsorted"
+        if dimension == "date":
+            return self._months.get(file_stat.st_mtime)
+        if dimension == "size":
+            return size_band(file_stat.st_size)
+        extension = os.path.splitext(name)[1].lower().lstrip(".")
+        return extension or "no_extension"
+
+    def _name_counts(self, index: int, records: Dict[str, List[str]]) -> Counter:
+        """Count the files per (bucket, file name) of one dimension"""
+        sep = os.sep
+        return Counter((buckets[index], relative_path.rpartition(sep)[2]) for relative_path, buckets in records.items())
+
+    def _link_path(self, dimension: str, bucket: str, relative_path: str, name_count: int) -> str:
+        """Get the link path (relative to the views folder) of a file
+
+        Links are named after their file; names occurring twice in a bucket use the flattened
+        relative path instead, so names only depend on the set of files.
+        """
+        sep = os.sep
+        name = relative_path.replace(sep, "__") if name_count > 1 else relative_path.rpartition(sep)[2]
+        return f"by_{dimension}{sep}{bucket}{sep}{name}"
+
+    def _view_links(self, dimension: str, index: int, records: Dict[str, List[str]]) -> Dict[str, str]:
+        """Map every link of one view to the relative path of its file"""
+        counts = self._name_counts(index, records)
+        sep = os.sep
+        return {self._link_path(dimension, buckets[index], relative_path,
+                                counts[(buckets[index], relative_path.rpartition(sep)[2])]): relative_path
+                for relative_path, buckets in records.items()}
+
+    def _delta(self, old_dimensions: List[str], old_records: Dict[str, List[str]],
+               new_dimensions: List[str], new_records: Dict[str, List[str]]) -> Tuple[List[str], Dict[str, str]]:
+        """Get the links to remove and the links to create (link path -> relative file path)
+
+        Only files that were added, removed or changed bucket, and files whose name started or
+        stopped colliding in their bucket, get link paths built; unchanged files cost a lookup.
+        """
+        stale: List[str] = []
+        missing: Dict[str, str] = {}
+        sep = os.sep
+        all_paths = None
+
+        for dimension in VIEW_DIMENSIONS:
+            old_index = old_dimensions.index(dimension) if dimension in old_dimensions else None
+            new_index = new_dimensions.index(dimension) if dimension in new_dimensions else None
+            if old_index is None and new_index is None:
+                continue
+            if new_index is None:
+                stale.extend(self._view_links(dimension, old_index, old_records))
+                continue
+            if old_index is None:
+                missing.update(self._view_links(dimension, new_index, new_records))
+                continue
+
+            old_counts = self._name_counts(old_index, old_records)
+            new_counts = self._name_counts(new_index, new_records)
+            flipped = {key for key in old_counts.keys() | new_counts.keys()
+                       if (old_counts[key] > 1) != (new_counts[key] > 1)}
+            if all_paths is None:
+                all_paths = old_records.keys() | new_records.keys()
+
+            for relative_path in all_paths:
+                old_buckets = old_records.get(relative_path)
+                new_buckets = new_records.get(relative_path)
+                old_bucket = old_buckets[old_index] if old_buckets is not None else None
+                new_bucket = new_buckets[new_index] if new_buckets is not None else None
+                name = relative_path.rpartition(sep)[2]
+                if old_bucket == new_bucket and (old_bucket, name) not in flipped:
+                    continue
+                if old_bucket is not None:
+                    stale.append(self._link_path(dimension, old_bucket, relative_path, old_counts[(old_bucket, name)]))
+                if new_bucket is not None:
+                    missing[self._link_path(dimension, new_bucket, relative_path, new_counts[(new_bucket, name)])] = relative_path
+
+        return stale, missing
+
+    def update(self, dimensions: Iterable[str], rebuild: bool = False,
+               cancel_check: Optional[CancelCheck] = None) -> Dict[str, int]:
+        """Bring the views in line with the target and return {"files", "added", "removed"}"""
+        dimensions = [dimension for dimension in VIEW_DIMENSIONS if dimension in dimensions]
+        records = self.scan(dimensions, cancel_check)
+        if cancel_check and cancel_check():
+            return {"files": len(records), "added": 0, "removed": 0}
+
+        previous = None if rebuild else self._load_manifest()
+        if previous is None:
+            # Unknown state: start from empty views (only links are ever deleted)
+            self._remove_all_links()
+            previous = ([], {})
+        elif previous == (dimensions, records):
+            self._remove_empty_buckets([])
+            return {"files": len(records), "added": 0, "removed": 0}
+
+        stale, missing = self._delta(previous[0], previous[1], dimensions, records)
+        # A file whose link is both removed and created (its name stopped and started colliding
+        # within one update) keeps its link
+        unchanged = {link for link in stale if link in missing}
+        stale = [link for link in stale if link not in unchanged]
+        for link in unchanged:
+            del missing[link]
+
+        removed = self._apply(stale, lambda name, target, dir_fd: os.unlink(name, dir_fd=dir_fd), None)
+        added = self._apply(list(missing), lambda name, target, dir_fd: os.symlink(target, name, dir_fd=dir_fd), missing)
+        self._remove_empty_buckets(stale)
+        self._save_manifest(dimensions, records)
+        return {"files": len(records), "added": added, "removed": removed}
+
+    def _apply(self, links: List[str], operation: Callable, targets: Optional[Dict[str, str]]) -> int:
+        """Apply a link operation bucket by bucket; returns the number of successful operations"""
+        by_directory = defaultdict(list)
+        for link in links:
+            directory, name = os.path.split(link)
+            by_directory[directory].append(name)
+
+        use_dir_fd = os.symlink in os.supports_dir_fd and os.unlink in os.supports_dir_fd
+        done = 0
+        for directory, names in by_directory.items():
+            bucket_path = os.path.join(self.views_path, directory)
+            dir_fd = None
+            try:
+                if targets is not None:
+                    os.makedirs(bucket_path, exist_ok=True)
+                if use_dir_fd:
+                    dir_fd = os.open(bucket_path, os.O_RDONLY)
+            except OSError as e:
+                print(f"View folder error ({bucket_path}): {e}")
+                continue
+
+            try:
+                for name in names:
+                    target = os.path.join(_LINK_PREFIX, targets[os.path.join(directory, name)]) if targets else None
+                    try:
+                        operation(name if dir_fd is not None else os.path.join(bucket_path, name), target, dir_fd)
+                        done += 1
+                    except FileNotFoundError:
+                        continue
+                    except OSError as e:
+                        print(f"View link error ({os.path.join(bucket_path, name)}): {e}")
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
+        return done
+
+    def _remove_empty_buckets(self, removed_links: List[str]) -> None:
+        """Remove bucket folders left empty by removed links"""
+        for directory in {os.path.dirname(link) for link in removed_links}:
+            try:
+                os.rmdir(os.path.join(self.views_path, directory))
+            except OSError:
+                continue
+
+    def _remove_all_links(self) -> None:
+        """Delete every symlink (and then empty folder) below the view folders"""
+        for dimension in VIEW_DIMENSIONS:
+            view_path = self.views_path / f"by_{dimension}"
+            if not view_path.is_dir():
+                continue
+            for directory, subdirectories, files in os.walk(view_path, topdown=False):
+                for name in files + subdirectories:
+                    path = os.path.join(directory, name)
+                    try:
+                        if os.path.islink(path):
+                            os.unlink(path)
+                        elif os.path.isdir(path):
+                            os.rmdir(path)
+                    except OSError:
+                        continue
+
+    def _load_manifest(self) -> Optional[Tuple[List[str], Dict[str, List[str]]]]:
+        """Load the dimensions and file records of the last update"""
+        try:
+            with gzip.open(self.manifest_path, 'rt', encoding='utf-8', errors='surrogateescape', newline='\n') as f:
+                dimensions = [dimension for dimension in f.readline().rstrip("\n").split("\t") if dimension]
+                records = {}
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    records[fields[0]] = fields[1:]
+            return dimensions, records
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"View manifest load error: {e}")
+            return None
+
+    def _save_manifest(self, dimensions: List[str], records: Dict[str, List[str]]) -> None:
+        """Save the dimensions and file records of this update (one tab-separated line per file)"""
+        os.makedirs(self.views_path, exist_ok=True)
+        temp_path = str(self.manifest_path) + ".tmp"
+        try:
+            with gzip.open(temp_path, 'wt', encoding='utf-8', errors='surrogateescape', newline='\n') as f:
+                f.write("\t".join(dimensions) + "\n")
+                for relative_path, buckets in records.items():
+                    f.write("\t".join([relative_path] + buckets) + "\n")
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"View manifest save error: {e}")
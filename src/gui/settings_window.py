@@ -99,15 +99,78 @@ class SettingsWindow:
         ttk.Checkbutton(options_frame, text=self.config_manager.get_text("create_date_folders"), 
                        variable=self.create_date_folders_var).pack(anchor=tk.W)
         
+        # Date folder granularity and date source
+        date_frame = ttk.Frame(options_frame)
+        date_frame.pack(anchor=tk.W, fill=tk.X, padx=(20, 0), pady=(0, 5))
+        
+        self.granularity_options = ["year", "month", "day", "week"]
+        self.date_source_options = ["mtime", "ctime", "capture"]
+        
+        ttk.Label(date_frame, text=self.config_manager.get_text("date_folder_granularity")).grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.granularity_combo = ttk.Combobox(date_frame, state="readonly", width=30,
+                                              values=[self.config_manager.get_text(f"granularity_{option}") for option in self.granularity_options])
+        self.granularity_combo.grid(row=0, column=1, sticky=tk.W)
+        self.granularity_combo.current(self._option_index(self.granularity_options, "date_folder_granularity", "month"))
+        
+        ttk.Label(date_frame, text=self.config_manager.get_text("date_source")).grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.date_source_combo = ttk.Combobox(date_frame, state="readonly", width=30,
+                                              values=[self.config_manager.get_text(f"date_source_{option}") for option in self.date_source_options])
+        self.date_source_combo.grid(row=1, column=1, sticky=tk.W, pady=(5, 0))
+        self.date_source_combo.current(self._option_index(self.date_source_options, "date_source", "mtime"))
+        
+        # Organize mode (move, or keep originals and link them)
+        mode_frame = ttk.Frame(options_frame)
+        mode_frame.pack(anchor=tk.W, fill=tk.X, pady=(0, 5))
+        self.organize_mode_options = ["move", "hardlink", "reflink"]
+        ttk.Label(mode_frame, text=self.config_manager.get_text("organize_mode")).grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.organize_mode_combo = ttk.Combobox(mode_frame, state="readonly", width=40,
+                                                values=[self.config_manager.get_text(f"organize_mode_{option}") for option in self.organize_mode_options])
+        self.organize_mode_combo.grid(row=0, column=1, sticky=tk.W)
+        self.organize_mode_combo.current(self._option_index(self.organize_mode_options, "organize_mode", "move"))
+        
         # Move duplicate files
         self.move_duplicates_var = tk.BooleanVar(value=self.config_manager.get_setting("move_duplicates", True))
         ttk.Checkbutton(options_frame, text=self.config_manager.get_text("auto_rename_duplicates"), 
                        variable=self.move_duplicates_var).pack(anchor=tk.W)
         
+        # Detect type of unknown files from their content
+        self.sniff_unknown_files_var = tk.BooleanVar(value=self.config_manager.get_setting("sniff_unknown_files", True))
+        ttk.Checkbutton(options_frame, text=self.config_manager.get_text("sniff_unknown_files"), 
+                       variable=self.sniff_unknown_files_var).pack(anchor=tk.W)
+        
+        # Only organize the files of the source folder added or changed since the last run
+        self.incremental_organize_var = tk.BooleanVar(value=self.config_manager.get_setting("incremental_organize", False))
+        ttk.Checkbutton(options_frame, text=self.config_manager.get_text("incremental_organize"), 
+                       variable=self.incremental_organize_var).pack(anchor=tk.W)
+        
+        # Number of files organized concurrently
+        concurrency_frame = ttk.Frame(options_frame)
+        concurrency_frame.pack(anchor=tk.W, fill=tk.X, pady=(5, 0))
+        ttk.Label(concurrency_frame, text=self.config_manager.get_text("organize_concurrency")).pack(side=tk.LEFT, padx=(0, 10))
+        self.organize_concurrency_var = tk.IntVar(value=self.config_manager.get_setting("organize_concurrency", 1))
+        ttk.Spinbox(concurrency_frame, from_=1, to=128, width=6, 
+                    textvariable=self.organize_concurrency_var).pack(side=tk.LEFT)
+        
+        # Symlink views of the target folder
+        views_frame = ttk.LabelFrame(frame, text=self.config_manager.get_text("views"), padding="10")
+        views_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        view_dimensions = self.config_manager.get_setting("view_dimensions", [])
+        self.view_dimension_vars = {}
+        for column, dimension in enumerate(["category", "date", "size", "extension"]):
+            self.view_dimension_vars[dimension] = tk.BooleanVar(value=dimension in view_dimensions)
+            ttk.Checkbutton(views_frame, text=self.config_manager.get_text(f"view_{dimension}"), 
+                           variable=self.view_dimension_vars[dimension]).grid(row=0, column=column, sticky=tk.W, padx=(0, 15))
+        
         # Save button
         ttk.Button(frame, text=self.config_manager.get_text("save"), 
                   command=self.save_settings).pack(pady=20)
     
+    def _option_index(self, options: List[str], key: str, default: str) -> int:
+        """Get the combobox index of a stored setting"""
+        value = self.config_manager.get_setting(key, default)
+        return options.index(value) if value in options else options.index(default)
+    
     def create_language_tab(self, notebook):
         """Create language settings tab"""
         frame = ttk.Frame(notebook)
@@ -220,7 +283,17 @@ class SettingsWindow:
         """Save general settings"""
         self.config_manager.set_setting("auto_organize", self.auto_organize_var.get())
         self.config_manager.set_setting("create_date_folders", self.create_date_folders_var.get())
+        self.config_manager.set_setting("date_folder_granularity", self.granularity_options[self.granularity_combo.current()])
+        self.config_manager.set_setting("date_source", self.date_source_options[self.date_source_combo.current()])
         self.config_manager.set_setting("move_duplicates", self.move_duplicates_var.get())
+        self.config_manager.set_setting("organize_mode", self.organize_mode_options[self.organize_mode_combo.current()])
+        self.config_manager.set_setting("sniff_unknown_files", self.sniff_unknown_files_var.get())
+        self.config_manager.set_setting("incremental_organize", self.incremental_organize_var.get())
+        self.config_manager.set_setting("view_dimensions", [dimension for dimension, var in self.view_dimension_vars.items() if var.get()])
+        try:
+            self.config_manager.set_setting("organize_concurrency", max(1, self.organize_concurrency_var.get()))
+        except tk.TclError:
+            pass
         
         self.config_manager.save_config()
         self._notify_settings_changed()
@@ -6,18 +6,21 @@ Main application class that coordinates between different components
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext
 import os
 import threading
+import time
 from pathlib import Path
 from typing import Optional
 
 from config.config_manager import ConfigManager
-from core.file_organizer_core import FileOrganizerCore
+from core.file_organizer_core import FileOrganizerCore, SEARCH_MODES
+from core.checkpoint import CheckpointStore
+from core.directory_state import DirectoryStateCache
 from utils.logger import Logger
-from gui.language_dialog import LanguageSelectionDialog
-from gui.settings_window import SettingsWindow
-from gui.separation_destination_dialog import SeparationDestinationDialog
+from utils.profiler import configure_profiling, profiled
+
+# Dialog modules and tkinter.filedialog are imported on first use to keep startup fast
 
 
 class FileOrganizerApp:
@@ -28,8 +31,15 @@ class FileOrganizerApp:
         
         # Initialize components
         self.config_manager = self._setup_config_manager()
+        configure_profiling(self.config_manager.get_setting("profiling", ""))
         self.file_organizer_core = FileOrganizerCore(self.config_manager)
-        self.logger = Logger()
+        config_dir = os.path.dirname(os.path.abspath(self.config_manager.config_file))
+        self.checkpoint_store = CheckpointStore(os.path.join(config_dir, "organize_checkpoint.json"))
+        self.directory_cache = DirectoryStateCache(os.path.join(config_dir, "directory_state.json.gz"))
+        self.logger = Logger(get_text=self.config_manager.get_text)
+        # Per-file results are logged as events and only rendered when displayed
+        for text_key in ("move_file", "copy_file", "link_file", "already_organized"):
+            self.logger.set_formatter(text_key, self.file_organizer_core.format_result)
         
         # Initialize UI first
         self.root = tk.Tk()
@@ -40,7 +50,11 @@ class FileOrganizerApp:
         self.source_directory = tk.StringVar()
         self.target_directory = tk.StringVar()
         self.search_pattern = tk.StringVar()
+        self.search_filter_text = tk.StringVar()
         self.organizing = False
+        # True from the start of a background operation until its worker thread is done; organizing
+        # is cleared by Stop while the worker may still be finishing a batch
+        self.worker_running = False
         
         # Check if this is first run and show language selection
         if not self.config_manager.get_setting("language_selected", False):
@@ -80,6 +94,8 @@ class FileOrganizerApp:
     
     def _show_language_selection(self):
         """Show language selection dialog"""
+        from gui.language_dialog import LanguageSelectionDialog
+        
         def on_language_selected(language: str):
             print(f"Language selected: {language}")
             self.root.title(self.config_manager.get_text("app_title"))
@@ -129,19 +145,31 @@ class FileOrganizerApp:
                                       command=self.start_auto_organize)
         self.organize_btn.grid(row=0, column=0, padx=(0, 10))
         
+        # Resume button
+        self.resume_btn = ttk.Button(control_frame, text=self.config_manager.get_text("resume_organize"), 
+                                    command=self.resume_auto_organize)
+        self.resume_btn.grid(row=0, column=1, padx=(0, 10))
+        self._update_resume_button()
+        
         # Stop button
         self.stop_btn = ttk.Button(control_frame, text=self.config_manager.get_text("stop"), 
                                  command=self.stop_organize, state=tk.DISABLED)
-        self.stop_btn.grid(row=0, column=1, padx=(0, 10))
+        self.stop_btn.grid(row=0, column=2, padx=(0, 10))
         
         # Settings button
-        ttk.Button(control_frame, text=self.config_manager.get_text("settings"), command=self.open_settings).grid(row=0, column=2, padx=(0, 10))
+        ttk.Button(control_frame, text=self.config_manager.get_text("settings"), command=self.open_settings).grid(row=0, column=3, padx=(0, 10))
+        
+        # Update views button
+        ttk.Button(control_frame, text=self.config_manager.get_text("update_views"), command=self.update_views).grid(row=0, column=4, padx=(0, 10))
+        
+        # Analyze source button
+        ttk.Button(control_frame, text=self.config_manager.get_text("analyze_source"), command=self.analyze_source).grid(row=0, column=5, padx=(0, 10))
         
         # Progress bar
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(control_frame, variable=self.progress_var, 
                                            maximum=100, length=300)
-        self.progress_bar.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
+        self.progress_bar.grid(row=1, column=0, columnspan=6, sticky=(tk.W, tk.E), pady=(10, 0))
         
         # Search and separation section
         search_frame = ttk.LabelFrame(main_frame, text=self.config_manager.get_text("file_search_separation"), padding="10")
@@ -163,9 +191,26 @@ class FileOrganizerApp:
         ttk.Button(search_frame, text=self.config_manager.get_text("select_destination"), 
                   command=self.separate_files_with_custom_destination).grid(row=0, column=4)
         
+        # What the pattern is matched against: file names, relative paths or file contents
+        ttk.Label(search_frame, text=self.config_manager.get_text("search_mode")).grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.search_mode_options = list(SEARCH_MODES)
+        self.search_mode_combo = ttk.Combobox(search_frame, state="readonly", width=30,
+                                              values=[self.config_manager.get_text(f"search_mode_{option}") for option in self.search_mode_options])
+        self.search_mode_combo.grid(row=1, column=1, sticky=tk.W, pady=(5, 0))
+        self.search_mode_combo.current(0)
+        
+        # Metadata filter expression, e.g. "size>1GB modified<2022 type:Videos"
+        ttk.Label(search_frame, text=self.config_manager.get_text("search_filter")).grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        ttk.Entry(search_frame, textvariable=self.search_filter_text, width=40).grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(0, 10), pady=(5, 0))
+        ttk.Label(search_frame, text=self.config_manager.get_text("search_filter_hint")).grid(row=2, column=2, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        # Separate by all configured routes in one pass
+        ttk.Button(search_frame, text=self.config_manager.get_text("route_files"), 
+                  command=self.route_files).grid(row=1, column=4, pady=(5, 0))
+        
         # Search result display
         result_frame = ttk.Frame(search_frame)
-        result_frame.grid(row=1, column=0, columnspan=5, sticky=(tk.W, tk.E), pady=(10, 0))
+        result_frame.grid(row=3, column=0, columnspan=5, sticky=(tk.W, tk.E), pady=(10, 0))
         result_frame.columnconfigure(0, weight=1)
         
         self.result_text = scrolledtext.ScrolledText(result_frame, height=6, width=80)
@@ -192,6 +237,8 @@ class FileOrganizerApp:
     
     def browse_source(self):
         """Select source directory"""
+        from tkinter import filedialog
+        
         directory = filedialog.askdirectory(title=self.config_manager.get_text("source_directory"))
         if directory:
             self.source_directory.set(directory)
@@ -200,6 +247,8 @@ class FileOrganizerApp:
     
     def browse_target(self):
         """Select target directory"""
+        from tkinter import filedialog
+        
         directory = filedialog.askdirectory(title=self.config_manager.get_text("target_directory"))
         if directory:
             self.target_directory.set(directory)
@@ -216,28 +265,88 @@ class FileOrganizerApp:
             messagebox.showerror("Error", error_message)
             return
         
-        if self.organizing:
+        self._start_background_operation(self.auto_organize_files)
+    
+    def resume_auto_organize(self):
+        """Resume the last stopped organization from its checkpoint"""
+        checkpoint = self.checkpoint_store.load() if self.checkpoint_store.exists() else None
+        if checkpoint is None:
+            messagebox.showinfo("Info", self.config_manager.get_text("no_checkpoint"))
+            self._update_resume_button()
             return
         
+        self.source_directory.set(checkpoint["source"])
+        self.target_directory.set(checkpoint["target"])
+        self._start_background_operation(self.auto_organize_files, checkpoint)
+    
+    def _update_resume_button(self):
+        """Enable the resume button while a stopped organization is stored"""
+        enabled = not self.worker_running and self.checkpoint_store.exists()
+        self.resume_btn.config(state=tk.NORMAL if enabled else tk.DISABLED)
+    
+    def _start_background_operation(self, operation, *args) -> bool:
+        """Run a long operation on a worker thread, sharing the Stop button with organization
+        
+        Only one operation runs at a time: a stopped one blocks new operations until its worker is done.
+        """
+        if self.worker_running:
+            return False
+        
+        self.worker_running = True
         self.organizing = True
         self.organize_btn.config(state=tk.DISABLED)
+        self.resume_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
         self.progress_var.set(0)
         
         # Execute in separate thread
-        thread = threading.Thread(target=self.auto_organize_files)
+        thread = threading.Thread(target=operation, args=args)
         thread.daemon = True
         thread.start()
+        return True
     
-    def stop_organize(self):
-        """Stop organization"""
+    def _finish_background_operation(self):
+        """Reset the shared operation state once a worker thread is done"""
+        self.worker_running = False
         self.organizing = False
         self.organize_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
+        self._update_resume_button()
+    
+    def _is_cancelled(self) -> bool:
+        """Cancellation check polled by background scans"""
+        return not self.organizing
+    
+    def _make_scan_progress_callback(self):
+        """Create a throttled progress callback reporting scanned directories, matches and rate"""
+        start_time = time.monotonic()
+        last_update = [0.0]
+        
+        def on_progress(dirs_scanned: int, matches_found: int) -> None:
+            now = time.monotonic()
+            if now - last_update[0] < 0.1:
+                return
+            last_update[0] = now
+            rate = dirs_scanned / max(now - start_time, 1e-6)
+            self.status_var.set(
+                f"{self.config_manager.get_text('scanning')}: {dirs_scanned} {self.config_manager.get_text('directories_scanned')}, "
+                f"{matches_found} {self.config_manager.get_text('matches_found')} ({rate:.0f} {self.config_manager.get_text('directories_per_second')})")
+        
+        return on_progress
+    
+    def stop_organize(self):
+        """Stop organization; the buttons are enabled again once the worker has finished"""
+        self.organizing = False
+        self.stop_btn.config(state=tk.DISABLED)
         self.logger.log_message(self.config_manager.get_text("organization_stopped"))
     
-    def auto_organize_files(self):
-        """Auto organize files"""
+    @profiled()
+    def auto_organize_files(self, checkpoint: Optional[dict] = None):
+        """Auto organize files, continuing from checkpoint when resuming a stopped run"""
+        checkpointing = completed = False
+        incremental = not checkpoint and self.config_manager.get_setting("incremental_organize", False)
+        # position: number of files of the checkpoint's list before the first unfinished one
+        processed = position = 0
         try:
             source_path = Path(self.source_directory.get())
             target_path = Path(self.target_directory.get())
@@ -245,44 +354,240 @@ class FileOrganizerApp:
             # Create target directory
             target_path.mkdir(parents=True, exist_ok=True)
             
-            # Get files
-            files = self.file_organizer_core.get_files_for_organization(source_path)
-            total_files = len(files)
+            self.file_organizer_core.metrics.reset()
+            self.logger.reset_event_counts()
+            if checkpoint:
+                # Continue with the files the stopped run had not reached, without enumerating again
+                processed = position = checkpoint["position"]
+                total_files = checkpoint["total"]
+                entries = [self.file_organizer_core.fs.entry(source_path / name) for name in checkpoint["files"]]
+                self.checkpoint_store.resume(checkpoint)
+                checkpointing = True
+                self.logger.log_message(f"{self.config_manager.get_text('resume_organization')} {len(entries)} {self.config_manager.get_text('files_processed')}")
+            else:
+                # Get files (incremental runs skip a source unchanged since the last completed run)
+                if incremental:
+                    entries = self.file_organizer_core.get_changed_file_entries(source_path, self.directory_cache)
+                    skipped = self.file_organizer_core.metrics.counters.get("directories_skipped", 0)
+                    self.logger.log_message(f"{self.config_manager.get_text('unchanged_directories_skipped')} {skipped}")
+                else:
+                    entries = self.file_organizer_core.get_file_entries_for_organization(source_path)
+                total_files = len(entries)
+                
+                if total_files == 0:
+                    completed = self.organizing
+                    self.logger.log_message(self.config_manager.get_text("error_no_files_found"))
+                    return
+                
+                self.logger.log_message(f"{self.config_manager.get_text('start_organization')} {total_files} {self.config_manager.get_text('files_processed')}")
             
-            if total_files == 0:
-                self.logger.log_message(self.config_manager.get_text("error_no_files_found"))
+            # Sniff unknown files, read capture dates and compile rules in bulk
+            self.file_organizer_core.prepare_organization(entries)
+            if checkpoint:
+                self.file_organizer_core.restore_run_state(checkpoint)
+            if not self._check_free_space(entries, target_path):
                 return
+            if not checkpoint:
+                # Only runs that actually start leave a checkpoint to resume
+                self.checkpoint_store.begin(source_path, target_path,
+                                            [os.path.relpath(entry.path, source_path) for entry in entries])
+                checkpointing = True
             
-            self.logger.log_message(f"{self.config_manager.get_text('start_organization')} {total_files} {self.config_manager.get_text('files_processed')}")
-            
-            processed = 0
-            for file_path in files:
-                if not self.organizing:
-                    break
-                
-                success, message = self.file_organizer_core.organize_single_file(file_path, target_path)
-                if success:
-                    self.logger.log_message(message)
+            def report_result(result):
+                nonlocal processed
+                if result.ok:
+                    self.logger.log_event(result.text_key, result, group=result.category)
                 else:
-                    self.logger.log_error(message)
+                    self.logger.log_error(self.file_organizer_core.format_result(result))
+                    if incremental:
+                        self.directory_cache.file_failed(str(result.source))
                 
                 processed += 1
                 progress = (processed / total_files) * 100
                 self.progress_var.set(progress)
                 self.status_var.set(f"{self.config_manager.get_text('processing')}: {processed}/{total_files}")
             
+            concurrency = self.config_manager.get_setting("organize_concurrency", 1)
+            if concurrency > 1:
+                # Overlap filesystem round-trips (network shares)
+                from core.async_organizer import AsyncOrganizePipeline
+                
+                # Results arrive out of order; the checkpoint covers the prefix of files that are all done
+                start_position = position
+                done = bytearray(len(entries))
+                index_of = {entry.path: index for index, entry in enumerate(entries)}
+                done_prefix = 0
+                
+                def report_async_result(result):
+                    nonlocal position, done_prefix
+                    report_result(result)
+                    done[index_of[str(result.source)]] = 1
+                    while done_prefix < len(done) and done[done_prefix]:
+                        done_prefix += 1
+                    position = start_position + done_prefix
+                    self.checkpoint_store.save(position, self.file_organizer_core.get_run_state)
+                
+                AsyncOrganizePipeline(self.file_organizer_core, concurrency).organize_files(
+                    entries, target_path, self._is_cancelled, report_async_result)
+            else:
+                for result in self.file_organizer_core.organize_iter(entries, target_path, self._is_cancelled,
+                                                                     prepare=False):
+                    report_result(result)
+                    position = processed
+                    self.checkpoint_store.save(position, self.file_organizer_core.get_run_state)
+            
             if self.organizing:
+                completed = True
                 self.logger.log_message(f"{self.config_manager.get_text('organization_complete_files')} {processed} {self.config_manager.get_text('files_processed_complete')}")
                 self.status_var.set(self.config_manager.get_text("organization_complete"))
             else:
                 self.logger.log_message(self.config_manager.get_text("organization_stopped"))
+            
+            for line in self.logger.event_summary():
+                self.logger.log_message(line)
+            self._report_run_metrics()
+            
+            if completed and self.config_manager.get_setting("view_dimensions", []):
+                self._update_views(target_path)
                 
         except Exception as e:
             self.logger.log_error(f"Error: {e}")
         finally:
-            self.organizing = False
-            self.organize_btn.config(state=tk.NORMAL)
-            self.stop_btn.config(state=tk.DISABLED)
+            # Keep the checkpoint of stopped or failed runs so that they can be resumed
+            if checkpointing:
+                if completed:
+                    self.checkpoint_store.clear()
+                else:
+                    self.checkpoint_store.save(position, self.file_organizer_core.get_run_state, force=True)
+            if incremental:
+                if completed:
+                    self.directory_cache.commit(self.file_organizer_core.fs)
+                    self.directory_cache.save()
+                else:
+                    self.directory_cache.discard_pending()
+            self._finish_background_operation()
+    
+    def _check_free_space(self, entries: list, target_path: Path) -> bool:
+        """Check that the target filesystems have room for the run; False if it must not start"""
+        return self._check_space(lambda: self.file_organizer_core.check_free_space(entries, target_path))
+    
+    def _check_move_space(self, moves: dict) -> bool:
+        """Check that the destination filesystems have room for a separation; False if it must not start"""
+        return self._check_space(lambda: self.file_organizer_core.check_move_space(moves))
+    
+    def _check_space(self, check) -> bool:
+        """Log the filesystems a space check finds short; False if the run is refused"""
+        action = self.config_manager.get_setting("free_space_check", "refuse")
+        if action == "off":
+            return True
+        
+        from core.space_check import format_requirement
+        
+        try:
+            short = check()
+        except OSError as e:
+            self.logger.log_warning(f"{self.config_manager.get_text('space_check_failed')} {e}")
+            return True
+        
+        for requirement in short:
+            self.logger.log_warning(format_requirement(requirement, self.config_manager.get_text))
+        if short and action == "refuse":
+            self.logger.log_error(self.config_manager.get_text("space_check_refused"))
+            self.status_var.set(self.config_manager.get_text("organization_stopped"))
+            return False
+        return True
+    
+    def _report_run_metrics(self):
+        """Log the run summary and export it as JSON when a report directory is configured"""
+        metrics = self.file_organizer_core.metrics
+        metrics.finish()
+        for line in metrics.format_summary():
+            self.logger.log_message(line)
+        
+        report_dir = self.config_manager.get_setting("run_report_dir", "")
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+            report_file = os.path.join(report_dir, f"organize_report_{time.strftime('%Y%m%d_%H%M%S')}.json")
+            if metrics.export_json(report_file):
+                self.logger.log_message(f"{self.config_manager.get_text('run_report_saved')} {report_file}")
+    
+    def update_views(self):
+        """Update the symlink views of the target directory"""
+        if not self.target_directory.get():
+            messagebox.showerror("Error", self.config_manager.get_text("error_target_required"))
+            return
+        
+        self._start_background_operation(self._update_views_worker, Path(self.target_directory.get()))
+    
+    @profiled()
+    def _update_views_worker(self, target_path: Path):
+        """Worker thread body of update_views"""
+        try:
+            self._update_views(target_path)
+        except Exception as e:
+            self.logger.log_error(f"Error: {e}")
+        finally:
+            self._finish_background_operation()
+    
+    def _update_views(self, target_path: Path):
+        """Apply the configured view dimensions to the target directory (only changed links are touched)"""
+        from core.view_farm import ViewFarm
+        
+        result = ViewFarm(target_path).update(self.config_manager.get_setting("view_dimensions", []),
+                                              cancel_check=self._is_cancelled)
+        self.logger.log_message(f"{self.config_manager.get_text('views_updated')} {result['files']} (+{result['added']} / -{result['removed']})")
+    
+    def analyze_source(self):
+        """Summarize the source directory (categories, ages, sizes, largest files)"""
+        if not self.source_directory.get():
+            messagebox.showerror("Error", self.config_manager.get_text("error_source_required"))
+            return
+        
+        self._start_background_operation(self._analyze_source_worker, Path(self.source_directory.get()))
+    
+    @profiled()
+    def _analyze_source_worker(self, source_path: Path):
+        """Catalog and analyze the source directory on a background thread"""
+        try:
+            from core.library_analytics import analyze_catalog
+            
+            catalog = self.file_organizer_core.build_catalog(
+                source_path, self._is_cancelled, self._make_scan_progress_callback())
+            if not self._is_cancelled():
+                report = analyze_catalog(catalog)
+                self.root.after(0, self._show_analysis, report)
+        except Exception as e:
+            self.logger.log_error(f"Error: {e}")
+        finally:
+            self._finish_background_operation()
+    
+    def _show_analysis(self, report):
+        """Display an analysis report in the result area (runs on the Tk main thread)"""
+        from core.library_analytics import format_report, format_size
+        
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, format_report(report, self.config_manager.get_text))
+        self.logger.log_message(f"{self.config_manager.get_text('analysis_complete')} {report.files} / {format_size(report.total_bytes)} ({report.elapsed:.2f}s)")
+        self.status_var.set(self.config_manager.get_text("ready"))
+    
+    def _validate_search_inputs(self) -> bool:
+        """Validate the search pattern (optional when a filter is given) and the filter expression"""
+        filter_text = self.search_filter_text.get()
+        if not filter_text.strip():
+            is_valid, error_message = self.file_organizer_core.validate_search_pattern(self.search_pattern.get())
+        else:
+            is_valid, error_message = self.file_organizer_core.validate_search_filter(filter_text)
+        if not is_valid:
+            messagebox.showerror("Error", error_message)
+        return is_valid
+    
+    def _get_search_filter(self):
+        """Get the compiled filter expression (validated beforehand), or None"""
+        return self.file_organizer_core.compile_search_filter(self.search_filter_text.get())
+    
+    def _get_search_mode(self) -> str:
+        """Get the selected search mode"""
+        return self.search_mode_options[max(0, self.search_mode_combo.current())]
     
     def search_files(self):
         """Search files"""
@@ -291,32 +596,44 @@ class FileOrganizerApp:
             messagebox.showerror("Error", self.config_manager.get_text("error_source_required"))
             return
         
-        # Validate search pattern
-        is_valid, error_message = self.file_organizer_core.validate_search_pattern(self.search_pattern.get())
-        if not is_valid:
-            messagebox.showerror("Error", error_message)
+        # Validate search pattern and filter
+        if not self._validate_search_inputs():
             return
         
+        source_path = Path(self.source_directory.get())
+        pattern = self.search_pattern.get()
+        self._start_background_operation(self._search_files_worker, source_path, pattern,
+                                         self._get_search_mode(), self._get_search_filter())
+    
+    @profiled()
+    def _search_files_worker(self, source_path: Path, pattern: str, search_mode: str = "name", search_filter=None):
+        """Search files on a background thread"""
         try:
-            source_path = Path(self.source_directory.get())
-            pattern = self.search_pattern.get()
-            
             # Search files
-            matching_files = self.file_organizer_core.search_files(source_path, pattern)
-            
-            # Display results
-            self.result_text.delete(1.0, tk.END)
-            if matching_files:
-                self.result_text.insert(tk.END, f"{self.config_manager.get_text('search_results')} {len(matching_files)} {self.config_manager.get_text('files_found')}\n\n")
-                for file_path in matching_files:
-                    self.result_text.insert(tk.END, f"• {file_path.name}\n")
-            else:
-                self.result_text.insert(tk.END, self.config_manager.get_text("no_files_found"))
-            
-            self.logger.log_message(f"{self.config_manager.get_text('search_complete')} {self.config_manager.get_text('pattern_found')} '{pattern}' {len(matching_files)} {self.config_manager.get_text('files_discovered')}")
+            matching_files = self.file_organizer_core.search_files(
+                source_path, pattern, self._is_cancelled, self._make_scan_progress_callback(),
+                search_mode, search_filter)
+            stopped = self._is_cancelled()
+            self.root.after(0, self._show_search_results, pattern, matching_files, stopped)
             
         except Exception as e:
             self.logger.log_error(f"{self.config_manager.get_text('search_error')} {e}")
+        finally:
+            self._finish_background_operation()
+    
+    def _show_search_results(self, pattern: str, matching_files, stopped: bool):
+        """Display search results (runs on the Tk main thread)"""
+        self.result_text.delete(1.0, tk.END)
+        if matching_files:
+            self.result_text.insert(tk.END, f"{self.config_manager.get_text('search_results')} {len(matching_files)} {self.config_manager.get_text('files_found')}\n\n")
+            self.result_text.insert(tk.END, "".join(f"• {file_path.name}\n" for file_path in matching_files))
+        else:
+            self.result_text.insert(tk.END, self.config_manager.get_text("no_files_found"))
+        
+        self.logger.log_message(f"{self.config_manager.get_text('search_complete')} {self.config_manager.get_text('pattern_found')} '{pattern}' {len(matching_files)} {self.config_manager.get_text('files_discovered')}")
+        if stopped:
+            self.logger.log_message(self.config_manager.get_text("search_stopped"))
+        self.status_var.set(self.config_manager.get_text("ready"))
     
     def separate_files(self):
         """Separate matching files with default options"""
@@ -325,26 +642,44 @@ class FileOrganizerApp:
             messagebox.showerror("Error", self.config_manager.get_text("error_target_required"))
             return
         
-        # Validate search pattern
-        is_valid, error_message = self.file_organizer_core.validate_search_pattern(self.search_pattern.get())
+        # Validate search pattern and filter
+        if not self._validate_search_inputs():
+            return
+        
+        source_path = Path(self.source_directory.get())
+        target_path = Path(self.target_directory.get())
+        pattern = self.search_pattern.get()
+        search_mode = self._get_search_mode()
+        search_filter = self._get_search_filter()
+        
+        # Separate files with default options
+        self._start_background_operation(
+            self._separate_files_worker,
+            lambda preflight: self.file_organizer_core.separate_files(
+                source_path, target_path, pattern, None, self._is_cancelled, self._make_scan_progress_callback(),
+                search_mode, search_filter, preflight))
+    
+    def route_files(self):
+        """Separate files by the configured routes"""
+        # Validate source and target directories
+        is_valid, error_message = self.file_organizer_core.validate_directories(
+            self.source_directory.get(), self.target_directory.get())
         if not is_valid:
             messagebox.showerror("Error", error_message)
             return
         
-        try:
-            source_path = Path(self.source_directory.get())
-            target_path = Path(self.target_directory.get())
-            pattern = self.search_pattern.get()
-            
-            # Separate files with default options
-            moved_count, separate_path = self.file_organizer_core.separate_files(source_path, target_path, pattern)
-            
-            self.logger.log_message(f"{self.config_manager.get_text('separation_complete')} {moved_count} {self.config_manager.get_text('files_moved_to')} {separate_path.name} {self.config_manager.get_text('moved_to')}")
-            messagebox.showinfo("Complete", f"{moved_count} {self.config_manager.get_text('files_separated')}\n{self.config_manager.get_text('save_location')} {separate_path}")
-            
-        except Exception as e:
-            self.logger.log_error(f"{self.config_manager.get_text('separation_error')} {e}")
-            messagebox.showerror("Error", f"{self.config_manager.get_text('separation_error_occurred')} {e}")
+        routes = self.config_manager.get_setting("separation_routes", [])
+        if not routes:
+            messagebox.showerror("Error", self.config_manager.get_text("error_no_routes"))
+            return
+        
+        source_path = Path(self.source_directory.get())
+        target_path = Path(self.target_directory.get())
+        self._start_background_operation(
+            self._separate_files_worker,
+            lambda preflight: self.file_organizer_core.route_files(
+                source_path, target_path, routes, self._is_cancelled, self._make_scan_progress_callback(),
+                preflight))
     
     def separate_files_with_custom_destination(self):
         """Separate files with custom destination selection"""
@@ -353,20 +688,25 @@ class FileOrganizerApp:
             messagebox.showerror("Error", self.config_manager.get_text("error_source_required"))
             return
         
-        # Validate search pattern
-        is_valid, error_message = self.file_organizer_core.validate_search_pattern(self.search_pattern.get())
-        if not is_valid:
-            messagebox.showerror("Error", error_message)
+        # Validate search pattern and filter
+        if not self._validate_search_inputs():
+            return
+        
+        if self.worker_running:
             return
         
         try:
             # Show destination selection dialog
+            from gui.separation_destination_dialog import SeparationDestinationDialog
+            
             dialog = SeparationDestinationDialog(self.root, self.config_manager, self.target_directory.get())
             result = dialog.show()
             
             if result:
                 source_path = Path(self.source_directory.get())
                 pattern = self.search_pattern.get()
+                search_mode = self._get_search_mode()
+                search_filter = self._get_search_filter()
                 
                 if result['type'] == 'new_in_current':
                     # Create new folder in current target
@@ -374,26 +714,64 @@ class FileOrganizerApp:
                     target_path.mkdir(parents=True, exist_ok=True)
                     
                     # Separate files with custom folder name
-                    moved_count, separate_path = self.file_organizer_core.separate_files(
-                        source_path, target_path.parent, pattern, result['folder_name'])
+                    operation = lambda preflight: self.file_organizer_core.separate_files(
+                        source_path, target_path.parent, pattern, result['folder_name'],
+                        self._is_cancelled, self._make_scan_progress_callback(), search_mode, search_filter,
+                        preflight)
                     
                 elif result['type'] == 'existing':
                     # Use existing folder directly (no subfolder creation)
                     target_path = Path(result['path'])
                     
                     # Move files directly to existing folder
-                    moved_count, separate_path = self.file_organizer_core.move_files_to_existing_folder(
-                        source_path, target_path, pattern)
+                    operation = lambda preflight: self.file_organizer_core.move_files_to_existing_folder(
+                        source_path, target_path, pattern, self._is_cancelled, self._make_scan_progress_callback(),
+                        search_mode, search_filter, preflight)
+                
+                else:
+                    return
                 
-                self.logger.log_message(f"{self.config_manager.get_text('separation_complete')} {moved_count} {self.config_manager.get_text('files_moved_to')} {separate_path.name} {self.config_manager.get_text('moved_to')}")
-                messagebox.showinfo("Complete", f"{moved_count} {self.config_manager.get_text('files_separated')}\n{self.config_manager.get_text('save_location')} {separate_path}")
+                self._start_background_operation(self._separate_files_worker, operation)
             
         except Exception as e:
             self.logger.log_error(f"{self.config_manager.get_text('separation_error')} {e}")
             messagebox.showerror("Error", f"{self.config_manager.get_text('separation_error_occurred')} {e}")
     
+    @profiled()
+    def _separate_files_worker(self, operation):
+        """Run a separation operation on a background thread and report its result
+        
+        operation receives the free space preflight to run on the files it is about to move.
+        """
+        space_refused = False
+        
+        def preflight(moves):
+            nonlocal space_refused
+            space_refused = not self._check_move_space(moves)
+            return not space_refused
+        
+        try:
+            moved_count, separate_path = operation(preflight)
+            if not space_refused:
+                self.root.after(0, self._show_separation_result, moved_count, separate_path)
+            
+        except Exception as e:
+            self.logger.log_error(f"{self.config_manager.get_text('separation_error')} {e}")
+            self.root.after(0, lambda: messagebox.showerror(
+                "Error", f"{self.config_manager.get_text('separation_error_occurred')} {e}"))
+        finally:
+            self._finish_background_operation()
+    
+    def _show_separation_result(self, moved_count: int, separate_path: Path):
+        """Report a finished separation (runs on the Tk main thread)"""
+        self.status_var.set(self.config_manager.get_text("ready"))
+        self.logger.log_message(f"{self.config_manager.get_text('separation_complete')} {moved_count} {self.config_manager.get_text('files_moved_to')} {separate_path.name} {self.config_manager.get_text('moved_to')}")
+        messagebox.showinfo("Complete", f"{moved_count} {self.config_manager.get_text('files_separated')}\n{self.config_manager.get_text('save_location')} {separate_path}")
+    
     def open_settings(self):
         """Open settings window"""
+        from gui.settings_window import SettingsWindow
+        
         def on_settings_changed():
             # Update UI elements that depend on settings
             self.root.title(self.config_manager.get_text("app_title"))
@@ -5,46 +5,89 @@ Logger
 Responsible for managing application logs and messages
 """
 
-from datetime import datetime
-from typing import List, Optional
+import time
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 import tkinter as tk
 from tkinter import scrolledtext
 
+# Pending entries are written to the widget and console in batches, this often
+FLUSH_INTERVAL_MS = 100
+# Events beyond this number in one batch are shown as per-key counts instead of line by line
+DISPLAY_LIMIT = 200
+
+
+class LogRecord:
+    """One log entry, kept unformatted until it is displayed or exported
+    
+    key is a text key rendered with its formatter, or None for a plain message (args holds the
+    text); group is the value events of one key are counted by ("Images" for moves).
+    """
+    
+    __slots__ = ("time", "key", "args", "group")
+    
+    def __init__(self, time: Optional[float], key: Optional[str], args: tuple, group: Optional[str] = None):
+        self.time = time
+        self.key = key
+        self.args = args
+        self.group = group
+
 
 class Logger:
-    """Manages application logging and message display"""
+    """Manages application logging and message display
+    
+    Entries are stored as LogRecords with a monotonic timestamp; timestamps and text are only
+    built for the entries actually shown or exported. Events (log_event) are also counted per
+    key and group, so a batch too large to show line by line is displayed as counts such as
+    "12,345 × Move: → Images".
+    
+    Background operations log from worker threads: the stored state is guarded by a lock, and
+    only a flush loop running on the Tk thread (started with the widget) touches the widget.
+    """
     
-    def __init__(self, log_widget: Optional[scrolledtext.ScrolledText] = None):
+    def __init__(self, log_widget: Optional[scrolledtext.ScrolledText] = None,
+                 get_text: Optional[Callable[[str], str]] = None):
         self.log_widget = log_widget
-        self.log_messages: List[str] = []
+        self.get_text = get_text or (lambda key: key)
         self.max_messages = 1000  # Maximum number of messages to keep in memory
+        self.records: Deque[LogRecord] = deque(maxlen=self.max_messages)
+        self.event_counts: Dict[Tuple[str, Optional[str]], int] = {}
+        self._formatters: Dict[str, Callable[..., str]] = {}
+        self._pending: List[LogRecord] = []
+        self._lock = threading.Lock()
+        self._polling = False
+        # Offset turning monotonic timestamps into wall-clock time when rendering
+        self._epoch = time.time() - time.monotonic()
+        if log_widget:
+            self._poll()
     
     def set_log_widget(self, log_widget: scrolledtext.ScrolledText) -> None:
-        """Set the log widget for displaying messages"""
+        """Set the log widget for displaying messages (call from the Tk thread)"""
         self.log_widget = log_widget
+        if not self._polling:
+            self._poll()
+    
+    def _poll(self) -> None:
+        """Flush the pending records and schedule the next flush on the Tk thread"""
+        self._polling = True
+        self.flush()
+        self.log_widget.after(FLUSH_INTERVAL_MS, self._poll)
+    
+    def set_formatter(self, key: str, formatter: Callable[..., str]) -> None:
+        """Set the function rendering the events of a key from their args"""
+        self._formatters[key] = formatter
     
     def log_message(self, message: str, show_timestamp: bool = True) -> None:
         """Add a log message with optional timestamp"""
-        if show_timestamp:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            formatted_message = f"[{timestamp}] {message}"
-        else:
-            formatted_message = message
-        
-        # Add to memory
-        self.log_messages.append(formatted_message)
-        
-        # Limit memory usage
-        if len(self.log_messages) > self.max_messages:
-            self.log_messages = self.log_messages[-self.max_messages:]
-        
-        # Display in widget if available
-        if self.log_widget:
-            self.log_widget.insert(tk.END, formatted_message + "\n")
-            self.log_widget.see(tk.END)
-        
-        # Also print to console
-        print(formatted_message)
+        self._add(LogRecord(time.monotonic() if show_timestamp else None, None, (message,)))
+    
+    def log_event(self, key: str, *args, group: Optional[str] = None) -> None:
+        """Add an event rendered from a text key and args when displayed, counted per key and group"""
+        counter = (key, group)
+        with self._lock:
+            self.event_counts[counter] = self.event_counts.get(counter, 0) + 1
+        self._add(LogRecord(time.monotonic(), key, args, group))
     
     def log_error(self, error_message: str) -> None:
         """Log an error message"""
@@ -58,26 +101,113 @@ class Logger:
         """Log an info message"""
         self.log_message(f"INFO: {info_message}")
     
+    def _add(self, record: LogRecord) -> None:
+        """Store a record and queue it for display"""
+        with self._lock:
+            self.records.append(record)
+            self._pending.append(record)
+        if not self.log_widget:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Display the pending records in the widget and on the console
+        
+        With a widget this runs on the Tk thread only; without one, on the logging thread.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        events = sum(1 for record in pending if record.key is not None)
+        if events > DISPLAY_LIMIT:
+            # Plain messages (errors, summaries) are always shown; events only as counts
+            lines = [self.render(record) for record in pending if record.key is None]
+            counts: Dict[Tuple[str, Optional[str]], int] = {}
+            for record in pending:
+                if record.key is not None:
+                    counter = (record.key, record.group)
+                    counts[counter] = counts.get(counter, 0) + 1
+            prefix = self._timestamp(pending[-1].time)
+            lines.extend(f"{prefix}{self._count_line(key, group, count)}" for (key, group), count in counts.items())
+        else:
+            lines = [self.render(record) for record in pending]
+        
+        text = "\n".join(lines)
+        # Display in widget if available
+        if self.log_widget:
+            self.log_widget.insert(tk.END, text + "\n")
+            self.log_widget.see(tk.END)
+        
+        # Also print to console
+        print(text)
+    
+    def _timestamp(self, monotonic_time: Optional[float]) -> str:
+        """Render the timestamp prefix of a record"""
+        if monotonic_time is None:
+            return ""
+        return time.strftime("[%H:%M:%S] ", time.localtime(self._epoch + monotonic_time))
+    
+    def _count_line(self, key: str, group: Optional[str], count: int) -> str:
+        """Render the count of the events of one key and group"""
+        text = f"{count:,} × {self.get_text(key)}"
+        return f"{text} → {group}" if group is not None else text
+    
+    def render(self, record: LogRecord) -> str:
+        """Render a record as a log line"""
+        if record.key is None:
+            message = record.args[0]
+        else:
+            formatter = self._formatters.get(record.key)
+            if formatter:
+                message = formatter(*record.args)
+            else:
+                message = " ".join([self.get_text(record.key), *map(str, record.args)])
+        return self._timestamp(record.time) + message
+    
+    def event_summary(self) -> List[str]:
+        """Render the event counts since the last reset, largest first"""
+        with self._lock:
+            counts = list(self.event_counts.items())
+        return [self._count_line(key, group, count) for (key, group), count
+                in sorted(counts, key=lambda item: item[1], reverse=True)]
+    
+    def reset_event_counts(self) -> None:
+        """Start counting events from zero"""
+        with self._lock:
+            self.event_counts.clear()
+    
     def clear_log(self) -> None:
         """Clear all log messages"""
-        self.log_messages.clear()
+        with self._lock:
+            self.records.clear()
+            self._pending = []
+            self.event_counts.clear()
         if self.log_widget:
             self.log_widget.delete(1.0, tk.END)
     
     def get_log_messages(self) -> List[str]:
         """Get all log messages"""
-        return self.log_messages.copy()
+        with self._lock:
+            records = list(self.records)
+        return [self.render(record) for record in records]
     
     def get_recent_messages(self, count: int = 10) -> List[str]:
         """Get recent log messages"""
-        return self.log_messages[-count:] if self.log_messages else []
+        with self._lock:
+            records = list(self.records)[-count:] if count > 0 else []
+        return [self.render(record) for record in records]
     
     def export_log(self, file_path: str) -> bool:
-        """Export log messages to a file"""
+        """Export log messages to a file, followed by the event counts"""
         try:
+            with self._lock:
+                records = list(self.records)
             with open(file_path, 'w', encoding='utf-8') as f:
-                for message in self.log_messages:
-                    f.write(message + "\n")
+                for record in records:
+                    f.write(self.render(record) + "\n")
+                for line in self.event_summary():
+                    f.write(line + "\n")
             return True
         except Exception as e:
             self.log_error(f"Failed to export log: {e}")
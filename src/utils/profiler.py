@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profiler
+Responsible for the opt-in profiling mode that records organization, search and separation runs
+
+Profiling is enabled with the FILE_ORGANIZER_PROFILE environment variable
+("cprofile" or "sample") or the "profiling" configuration setting; the environment wins.
+FILE_ORGANIZER_PROFILE_DIR selects the output directory (default: "profiles") and
+FILE_ORGANIZER_PROFILE_INTERVAL the sampling interval in seconds (default: 0.005).
+"""
+
+import os
+import sys
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# The sampler never runs more often than this, which bounds its overhead
+MIN_SAMPLE_INTERVAL = 0.001
+
+# Setting from the configuration file, applied with configure_profiling()
+_configured_mode = ""
+
+
+def configure_profiling(mode: Optional[str]) -> None:
+    """Apply the "profiling" setting of the configuration file"""
+    global _configured_mode
+    _configured_mode = mode if mode in PROFILE_MODES else ""
+
+
+def get_profile_mode() -> str:
+    """Get the active profiling mode ("" when disabled)"""
+    mode = os.environ.get("FILE_ORGANIZER_PROFILE", "").strip().lower()
+    if mode in ("1", "true", "yes"):
+        return "cprofile"
+    if mode in PROFILE_MODES:
+        return mode
+    return _configured_mode
+
+
+def _output_path(name: str, extension: str) -> str:
+    """Build a unique output file path for an operation"""
+    profile_dir = os.environ.get("FILE_ORGANIZER_PROFILE_DIR", DEFAULT_PROFILE_DIR)
+    os.makedirs(profile_dir, exist_ok=True)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join(profile_dir, f"{name}_{timestamp}_{threading.get_ident()}.{extension}")
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval and counts collapsed stacks"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = max(interval, MIN_SAMPLE_INTERVAL)
+        self.stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Start sampling"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread"""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Sampler thread loop"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stack = ";".join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def write_collapsed(self, file_path: str) -> None:
+        """Write samples in collapsed-stack format (flamegraph.pl, speedscope)"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile_operation(name: str):
+    """Profile the enclosed operation on the current thread if profiling is enabled"""
+    mode = get_profile_mode()
+    if not mode:
+        yield
+        return
+
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            output = _output_path(name, "pstats")
+            profiler.dump_stats(output)
+            print(f"Profile written: {output}")
+        return
+
+    interval = float(os.environ.get("FILE_ORGANIZER_PROFILE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))
+    sampler = StackSampler(threading.get_ident(), interval)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        output = _output_path(name, "collapsed")
+        sampler.write_collapsed(output)
+        print(f"Profile written: {output}")
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorator profiling every call of a function with profile_operation"""
+    def decorator(func: Callable) -> Callable:
+        operation_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_operation(operation_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator